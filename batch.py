@@ -0,0 +1,102 @@
+"""
+Headless batch runs: one seeded simulation, or many replicates over a process pool.
+
+    python batch.py --replicates 32 --days 200 --set job_action.doctor=5 --out bands.json
+"""
+import argparse
+import json
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import as_config, parse_override
+from simulation import Simulation, METRICS
+
+
+# --- Single run ---
+def run_simulation(config, seed, days):
+    """
+    Run one seeded simulation without display.
+
+    Arguments: config (SimulationConfig or dict of overrides), seed, days
+    Returns: {metric: [value per day]} for every name in simulation.METRICS
+    """
+    sim = Simulation(as_config(config), seed=seed)
+    rows = [sim.step() for _ in range(days)]
+    return {metric: [row[metric] for row in rows] for metric in METRICS}
+
+
+def _run_replicate(args):
+    return run_simulation(*args)
+
+
+# --- Ensembles ---
+def run_ensemble(config, days, replicates, seed=0, processes=None):
+    """
+    Run `replicates` independent runs (seeds seed, seed+1, ...) on a process pool.
+
+    Arguments: config, days, replicates, seed, processes (None = all cores)
+    Returns: list of run_simulation results, in seed order
+    """
+    jobs = [(config, seed + i, days) for i in range(replicates)]
+    if processes == 1:
+        return [_run_replicate(job) for job in jobs]
+    with Pool(processes) as pool:
+        return pool.map(_run_replicate, jobs)
+
+
+def summarize(runs, percentiles=(5, 50, 95)):
+    """
+    Per-day mean and percentile bands across replicates.
+
+    Arguments: runs (list of run_simulation results), percentiles
+    Returns: {metric: {"mean": [...], "p5": [...], ...}}
+    """
+    summary = {}
+    for metric in METRICS:
+        values = np.array([run[metric] for run in runs], dtype=float)  # replicates x days
+        bands = {"mean": values.mean(axis=0).tolist()}
+        for p, band in zip(percentiles, np.percentile(values, percentiles, axis=0)):
+            bands[f"p{p}"] = band.tolist()
+        summary[metric] = bands
+    return summary
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Monte-Carlo runs of the virus simulation")
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--replicates", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first replicate")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="config override, e.g. size=500 or health_ttl_by_persona.weak=4")
+    parser.add_argument("--every", type=int, default=10, help="print the bands every N days")
+    parser.add_argument("--out", help="write the summary as JSON")
+    args = parser.parse_args(argv)
+
+    config = dict(parse_override(text) for text in args.set)
+
+    runs = run_ensemble(config, args.days, args.replicates, args.seed, args.processes)
+    summary = summarize(runs)
+
+    print(f"{args.replicates} replicates x {args.days} days  (median [p5 - p95])")
+    shown = ["population", "infected", "food", "satisfaction"]
+    print("  day | " + " | ".join(f"{m:>22}" for m in shown))
+    for d in list(range(args.every - 1, args.days, args.every)) or [args.days - 1]:
+        cells = [f"{summary[m]['p50'][d]:8.0f} [{summary[m]['p5'][d]:.0f}-{summary[m]['p95'][d]:.0f}]"
+                 for m in shown]
+        print(f"{d + 1:5} | " + " | ".join(f"{c:>22}" for c in cells))
+    for cause in ("infection", "starvation", "natural"):
+        totals = [sum(run[f"deaths_{cause}"]) for run in runs]
+        print(f"deaths by {cause:10}: mean {np.mean(totals):.1f}  "
+              f"[{np.percentile(totals, 5):.0f} - {np.percentile(totals, 95):.0f}]")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"config": config, "replicates": args.replicates, "days": args.days,
+                       "summary": summary}, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Memory per resident of the different population representations.
+
+    python benchmarks/memory.py --sizes 100000 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from random import choices, random, seed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from habitant import Habitant, Population  # noqa: E402
+from population_arrays import PopulationArrays  # noqa: E402
+
+
+class LegacyHabitant:
+    """The original layout: a __dict__ per resident, strings for categorical fields."""
+
+    def __init__(self, age: int = 25):
+        self.state = choices(["infect", "healthy"], weights=[1, 99])[0]
+        self.persona = choices(["strong", "weak", "rich", "poor", "normal"], weights=[5, 5, 5, 10, 75])[0]
+        self.job = choices(["farmer", "doctor", "worker", "jobless"], weights=[17, 5, 45, 8])[0] if age >= 15 else "none"
+        self.age = age
+        self.days_infected = 0
+        self.at_hospital = False
+        self.hospital_days = 0
+        self.food_deficit = 0
+        self.days_hungry = 0
+        self.partner = None
+        self.x = int(random() * 1720)
+        self.y = int(random() * 860)
+        self.daily_need = 3  # attached on the fly by the old distribute_food
+
+
+LAYOUTS = {
+    "legacy objects (__dict__, strings)": lambda n: [LegacyHabitant() for _ in range(n)],
+    "compact objects (__slots__, codes)": lambda n: [Habitant() for _ in range(n)],
+    "compact objects in a Population": lambda n: Population(Habitant() for _ in range(n)),
+    "PopulationArrays (NumPy columns)": lambda n: PopulationArrays.random(n, seed=0),
+}
+
+
+def measure(build, size):
+    """Bytes still allocated after building `size` residents."""
+    gc.collect()
+    tracemalloc.start()
+    population = build(size)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del population
+    gc.collect()
+    return current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    seed(0)
+    for size in args.sizes:
+        print(f"--- {size:,} residents ---")
+        baseline = None
+        for name, build in LAYOUTS.items():
+            used = measure(build, size)
+            baseline = baseline or used
+            print(f"{name:38} {used / 2**20:9.1f} MiB  {used / size:7.1f} B/resident  "
+                  f"{used / baseline:5.2f} x legacy")
+
+
+if __name__ == "__main__":
+    main()
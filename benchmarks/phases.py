@@ -0,0 +1,211 @@
+"""
+Time every phase of simulate_day, and full days, for both backends at several
+population sizes and infection prevalences, on fixed seeds.
+
+Reports time per resident-day of each phase and the peak memory of one day,
+and compares against a stored baseline: the exit status is 1 when a phase got
+more than --threshold percent slower, and 3 when there is no baseline to
+compare with. Timings depend on the machine, so no baseline is shipped:
+record one with --save first.
+
+    python benchmarks/phases.py --save                     # record benchmarks/baseline.json
+    python benchmarks/phases.py --compare --threshold 15   # fail on a >15% slowdown
+    python benchmarks/phases.py --sizes 100 1000 --backends arrays
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import population_arrays  # noqa: E402
+from habitant import HEALTHY, INFECT, simulate_day  # noqa: E402
+from population_arrays import PopulationArrays  # noqa: E402
+from profiling import PhaseProfiler  # noqa: E402
+from simulation import Simulation  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PREVALENCES = {"low": 0.01, "high": 0.30}
+MIN_DAY_MS = 0.1  # phases shorter than this per day are reported but never fail a comparison
+NO_BASELINE = 3   # exit status of --compare without a baseline file
+
+
+# --- Scenarios ---
+class Scenario:
+    """
+    A fixed starting state: `size` residents from Simulation(seed), with a
+    `prevalence` share of them infected, run by one backend.
+    """
+
+    def __init__(self, backend, size, prevalence, seed=0):
+        self.backend, self.size, self.prevalence, self.seed = backend, size, prevalence, seed
+
+    @property
+    def name(self):
+        return f"{self.backend}/{self.size}/{self.prevalence}"
+
+    def build(self):
+        """Returns: a fresh stepper, called once per day with an optional profiler."""
+        sim = Simulation({"size": self.size}, seed=self.seed)
+        infected = np.random.default_rng(self.seed).random(self.size) < PREVALENCES[self.prevalence]
+        for r, sick in zip(sim.population, infected.tolist()):
+            r.state_code = INFECT if sick else HEALTHY
+        if self.backend == "objects":
+            return ObjectStepper(sim)
+        return ArrayStepper(sim)
+
+
+class ObjectStepper:
+    def __init__(self, sim):
+        self.sim = sim
+
+    def __call__(self, profiler=None):
+        sim = self.sim
+        (sim.population, sim.food, sim.satisfaction, *_, sim.couples) = simulate_day(
+            sim.population, sim.food, sim.satisfaction, sim.day, sim.satisfaction_prev,
+            sim.couples, sim.contacts, sim.config, sim.events, sim.rng, profiler)
+        sim.satisfaction_prev = sim.satisfaction
+        sim.day += 1
+
+
+class ArrayStepper:
+    def __init__(self, sim):
+        self.pop = PopulationArrays.from_habitants(sim.population, seed=sim.rng.seed)
+        self.couples = self.pop.id[self.pop.couples()]
+        self.config, self.events = sim.config, sim.events
+        self.food, self.satisfaction, self.satisfaction_prev = sim.food, sim.satisfaction, sim.satisfaction
+        self.day = sim.day
+
+    def __call__(self, profiler=None):
+        (self.pop, self.food, self.satisfaction, *_, self.couples) = population_arrays.simulate_day(
+            self.pop, self.food, self.satisfaction, self.day, self.satisfaction_prev, self.couples,
+            self.config, self.events, profiler)
+        self.satisfaction_prev = self.satisfaction
+        self.day += 1
+
+
+# --- Measurements ---
+def time_phases(scenario, days, repeat):
+    """
+    Run `days` days `repeat` times from the same start; keep the fastest repeat of each phase.
+
+    Returns: {phase: ns per resident-day}, {phase: ms per day}
+    """
+    best = {}
+    for _ in range(repeat):
+        step = scenario.build()
+        step()  # warm-up day (first couples, caches)
+        profiler = PhaseProfiler()
+        for _ in range(days):
+            step(profiler)
+        summary = profiler.summary()
+        resident_days = summary["day"]["items"] or 1
+        for phase, row in summary.items():
+            timing = (row["seconds"] * 1e9 / resident_days, row["seconds"] * 1e3 / row["calls"])
+            if phase not in best or timing[0] < best[phase][0]:
+                best[phase] = timing
+    return {phase: t[0] for phase, t in best.items()}, {phase: t[1] for phase, t in best.items()}
+
+
+def peak_memory(scenario):
+    """Bytes allocated at the peak of one day, above what the state already holds."""
+    step = scenario.build()
+    step()
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    step()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - start
+
+
+def run(sizes, backends, prevalences, days, repeat, seed):
+    """Returns: {scenario name: {"ns_per_resident_day", "ms_per_day", "peak_bytes"}}"""
+    results = {}
+    for backend in backends:
+        for size in sizes:
+            for prevalence in prevalences:
+                scenario = Scenario(backend, size, prevalence, seed)
+                per_resident, per_day = time_phases(scenario, days, repeat)
+                peak = peak_memory(scenario)
+                results[scenario.name] = {"ns_per_resident_day": per_resident, "ms_per_day": per_day,
+                                          "peak_bytes": peak}
+                print_scenario(scenario.name, results[scenario.name])
+    return results
+
+
+# --- Reports ---
+def print_scenario(name, result):
+    print(f"--- {name}: {result['peak_bytes'] / 2**20:.1f} MiB peak per day ---")
+    rows = sorted(result["ns_per_resident_day"].items(), key=lambda item: (item[0] != "day", -item[1]))
+    for phase, ns in rows:
+        print(f"  {phase:24} {ns:12.1f} ns/resident-day {result['ms_per_day'][phase]:10.3f} ms/day")
+
+
+def compare(results, baseline, threshold):
+    """
+    Arguments: results and baseline (as returned by run), threshold (percent)
+    Returns: list of (scenario, phase, baseline ns, current ns) slower than allowed
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        for phase, ns in result["ns_per_resident_day"].items():
+            before = old["ns_per_resident_day"].get(phase)
+            if before is None or old["ms_per_day"][phase] < MIN_DAY_MS:
+                continue
+            if ns > before * (1 + threshold / 100):
+                regressions.append((name, phase, before, ns))
+    return regressions
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-phase benchmarks of simulate_day")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--backends", nargs="+", choices=["objects", "arrays"], default=["objects", "arrays"])
+    parser.add_argument("--prevalence", nargs="+", choices=list(PREVALENCES), default=list(PREVALENCES))
+    parser.add_argument("--days", type=int, default=3, help="timed days per repeat")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare with the baseline")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown, in percent")
+    args = parser.parse_args(argv)
+
+    if args.compare and not os.path.exists(args.baseline):
+        print(f"No baseline to compare with: {args.baseline} does not exist. "
+              f"Record one on this machine with --save first.", file=sys.stderr)
+        return NO_BASELINE
+    results = run(args.sizes, args.backends, args.prevalence, args.days, args.repeat, args.seed)
+
+    status = 0
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, phase, before, after in regressions:
+            print(f"SLOWER {name} {phase}: {before:.1f} -> {after:.1f} ns/resident-day "
+                  f"(+{after / before - 1:.0%})")
+        print(f"{len(regressions)} phase(s) more than {args.threshold:g}% slower than {args.baseline}")
+        status = 1 if regressions else 0
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "numpy": np.__version__, "results": results}, f, indent=1)
+        print(f"Baseline written to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Checkpoint / restore of a whole Simulation (population, couples, scalars, RNG).
+
+A checkpoint is one uncompressed .npz file: one NumPy column per resident
+field (partners and couples stored as row indices), the contact network's
+arrays with config.contact_model "network" (network.py), the running metrics of
+the transmission tree when the event log has one (transmission_tree.py), plus a small JSON header
+with the scalars, the config and the seed of the run's rng.CounterRNG (draws
+only depend on seed, day and ids, so the seed is the whole RNG state).
+Resuming from a checkpoint gives exactly the same run as never stopping.
+
+    python checkpoint.py --days 900 --every 100 --dir checkpoints
+    python checkpoint.py --resume checkpoints/day-0500.npz --days 900
+    python checkpoint.py --resume checkpoints/day-0500.npz --days 600 \\
+                         --branch job_action.doctor=5 --branch transmission_prob=0.3
+"""
+import argparse
+import io
+import json
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import SimulationConfig, parse_override
+from contacts import make_contacts
+from events import EventLog
+from habitant import Habitant, Population
+from network import ContactNetwork
+from transmission_tree import TransmissionTree
+from reporting import REPORTERS, make_reporter
+from rng import CounterRNG
+from simulation import Simulation, METRICS
+
+FORMAT_VERSION = 3
+
+# column -> (Habitant attribute, dtype); "partner" is stored separately as a row index
+RESIDENT_COLUMNS = {
+    "id": ("id", np.int64),
+    "state": ("state_code", np.int8),
+    "persona": ("persona_code", np.int8),
+    "job": ("job_code", np.int8),
+    "age": ("age", np.int32),
+    "days_infected": ("days_infected", np.int32),
+    "at_hospital": ("at_hospital", np.bool_),
+    "hospital_days": ("hospital_days", np.int32),
+    "food_deficit": ("food_deficit", np.int64),
+    "days_hungry": ("days_hungry", np.int32),
+    "x": ("x", np.int16),
+    "y": ("y", np.int16),
+}
+
+
+# --- Population <-> columns ---
+def pack_residents(residents):
+    """Returns: {column: array} of RESIDENT_COLUMNS (no partner) for a list of residents."""
+    return {name: np.fromiter((getattr(r, attr) for r in residents), dtype, len(residents))
+            for name, (attr, dtype) in RESIDENT_COLUMNS.items()}
+
+
+def unpack_residents(columns):
+    """Rebuild residents (single, outside any population) without drawing any random number."""
+    values = {name: columns[name].tolist() for name in RESIDENT_COLUMNS}
+    residents = []
+    for i in range(len(values["id"])):
+        r = Habitant.__new__(Habitant)
+        r._index = None
+        for name, (attr, _) in RESIDENT_COLUMNS.items():
+            setattr(r, attr, values[name][i])
+        r.partner = None
+        residents.append(r)
+    return residents
+
+
+def pack_population(population, couples):
+    """
+    Arguments: population (Population), couples (list of resident pairs)
+    Returns: {column: array}, with partner and couples as row indices (-1 = none)
+    """
+    residents = list(population)
+    row = {r.id: i for i, r in enumerate(residents)}
+    columns = pack_residents(residents)
+    columns["partner"] = np.fromiter(
+        (row.get(r.partner.id, -1) if r.partner is not None else -1 for r in residents),
+        np.int32, len(residents))
+    # couples with a dead member are dropped by the next form_couples anyway
+    pairs = [(row[a.id], row[b.id]) for a, b in couples
+             if a in population and b in population]
+    columns["couples"] = np.array(pairs, dtype=np.int32).reshape(-1, 2)
+    return columns
+
+
+def unpack_population(columns, next_id):
+    """
+    Rebuild residents without drawing any random number.
+
+    Returns: population (Population), couples (list of resident pairs)
+    """
+    residents = unpack_residents(columns)
+    for r, partner in zip(residents, columns["partner"].tolist()):
+        if partner >= 0:
+            r.partner = residents[partner]
+    population = Population(residents)
+    population._next_id = next_id
+    couples = [(residents[a], residents[b]) for a, b in columns["couples"].tolist()]
+    return population, couples
+
+
+# --- Snapshots ---
+def snapshot(sim):
+    """
+    Serialize a Simulation between two steps. The run is left as it is:
+    rows still buffered in the event log (and tree) are not part of the
+    snapshot, only the totals and metrics are (run_with_checkpoints flushes
+    the log before each save).
+
+    Returns: bytes
+    """
+    columns = pack_population(sim.population, sim.couples)
+    if sim.population.network is not None:
+        columns.update({f"network_{name}": array for name, array in sim.population.network.state().items()})
+    if sim.events.tree is not None:
+        columns.update({f"tree_{name}": array for name, array in sim.events.tree.state().items()})
+    header = {
+        "format": FORMAT_VERSION,
+        "day": sim.day,
+        "food": sim.food,
+        "satisfaction": sim.satisfaction,
+        "satisfaction_prev": sim.satisfaction_prev,
+        "next_id": sim.population._next_id,
+        "config": sim.config.to_dict(),
+        "seed": sim.rng.seed,
+        "event_totals": [[*key, n] for key, n in sim.events.totals.items()],
+    }
+    buf = io.BytesIO()
+    np.savez(buf, header=np.frombuffer(json.dumps(header).encode(), np.uint8), **columns)
+    return buf.getvalue()
+
+
+def restore(data, events=None, overrides=None, seed=None):
+    """
+    Rebuild a Simulation from snapshot bytes (or a checkpoint path).
+
+    Arguments: data (bytes or path), events (EventLog for the resumed run;
+    default: a new one holding the saved totals; a saved transmission tree is
+    restored into it, keeping the sink of its tree if it has one), overrides
+    (config changes for a what-if branch), seed (new seed for the days to come,
+    so branches diverge)
+    Returns: Simulation
+    """
+    with np.load(io.BytesIO(data) if isinstance(data, bytes) else data) as arrays:
+        columns = {name: arrays[name] for name in arrays.files}
+    header = json.loads(columns.pop("header").tobytes())
+    if header["format"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format: {header['format']}")
+
+    sim = Simulation.__new__(Simulation)
+    sim.config = SimulationConfig(**header["config"]).with_overrides(overrides or {})
+    sim.population, sim.couples = unpack_population(columns, header["next_id"])
+    if "network_indptr" in columns:
+        sim.population.network = ContactNetwork.from_state(
+            {name[len("network_"):]: array for name, array in columns.items() if name.startswith("network_")},
+            sim.config.workplace_size, sim.config.community_degree)
+    sim.food, sim.day = header["food"], header["day"]
+    sim.satisfaction, sim.satisfaction_prev = header["satisfaction"], header["satisfaction_prev"]
+    sim.rng = CounterRNG(header["seed"] if seed is None else seed)
+    sim.contacts = make_contacts(sim.config.contacts, sim.config.contact_radius)
+    if events is None:
+        events = EventLog()
+        events.totals = Counter({tuple(row[:-1]): row[-1] for row in header["event_totals"]})
+    if "tree_cases" in columns:
+        saved = {name[len("tree_"):]: array for name, array in columns.items() if name.startswith("tree_")}
+        if events.tree is None:
+            events.tree = TransmissionTree.from_state(saved, config=sim.config)
+        else:
+            events.tree = TransmissionTree.from_state(saved, events.tree.sink, events.tree.chunk_size, sim.config)
+    sim.events = events
+    sim.profiler = None
+    sim.reporter = None
+    return sim
+
+
+def save_checkpoint(sim, path):
+    """Write snapshot(sim) to `path` atomically (a crash never leaves half a file)."""
+    with open(path + ".tmp", "wb") as f:
+        f.write(snapshot(sim))
+    os.replace(path + ".tmp", path)
+
+
+def load_checkpoint(path, events=None):
+    return restore(path, events)
+
+
+# --- Long runs and branches ---
+def run_with_checkpoints(sim, days, every, directory):
+    """
+    Step `sim` up to day `days`, saving directory/day-NNNN.npz every `every` days.
+    The event log is flushed before each save, so its sink is complete up to
+    the checkpoint.
+
+    Returns: {metric: [value per day]} for the days run here
+    """
+    if every:
+        os.makedirs(directory, exist_ok=True)
+    rows = []
+    while sim.day <= days:
+        rows.append(sim.step())
+        if every and (sim.day - 1) % every == 0:
+            sim.events.flush()
+            save_checkpoint(sim, os.path.join(directory, f"day-{sim.day - 1:04d}.npz"))
+    return {metric: [row[metric] for row in rows] for metric in METRICS}
+
+
+def _run_branch(job):
+    data, overrides, seed, days = job
+    sim = restore(data, overrides=overrides, seed=seed)
+    rows = [sim.step() for _ in range(days - sim.day + 1)]
+    return {metric: [row[metric] for row in rows] for metric in METRICS}
+
+
+def run_branches(data, branches, days, processes=None):
+    """
+    Continue one warm-started state under several what-ifs, on a process pool.
+
+    Arguments: data (snapshot bytes or path), branches (list of (overrides, seed)),
+    days (last day to simulate), processes (None = all cores)
+    Returns: one {metric: [value per day]} per branch, in order
+    """
+    if not isinstance(data, bytes):
+        with open(data, "rb") as f:
+            data = f.read()
+    jobs = [(data, overrides, seed, days) for overrides, seed in branches]
+    if processes == 1:
+        return [_run_branch(job) for job in jobs]
+    with Pool(processes) as pool:
+        return pool.map(_run_branch, jobs)
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long runs with checkpoints, resume and branches")
+    parser.add_argument("--days", type=int, default=1000, help="last day to simulate")
+    parser.add_argument("--every", type=int, default=100, help="checkpoint every N days (0 = never)")
+    parser.add_argument("--dir", default="checkpoints")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--resume", help="checkpoint file to start from")
+    parser.add_argument("--branch", action="append", default=[], metavar="KEY=VALUE[;KEY=VALUE]",
+                        help="with --resume: run one what-if branch per option instead")
+    parser.add_argument("--report", choices=list(REPORTERS), default="silent", help="progress output")
+    args = parser.parse_args(argv)
+
+    if args.branch:
+        branches = [(dict(parse_override(t) for t in text.split(";")), None) for text in args.branch]
+        for text, run in zip(args.branch, run_branches(args.resume, branches, args.days)):
+            print(f"{text:40} final population {run['population'][-1]:6} | "
+                  f"peak infected {max(run['infected']):5}")
+        return
+
+    if args.resume:
+        sim = load_checkpoint(args.resume)
+    else:
+        overrides = dict(parse_override(t) for t in args.set)
+        sim = Simulation(overrides, seed=args.seed)
+    sim.reporter = make_reporter(args.report)
+    sim.reporter.start({"day": sim.day, "population": len(sim.population), "couples": len(sim.couples)})
+    start = sim.day
+    run = run_with_checkpoints(sim, args.days, args.every, args.dir)
+    sim.reporter.end(sim.events)
+    print(f"Days {start}-{sim.day - 1}: final population {run['population'][-1]}"
+          + (f" | checkpoints in {args.dir}/" if args.every else ""))
+
+
+if __name__ == "__main__":
+    main()
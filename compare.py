@@ -0,0 +1,173 @@
+"""
+Scenario comparison with common random numbers and adaptive replicate stopping.
+
+Replicate k of the baseline and of every variant runs with the same seed.
+Every draw of the model is keyed by (seed, phase, day, resident id), so the
+paired runs see the same random numbers resident by resident and event by
+event, and their difference is much less noisy than that of independent runs.
+Replicates are added in batches until the confidence interval of the mean
+difference of every target metric is narrower than its target width.
+
+    python compare.py --variant job_action.doctor=5 --variant health_ttl_by_persona.weak=4 \\
+                      --metric deaths_infection=4 --metric peak_infected=10 --days 150
+"""
+import argparse
+import math
+import sys
+from multiprocessing import Pool
+from statistics import NormalDist
+
+from batch import run_simulation
+from config import DEFAULT_CONFIG, parse_override
+from sweep import summarize_run
+
+TARGETS = ("deaths_infection", "deaths_starvation", "deaths_natural", "peak_infected")
+
+
+def t_quantile(confidence, dof):
+    """Two-sided Student t quantile (Cornish-Fisher expansion around the normal one)."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return z + (z ** 3 + z) / (4 * dof) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2)
+
+
+class Running:
+    """Running mean and variance (Welford), O(1) per value."""
+
+    def __init__(self):
+        self.n, self.mean, self._m2 = 0, 0.0, 0.0
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else math.inf
+
+    def half_width(self, confidence):
+        """Half-width of the confidence interval of the mean."""
+        if self.n < 2:
+            return math.inf
+        return t_quantile(confidence, self.n - 1) * math.sqrt(self.variance / self.n)
+
+
+def _run_job(job):
+    name, config, seed, days = job
+    return name, seed, summarize_run(run_simulation(config, seed, days))
+
+
+# --- Comparison ---
+def compare_scenarios(variants, days, widths, base_config=DEFAULT_CONFIG, confidence=0.95,
+                      min_replicates=5, max_replicates=200, batch=8, seed=0, processes=None,
+                      common_random_numbers=True, stream=None):
+    """
+    Run the baseline and the variants on paired seeds until every target
+    metric's confidence interval on (variant - baseline) is narrower than its width.
+
+    Arguments: variants ({name: overrides of base_config}), days,
+    widths ({metric of sweep.summarize_run: full CI width}), base_config, confidence,
+    min_replicates, max_replicates, batch (replicates added per round), seed (of
+    replicate 0), processes (None = all cores, 1 = no pool),
+    common_random_numbers (False runs the variants on their own seeds, for reference),
+    stream (file for a progress line after each round, None = quiet)
+    Returns: {variant: {metric: {"baseline", "variant", "difference", "half_width",
+    "variance_reduction"}}}, replicates used
+    """
+    configs = {"baseline": base_config, **{name: base_config.with_overrides(o) for name, o in variants.items()}}
+    offset = {name: 0 if common_random_numbers or name == "baseline" else (i + 1) * max_replicates
+              for i, name in enumerate(configs)}
+    means = {name: {m: Running() for m in widths} for name in configs}
+    diffs = {name: {m: Running() for m in widths} for name in variants}
+
+    def precise():
+        return all(diffs[v][m].half_width(confidence) * 2 <= widths[m] for v in variants for m in widths)
+
+    pool = Pool(processes) if processes != 1 else None
+    replicates = 0
+    try:
+        while replicates < max_replicates and (replicates < min_replicates or not precise()):
+            count = min(batch if replicates >= min_replicates else min_replicates - replicates,
+                        max_replicates - replicates)
+            jobs = [(name, config, seed + replicates + k + offset[name], days)
+                    for k in range(count) for name, config in configs.items()]
+            results = pool.map(_run_job, jobs) if pool else [_run_job(job) for job in jobs]
+            by_replicate = {}
+            for name, run_seed, summary in results:
+                by_replicate.setdefault(run_seed - offset[name], {})[name] = summary
+            for runs in (by_replicate[k] for k in sorted(by_replicate)):
+                for name, summary in runs.items():
+                    for m in widths:
+                        means[name][m].add(summary[m])
+                for name in variants:
+                    for m in widths:
+                        diffs[name][m].add(runs[name][m] - runs["baseline"][m])
+            replicates += count
+            widest = max(diffs[v][m].half_width(confidence) * 2 / widths[m] for v in variants for m in widths)
+            if stream:
+                stream.write(f"  {replicates} replicates: widest interval at {widest:.2f}x its target\n")
+                stream.flush()
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    report = {}
+    for name in variants:
+        report[name] = {}
+        for m in widths:
+            d = diffs[name][m]
+            independent = means["baseline"][m].variance + means[name][m].variance
+            report[name][m] = {
+                "baseline": means["baseline"][m].mean,
+                "variant": means[name][m].mean,
+                "difference": d.mean,
+                "half_width": d.half_width(confidence),
+                # replicates independent runs would need for the same precision, per paired replicate
+                "variance_reduction": independent / d.variance if d.variance > 0 else math.inf,
+            }
+    return report, replicates
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare scenarios with common random numbers")
+    parser.add_argument("--variant", action="append", nargs="+", default=[], metavar="KEY=VALUE",
+                        help="one variant: its overrides of the baseline (repeat --variant for more)")
+    parser.add_argument("--metric", action="append", default=[], metavar="NAME=WIDTH",
+                        help=f"target metric and full CI width (default: {', '.join(TARGETS)} at --width)")
+    parser.add_argument("--width", type=float, default=5.0)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="baseline override")
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--min-replicates", type=int, default=5)
+    parser.add_argument("--max-replicates", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=8, help="replicates added per round")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--independent", action="store_true", help="independent seeds (no common random numbers)")
+    args = parser.parse_args(argv)
+
+    base = DEFAULT_CONFIG.with_overrides(dict(parse_override(t) for t in args.set))
+    variants = {" ".join(texts): dict(parse_override(t) for t in texts) for texts in args.variant}
+    if not variants:
+        parser.error("give at least one --variant")
+    widths = {name: args.width for name in TARGETS}
+    if args.metric:
+        widths = {name: float(width) for name, _, width in (text.partition("=") for text in args.metric)}
+
+    report, replicates = compare_scenarios(variants, args.days, widths, base, args.confidence,
+                                           args.min_replicates, args.max_replicates, args.batch,
+                                           args.seed, args.processes, not args.independent, sys.stdout)
+    print(f"{replicates} paired replicates x {args.days} days ({args.confidence:.0%} intervals)")
+    for name, rows in report.items():
+        print(f"--- {name} vs baseline ---")
+        for metric, row in rows.items():
+            print(f"  {metric:18} {row['baseline']:9.1f} -> {row['variant']:9.1f}   "
+                  f"diff {row['difference']:+8.2f} ± {row['half_width']:.2f}   "
+                  f"variance reduction x{row['variance_reduction']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
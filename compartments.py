@@ -0,0 +1,437 @@
+"""
+Aggregated compartment engine: the same daily rules as simulate_day, applied
+to expected counts instead of residents, for what-if runs at 10^6-10^7
+residents in milliseconds per day.
+
+The state is one array of counts indexed
+[persona, job, disease, hospital, hungry days], where disease is 0 for the
+healthy and 1 + days_infected for the infected, plus an age histogram (for
+natural deaths, couples and first jobs) and the number of couples. Every
+phase moves expected masses between buckets:
+
+- deaths: HEALTH_TTL_BY_PERSONA (update_disease), age curve and
+  starvation_days / starvation_deficit (check_deaths)
+- doctors: the cure and visit curves of update_doctor, capacity and beds,
+  in population order or by urgency (config.triage)
+- food: update_food and the tiers / policy of food.py; inside a tier the
+  least hungry are fed first (the agents are fed in a stable order, so hunger
+  piles up on the same residents)
+- satisfaction: habitant.satisfaction_score (calculate_satisfaction on a size)
+
+Transmission is mean-field: a healthy resident meets Poisson(I * pi r^2 / A)
+infected on the WIDTH x HEIGHT map, each infecting with transmission_prob,
+times `contact_scale`. calibrate() fits contact_scale to agent-based runs.
+
+    python compartments.py --size 10000000 --days 365
+    python compartments.py --calibrate --size 500 --days 60 --replicates 8
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from config import as_config, parse_override
+from food import TIER, allocate
+from habitant import (PERSONAS, JOBS, RICH, POOR, NORMAL, FARMER, DOCTOR, WORKER, JOBLESS, NONE,
+                      PERSONA_DRAW, JOB_DRAW, HIRE_DRAW, STATE_DRAW, INFECT,
+                      daily_need_table, ttl_table, satisfaction_score)
+from movement import WIDTH, HEIGHT
+from simulation import METRICS
+
+AGE_CAP = 101  # last bin of the age histogram: nobody dies of old age past 100
+GRID_POINTS = 25  # calibrate(): coarse scan of log10(contact_scale) before golden-section
+
+
+def _weights(draw, size):
+    """Categorical draw (codes, weights) as a probability vector indexed by code."""
+    codes, weights = draw
+    w = np.zeros(size)
+    w[list(codes)] = weights
+    return w / w.sum()
+
+
+def _fill(mass, capacity, keys=None):
+    """
+    Share of every bucket served when `capacity` units go to `mass`: the same
+    share everywhere (population order), or lowest key first.
+
+    Arguments: mass (array), capacity, keys (array broadcastable to mass, or None)
+    Returns: array of shares in [0, 1], shaped like mass
+    """
+    total = mass.sum()
+    if total <= 0 or capacity <= 0:
+        return np.zeros_like(mass)
+    if keys is None:
+        return np.full_like(mass, min(1.0, capacity / total))
+    flat = mass.ravel()
+    order = np.argsort(np.broadcast_to(keys, mass.shape).ravel(), kind="stable")
+    before = np.cumsum(flat[order]) - flat[order]
+    taken = np.zeros_like(flat)
+    taken[order] = np.clip(capacity - before, 0, flat[order])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.nan_to_num(taken / flat).reshape(mass.shape)
+
+
+# --- Engine ---
+class CompartmentModel:
+    """
+    Expected-value counterpart of Simulation: step() returns the same METRICS
+    (as floats). Deterministic; `contact_scale` multiplies the mean-field
+    force of infection (fit it with calibrate()).
+    """
+
+    def __init__(self, config=None, size=None, contact_scale=1.0):
+        """
+        Arguments: config (SimulationConfig or dict of overrides), size (initial
+        residents, default config.size), contact_scale
+        """
+        self.config = config = as_config(config)
+        self.contact_scale = contact_scale
+        size = config.size if size is None else size
+
+        self.need = np.array(daily_need_table(config), dtype=float)          # [persona, job]
+        self.ttl = np.array(ttl_table(config))
+        self.n_disease = int(self.ttl.max()) + 3   # healthy, days_infected 0..max ttl, one past it
+        need = np.where(self.need > 0, self.need, np.inf)
+        # hungry days after which check_deaths starves the bucket (deficit ~ days * need)
+        self.starve_at = np.maximum(config.starvation_days,
+                                    np.floor(config.starvation_deficit / need) + 1).astype(int)
+        self.n_hungry = int(self.starve_at.max()) + 1
+
+        days_infected = np.arange(self.n_disease) - 1.0
+        self.cure = np.maximum(0, config.cure_base - (days_infected - 1) * config.cure_decay)
+        self.visit = np.minimum(1, config.visit_base + (days_infected - 1) * config.visit_growth)
+        self.cure[0] = self.visit[0] = 0
+        # triage key: days left before the TTL death, [persona, disease]
+        self.urgency = self.ttl[:, None] - days_infected[None, :]
+        self.dying = (days_infected[None, :] > self.ttl[:, None]) & (days_infected >= 0)
+
+        ages = np.arange(AGE_CAP + 1)
+        old = config.natural_death_prob + (ages - config.old_age) / 40 * config.old_age_extra_prob
+        self.p_natural = np.where((ages >= 10) & (ages <= 100),
+                                  np.where(ages < config.old_age, config.natural_death_prob, old), 0.0)
+
+        self.personas = _weights(PERSONA_DRAW, len(PERSONAS))
+        self.first_jobs = _weights(JOB_DRAW, len(JOBS))
+        self.hires = _weights(HIRE_DRAW, len(JOBS))
+        self.infected_at_birth = _weights(STATE_DRAW, 2)[INFECT]
+
+        self.n = np.zeros((len(PERSONAS), len(JOBS), self.n_disease, 2, self.n_hungry))
+        states = np.array([1 - self.infected_at_birth, self.infected_at_birth])
+        self.n[:, :, :2, 0, 0] = size * self.personas[:, None, None] * self.first_jobs[None, :, None] * states
+        self.ages = np.zeros(AGE_CAP + 1)
+        self.ages[25] = size
+        self.couples = np.floor(size / 2)
+        self.food = config.food
+        self.satisfaction = self.satisfaction_prev = config.satisfaction
+        self.day = 1
+
+    # --- Helpers ---
+    def total(self):
+        return self.n.sum()
+
+    def _remove(self, dead, split):
+        """
+        Take `dead` (shaped like self.n) out of the buckets and, pro rata per
+        job class, out of the age histogram (residents under `split` have job none).
+
+        Returns: mass removed among the adults (job != none)
+        """
+        children, adults = dead[:, NONE].sum(), dead.sum() - dead[:, NONE].sum()
+        for part, mass in ((slice(0, split), children), (slice(split, None), adults)):
+            alive = self.ages[part].sum()
+            if alive > 0:
+                self.ages[part] *= max(0.0, 1 - mass / alive)
+        self.n -= dead
+        return adults
+
+    # --- Phases ---
+    def check_deaths(self):
+        """Natural deaths from the age histogram, starvation from the hungry-days axis."""
+        split = 16  # the ones turning 15 today still have job none until the status changes
+        dead_by_age = self.ages * self.p_natural
+        q = np.ones(len(JOBS))
+        for jobs, part in (([NONE], slice(0, split)), ([FARMER, DOCTOR, WORKER, JOBLESS], slice(split, None))):
+            alive = self.ages[part].sum()
+            q[jobs] = dead_by_age[part].sum() / alive if alive > 0 else 0
+        natural = self.n * q[None, :, None, None, None]
+        self.ages -= dead_by_age
+        self.n -= natural
+
+        hungry_days = np.arange(self.n_hungry)
+        starving = hungry_days[None, None, :] >= self.starve_at[:, :, None]     # [persona, job, hungry]
+        starved = self.n * starving[:, :, None, None, :]
+        adults = self._remove(starved, split)
+        return natural.sum(), starved.sum(), natural[:, :NONE].sum() + adults
+
+    def update_food(self):
+        config = self.config
+        by_persona = self.n.sum(axis=(1, 2, 3, 4))
+        by_job = self.n.sum(axis=(0, 2, 3, 4))
+        production = config.job_action["farmer"] * by_job[FARMER]
+        consumption = sum(config.daily_need_by_persona_and_job[name] * by_persona[p]
+                          for p, name in enumerate(PERSONAS))
+        consumption += sum(config.job_action[JOBS[j]] * by_job[j] for j in (WORKER, JOBLESS))
+        self.food += production
+        return consumption
+
+    def handle_births(self, consumption):
+        config = self.config
+        if self.satisfaction <= config.birth_min_satisfaction:
+            return 0.0
+        p = config.birth_prob_shortage if self.food < consumption else config.birth_prob
+        if self.total() > config.crowding_size:
+            p /= config.crowding_divisor
+        births = self.couples * p
+        states = np.array([1 - self.infected_at_birth, self.infected_at_birth])
+        self.n[:, NONE, :2, 0, 0] += births * self.personas[:, None] * states
+        self.ages[0] += births
+        return births
+
+    def _move(self, persona=None, job=None, share=0.0, to_persona=None, to_jobs=None):
+        """Move `share` of a persona slice to another persona, or of a job slice to jobs by weights."""
+        if persona is not None:
+            moved = self.n[persona] * share
+            self.n[persona] -= moved
+            self.n[to_persona] += moved
+        else:
+            moved = self.n[:, job] * share
+            self.n[:, job] -= moved
+            self.n += moved[:, None] * to_jobs[None, :, None, None, None]
+        return moved.sum()
+
+    def update_status_changes(self):
+        s, s_prev = self.satisfaction, self.satisfaction_prev
+        p_ruin = (100 - s) / 100 * 0.1 + (0.05 if s < s_prev else 0)
+        p_enrich = s / 100 * 0.05 + (0.05 if s > s_prev else 0)
+        children = self.ages[:16].sum()
+        first_jobs = self.ages[15] / children if children > 0 else 0.0
+
+        changes = self._move(job=WORKER, share=0.01, to_jobs=np.eye(len(JOBS))[JOBLESS])
+        changes += self._move(job=JOBLESS, share=0.05, to_jobs=self.hires)
+        changes += self._move(job=NONE, share=first_jobs, to_jobs=self.first_jobs)
+        changes += self._move(persona=POOR, share=0.05, to_persona=NORMAL)
+        changes += self._move(persona=RICH, share=p_ruin, to_persona=NORMAL)
+        changes += self._move(persona=NORMAL, share=p_enrich, to_persona=RICH)
+        return changes
+
+    def distribute_food(self):
+        """
+        Share the food between the tiers of food.py with config.food_policy;
+        inside a tier the least hungry buckets are served first.
+
+        Returns: underfed
+        """
+        config = self.config
+        people = self.n.sum(axis=(2, 3)).transpose(2, 0, 1)                    # [hungry, persona, job]
+        need = people * self.need
+        tier = np.broadcast_to(TIER, people.shape)
+        given, self.food = allocate(need.ravel(), tier.ravel(), self.food, config.food_policy,
+                                    config.food_quotas)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fed = np.nan_to_num(given.reshape(need.shape) / need, nan=1.0)
+        if config.food_policy == "proportional":
+            fed = (fed >= 1).astype(float)  # a ration short of the need leaves everybody hungry
+        listed = tier >= 0
+        underfed = (people * (1 - fed) * listed).sum()
+
+        fed = fed.transpose(1, 2, 0)[:, :, None, None, :]
+        listed = listed.transpose(1, 2, 0)[:, :, None, None, :]
+        n = self.n
+        eaten, hungry = n * fed * listed, n * (1 - fed) * listed
+        n = n - eaten - hungry
+        n[..., 0] += eaten.sum(axis=-1)
+        n[..., 1:] += hungry[..., :-1]
+        n[..., -1] += hungry[..., -1]
+        self.n = n
+        return underfed
+
+    def spread_infection(self):
+        config = self.config
+        infected = self.n[:, :, 1:].sum()
+        contacts = infected * math.pi * config.contact_radius ** 2 / (WIDTH * HEIGHT)
+        p = 1 - math.exp(-self.contact_scale * contacts * config.transmission_prob)
+        new = self.n[:, :, 0] * p
+        self.n[:, :, 0] -= new
+        self.n[:, :, 2] += new          # days_infected = 1
+        return new.sum()
+
+    def update_disease(self):
+        n = self.n
+        n[:, :, 2:] = n[:, :, 1:-1].copy()
+        n[:, :, 1] = 0
+        dead = n * self.dying[:, None, :, None, None]
+        adults = self._remove(dead, 15)
+        return dead.sum(), adults
+
+    def update_doctor(self):
+        config = self.config
+        n = self.n
+        nb_doctors = n[:, DOCTOR].sum()
+        visits = 0.0
+        if nb_doctors > 0 and self.day > config.doctor_start_day:
+            capacity = nb_doctors * config.job_action["doctor"]
+            keys = self.urgency[:, None, 1:, None] if config.triage == "urgency" else None
+
+            patients = n[:, :, 1:, 1]
+            treated = patients * _fill(patients, capacity, keys)
+            cured = treated * self.cure[None, None, 1:, None]
+            n[:, :, 1:, 1] -= cured
+            n[:, :, 0, 0] += cured.sum(axis=2)
+            capacity -= treated.sum()
+
+            admissions = capacity
+            if config.hospital_beds:
+                admissions = min(capacity, config.hospital_beds - n[:, :, :, 1].sum())
+            if admissions > 0:
+                waiting = n[:, :, 1:, 0] * self.visit[None, None, 1:, None]
+                admitted = waiting * _fill(waiting, admissions, keys)
+                n[:, :, 1:, 0] -= admitted
+                n[:, :, 1:, 1] += admitted
+                visits = admitted.sum()
+        return visits, nb_doctors
+
+    # --- One day ---
+    def step(self):
+        """
+        Run one day, in the phase order of simulate_day.
+
+        Returns: dict with one value per name in simulation.METRICS
+        """
+        config = self.config
+        self.ages[1:] = np.concatenate([self.ages[:-2], [self.ages[-2] + self.ages[-1]]])
+        self.ages[0] = 0
+
+        adults18 = self.ages[18:].sum()
+        self.couples += max(0.0, adults18 - 2 * self.couples) / 2
+        adults_before = self.total() - self.n[:, NONE].sum()
+
+        natural, starved, adult_deaths = self.check_deaths()
+        consumption = self.update_food()
+        births = self.handle_births(consumption)
+        changes = self.update_status_changes()
+        underfed = self.distribute_food()
+        self.spread_infection()
+        disease, adult_disease = self.update_disease()
+        visits, nb_doctors = self.update_doctor()
+
+        nb_hospitalized = self.n[:, :, :, 1].sum()
+        couples = self.couples
+        self.satisfaction_prev = self.satisfaction
+        self.satisfaction = satisfaction_score(self.satisfaction, consumption, self.food,
+                                               natural + starved + disease, nb_hospitalized,
+                                               nb_doctors, int(round(self.total())), underfed, config)
+        # couples lose a member at the adults' death rate of the day; widows pair up again tomorrow
+        death_rate = (adult_deaths + adult_disease) / adults_before if adults_before > 0 else 0
+        self.couples *= (1 - death_rate) ** 2
+        self.day += 1
+        return {
+            "population": self.total(),
+            "infected": self.n[:, :, 1:].sum(),
+            "hospitalized": nb_hospitalized,
+            "couples": couples,
+            "food": self.food,
+            "satisfaction": self.satisfaction,
+            "births": births,
+            "visits": visits,
+            "status_changes": changes,
+            "deaths_infection": disease,
+            "deaths_starvation": starved,
+            "deaths_natural": natural,
+        }
+
+    def run(self, days):
+        """Returns: {metric: [value per day]} for every name in simulation.METRICS"""
+        rows = [self.step() for _ in range(days)]
+        return {metric: [float(row[metric]) for row in rows] for metric in METRICS}
+
+
+# --- Calibration ---
+def calibrate(config=None, days=60, replicates=8, seed=0, processes=None, metric="infected",
+              bounds=(0.01, 10.0), tolerance=0.01, runs=None):
+    """
+    Fit contact_scale so that the compartment curve of `metric` matches the
+    mean of agent-based runs (batch.run_ensemble), by golden-section search
+    of the squared error on log(contact_scale). The error is not unimodal (a
+    curve that peaks too early or too late can fit better than one close to
+    the right scale), so a coarse grid over the bounds picks the bracket first.
+
+    Arguments: config, days, replicates, seed, processes (agent runs),
+    metric, bounds (of contact_scale), tolerance (on log10 scale),
+    runs (precomputed run_ensemble results, to skip the agent runs)
+    Returns: {"contact_scale", "error" (RMSE), "agents" (mean curve), "model" (fitted curve)}
+    """
+    from batch import run_ensemble
+
+    config = as_config(config)
+    if runs is None:
+        runs = run_ensemble(config, days, replicates, seed, processes)
+    target = np.mean([run[metric] for run in runs], axis=0)
+
+    def error(log_scale):
+        curve = CompartmentModel(config, contact_scale=10 ** log_scale).run(len(target))[metric]
+        return float(np.sqrt(np.mean((np.array(curve) - target) ** 2)))
+
+    lo, hi = math.log10(bounds[0]), math.log10(bounds[1])
+    grid = np.linspace(lo, hi, GRID_POINTS)
+    best = int(np.argmin([error(x) for x in grid]))
+    lo, hi = grid[max(best - 1, 0)], grid[min(best + 1, GRID_POINTS - 1)]
+
+    ratio = (math.sqrt(5) - 1) / 2
+    a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+    err_a, err_b = error(a), error(b)
+    while hi - lo > tolerance:
+        if err_a < err_b:
+            hi, b, err_b = b, a, err_a
+            a = hi - ratio * (hi - lo)
+            err_a = error(a)
+        else:
+            lo, a, err_a = a, b, err_b
+            b = lo + ratio * (hi - lo)
+            err_b = error(b)
+    best = (lo + hi) / 2
+    model = CompartmentModel(config, contact_scale=10 ** best).run(len(target))[metric]
+    return {"contact_scale": 10 ** best, "error": error(best), "agents": target.tolist(), "model": model}
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compartment (mean-field) fast path of the virus simulation")
+    parser.add_argument("--size", type=int, default=None, help="initial residents (default: config.size)")
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--contact-scale", type=float, default=1.0)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--every", type=int, default=10, help="print a line every N days")
+    parser.add_argument("--calibrate", action="store_true", help="fit --contact-scale to agent-based runs")
+    parser.add_argument("--replicates", type=int, default=8, help="agent runs for --calibrate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--metric", default="infected", choices=METRICS, help="curve fitted by --calibrate")
+    args = parser.parse_args(argv)
+
+    config = dict(parse_override(text) for text in args.set)
+    if args.size is not None:
+        config["size"] = args.size
+    config = as_config(config)
+    scale = args.contact_scale
+    if args.calibrate:
+        fit = calibrate(config, args.days, args.replicates, args.seed, metric=args.metric)
+        scale = fit["contact_scale"]
+        print(f"contact_scale = {scale:.4f} (RMSE {fit['error']:.2f} {args.metric} vs "
+              f"{args.replicates} agent runs of {config.size} residents)")
+
+    model = CompartmentModel(config, contact_scale=scale)
+    start = time.perf_counter()
+    curves = model.run(args.days)
+    elapsed = time.perf_counter() - start
+    shown = ["population", "infected", "hospitalized", "food", "satisfaction"]
+    print("  day | " + " | ".join(f"{m:>12}" for m in shown))
+    for d in list(range(args.every - 1, args.days, args.every)) or [args.days - 1]:
+        print(f"{d + 1:5} | " + " | ".join(f"{curves[m][d]:12.0f}" for m in shown))
+    for cause in ("infection", "starvation", "natural"):
+        print(f"deaths by {cause:10}: {sum(curves[f'deaths_{cause}']):.0f}")
+    print(f"{args.days} days in {elapsed * 1e3:.1f} ms ({elapsed * 1e3 / args.days:.2f} ms/day)")
+
+
+if __name__ == "__main__":
+    main()
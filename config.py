@@ -0,0 +1,131 @@
+import hashlib
+import json
+from copy import deepcopy
+from dataclasses import dataclass, field, asdict, fields
+
+
+# --- Simulation parameters ---
+@dataclass
+class SimulationConfig:
+    """
+    Every tunable number of the model in one place.
+    The defaults are the values the model was written with; nested tables
+    can be overridden with dotted keys, e.g. "job_action.doctor".
+    """
+
+    # Initial conditions
+    size: int = 100                 # initial residents
+    food: float = 0
+    satisfaction: float = 50
+    contacts: str = "grid"          # contact engine name (contacts.py)
+
+    # Tables
+    job_action: dict = field(default_factory=lambda: {
+        "farmer": 35, "doctor": 3, "worker": 3, "jobless": 2})  # farmer produces 35 food units/day, doctor can treat 3 ppl/day
+    health_ttl_by_persona: dict = field(default_factory=lambda: {
+        "strong": 7, "weak": 3, "rich": 8, "poor": 4, "normal": 5})  # days before death if infected
+    daily_need_by_persona_and_job: dict = field(default_factory=lambda: {
+        "strong": 3, "weak": 3, "rich": 5, "poor": 1, "normal": 3,
+        "worker": 3, "jobless": 2})
+
+    # Transmission
+    contact_radius: float = 45      # px
+    transmission_prob: float = 0.45
+    # Contact model: "distance" (everyone closer than contact_radius) or "network"
+    # (network.py: households, workplaces and random community links)
+    contact_model: str = "distance"
+    workplace_size: int = 10        # "network": mean residents per workplace of a job
+    community_degree: int = 2       # "network": random community links made by each resident
+
+    # Movement (movement.py): "none", "random_walk", "commute" or "hospital"
+    movement: str = "none"
+    movement_step: float = 10           # px per day of the random walk
+    movement_speed: float = 60          # px per day toward the hospital
+    hospital_xy: list = field(default_factory=lambda: [860, 430])
+    workplaces: dict = field(default_factory=lambda: {
+        "farmer": [250, 430], "doctor": [860, 430], "worker": [1450, 300]})  # commute: centre of each job's area
+    workplace_spread: float = 150       # px, half-width of a job's area
+
+    # Food distribution (food.py): "priority", "proportional" or "quota"
+    food_policy: str = "priority"
+    food_quotas: dict = field(default_factory=dict)  # "quota": {tier: share of the stock reserved}
+
+    # Births
+    birth_min_satisfaction: float = 30
+    birth_prob: float = 0.2
+    birth_prob_shortage: float = 0.05   # when food < consumption
+    crowding_size: int = 1000           # above this population births are divided...
+    crowding_divisor: float = 10        # ...by this
+
+    # Deaths
+    natural_death_prob: float = 0.0005
+    old_age: int = 60
+    old_age_extra_prob: float = 0.0095  # added linearly between old_age and old_age + 40
+    starvation_days: int = 7
+    starvation_deficit: float = 10
+
+    # Doctors (success = cure_base - (days_infected - 1) * cure_decay)
+    doctor_start_day: int = 2
+    cure_base: float = 0.80
+    cure_decay: float = 0.10
+    visit_base: float = 0.30
+    visit_growth: float = 0.10
+    triage: str = "order"           # "order": population order; "urgency": fewest days to death first
+    hospital_beds: int = 0          # 0 = unlimited; otherwise the infected wait for a free bed
+
+    def with_overrides(self, overrides):
+        """
+        New config with `overrides` applied ({"size": 500, "job_action.doctor": 5, ...}).
+
+        Arguments: overrides (dict, dotted keys allowed)
+        Returns: SimulationConfig
+        """
+        config = deepcopy(self)
+        names = {f.name for f in fields(self)}
+        for key, value in (overrides or {}).items():
+            name, _, sub = key.partition(".")
+            if name not in names:
+                raise KeyError(f"Unknown config field: {name!r}")
+            if sub:
+                table = getattr(config, name)
+                if not isinstance(table, dict) or sub not in table:
+                    known = sorted(table) if isinstance(table, dict) else []
+                    raise KeyError(f"Unknown config key: {key!r} (keys of {name!r}: {known}; "
+                                   f"set the whole table to add keys)")
+                table[sub] = value
+            else:
+                setattr(config, name, deepcopy(value))
+        return config
+
+    def to_dict(self):
+        return asdict(self)
+
+    def key(self):
+        """Stable hash of the parameters (used to cache finished runs)."""
+        text = json.dumps(self.to_dict(), sort_keys=True)
+        return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+DEFAULT_CONFIG = SimulationConfig()
+
+
+def as_config(config):
+    """Accept a SimulationConfig, a dict of overrides of the defaults, or None."""
+    if isinstance(config, SimulationConfig):
+        return config
+    return DEFAULT_CONFIG.with_overrides(config)
+
+
+def parse_override(text):
+    """
+    Parse one command-line override "KEY=VALUE" (VALUE is JSON, or a plain string).
+
+    Arguments: text, e.g. "job_action.doctor=5" or "contacts=kdtree"
+    Returns: (key, value)
+    """
+    key, _, value = text.partition("=")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass  # plain string
+    return key, value
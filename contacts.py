@@ -0,0 +1,217 @@
+# --- Contact engines ---
+# Each engine indexes the healthy residents of the day ("targets") and answers
+# "which targets are within radius of (x, y)?" with their indices in increasing
+# order. The infections do not depend on that order: every (target, infector)
+# pair has its own draw on the counter RNG, keyed by day and the two ids
+# (rng.CounterRNG), so every engine gives the same infections. The fixed order
+# only makes the engines' answers directly comparable.
+
+CELL_SIZE = 45  # px, same as the transmission radius
+
+
+class BruteForceContacts:
+    """
+    Reference backend: compares the query point with every target.
+    O(targets) per query, only meant for checks and tiny populations.
+    """
+
+    def __init__(self, radius: float = CELL_SIZE):
+        self.radius = radius
+        self.points = []
+
+    def build(self, targets):
+        self.points = [(t.x, t.y) for t in targets]
+
+    def query(self, x, y):
+        r2 = self.radius * self.radius
+        found = []
+        for j, (bx, by) in enumerate(self.points):
+            dx, dy = bx - x, by - y
+            if dx * dx + dy * dy < r2:
+                found.append(j)
+        return found
+
+
+class GridContacts:
+    """
+    Uniform grid / spatial hash with square cells of `cell_size` px.
+    A query only scans the 3x3 block of cells around the point, so the cost
+    depends on local density instead of population size.
+    """
+
+    def __init__(self, radius: float = CELL_SIZE, cell_size: float = CELL_SIZE):
+        self.radius = radius
+        self.cell_size = cell_size
+        self.reach = int(-(-radius // cell_size))  # cells to scan on each side
+        self.cells = {}
+        self.points = []
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def build(self, targets):
+        self.points = [(t.x, t.y) for t in targets]
+        self.cells = {}
+        for j, (x, y) in enumerate(self.points):
+            self.cells.setdefault(self.cell_of(x, y), []).append(j)
+
+    def query(self, x, y):
+        r2 = self.radius * self.radius
+        cx, cy = self.cell_of(x, y)
+        found = []
+        for gx in range(cx - self.reach, cx + self.reach + 1):
+            for gy in range(cy - self.reach, cy + self.reach + 1):
+                for j in self.cells.get((gx, gy), ()):
+                    bx, by = self.points[j]
+                    dx, dy = bx - x, by - y
+                    if dx * dx + dy * dy < r2:
+                        found.append(j)
+        found.sort()
+        return found
+
+
+class KDTreeContacts:
+    """
+    2-d tree over the targets, built by median splits.
+    Better than the grid when density is very uneven (clusters, empty zones).
+    """
+
+    LEAF_SIZE = 16
+
+    def __init__(self, radius: float = CELL_SIZE):
+        self.radius = radius
+        self.points = []
+        self.root = None
+
+    def build(self, targets):
+        self.points = [(t.x, t.y) for t in targets]
+        self.root = self._build(list(range(len(self.points))), 0) if self.points else None
+
+    def _build(self, idx, axis):
+        if len(idx) <= self.LEAF_SIZE:
+            return idx  # leaf: plain list of indices
+        idx.sort(key=lambda j: self.points[j][axis])
+        mid = len(idx) // 2
+        split = self.points[idx[mid]][axis]
+        return (axis, split,
+                self._build(idx[:mid], 1 - axis),
+                self._build(idx[mid:], 1 - axis))
+
+    def query(self, x, y):
+        r = self.radius
+        r2 = r * r
+        q = (x, y)
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                for j in node:
+                    bx, by = self.points[j]
+                    dx, dy = bx - x, by - y
+                    if dx * dx + dy * dy < r2:
+                        found.append(j)
+                continue
+            axis, split, left, right = node
+            if q[axis] - r < split:
+                stack.append(left)
+            if q[axis] + r >= split:
+                stack.append(right)
+        found.sort()
+        return found
+
+
+# --- Incremental grid over a moving population ---
+class CellIndex:
+    """
+    Residents bucketed by square cells of `cell_size` px, kept up to date as
+    they move, are born and die: a move only touches the index when the
+    resident crosses into another cell. Used instead of a daily build() when
+    the population tracks its cells (Population.track_cells).
+    """
+
+    def __init__(self, cell_size: float = CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}    # (cx, cy) -> {id: resident}
+        self.cell_of = {}  # id -> (cx, cy)
+
+    def key(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def add(self, r):
+        cell = self.key(r.x, r.y)
+        self.cell_of[r.id] = cell
+        self.cells.setdefault(cell, {})[r.id] = r
+
+    def discard(self, r):
+        cell = self.cell_of.pop(r.id)
+        members = self.cells[cell]
+        del members[r.id]
+        if not members:
+            del self.cells[cell]
+
+    def move(self, r):
+        """Re-bucket `r` after its x/y changed; returns True if it changed cell."""
+        if self.key(r.x, r.y) == self.cell_of[r.id]:
+            return False
+        self.discard(r)
+        self.add(r)
+        return True
+
+    def near(self, x, y, radius):
+        """Residents strictly closer than `radius` to (x, y), in no particular order."""
+        r2 = radius * radius
+        reach = int(-(-radius // self.cell_size))
+        cx, cy = self.key(x, y)
+        found = []
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                for r in self.cells.get((gx, gy), {}).values():
+                    dx, dy = r.x - x, r.y - y
+                    if dx * dx + dy * dy < r2:
+                        found.append(r)
+        return found
+
+
+CONTACT_BACKENDS = {
+    "grid": GridContacts,
+    "kdtree": KDTreeContacts,
+    "brute": BruteForceContacts,
+}
+
+
+def make_contacts(name: str = "grid", radius: float = CELL_SIZE):
+    """
+    Build a contact engine by name ("grid", "kdtree" or "brute").
+
+    Arguments: name, radius
+    Returns: engine instance
+    """
+    try:
+        return CONTACT_BACKENDS[name](radius=radius)
+    except KeyError:
+        raise ValueError(f"Unknown contact backend: {name!r} "
+                         f"(expected one of {sorted(CONTACT_BACKENDS)})") from None
+
+
+# --- TEST FONCTION ---
+
+
+if __name__ == "__main__":
+    from habitant import Population, spread_infection
+    from rng import CounterRNG
+
+    print("=== CONTACT BACKENDS: same seed -> same infection set ===")
+    for size in (200, 2000):
+        results = {}
+        for name in CONTACT_BACKENDS:
+            rng = CounterRNG(7)
+            population = Population()
+            population.spawn(size, 25, rng)
+            for r in population[::10]:
+                r.state = "infect"
+            population, transmissions = spread_infection(population, rng, 1, make_contacts(name))
+            results[name] = [i for i, r in enumerate(population) if r.state == "infect"]
+            print(f"{size:5} residents | {name:6} | {transmissions} transmissions")
+        assert all(v == results["brute"] for v in results.values()), "backends disagree"
+    print("=== OK ===")
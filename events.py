@@ -0,0 +1,214 @@
+"""
+Typed event log: deaths, births, doctor visits, transmissions and job/persona
+changes recorded as integer-coded rows in append-only column buffers.
+
+Every row has the same columns (unused ones are -1). Full chunks are handed
+to a sink (CSV, Arrow IPC or Parquet) and dropped, so memory stays bounded
+over long runs; run totals are tallied day by day and stay available.
+"""
+import csv
+from array import array
+from collections import Counter
+
+import numpy as np
+
+# --- Event kinds and death causes ---
+KINDS = ("death", "birth", "visit", "transmission", "job_change", "persona_change")
+DEATH, BIRTH, VISIT, TRANSMISSION, JOB_CHANGE, PERSONA_CHANGE = range(len(KINDS))
+CAUSES = ("natural", "starvation", "infection")
+NATURAL, STARVATION, INFECTION = range(len(CAUSES))
+
+# column -> (array typecode, NumPy dtype)
+COLUMNS = {
+    "day": ("i", np.int32),
+    "kind": ("b", np.int8),
+    "resident": ("q", np.int64),       # id of the resident concerned (the child for births)
+    "job": ("b", np.int8),             # job / persona codes of that resident when recorded
+    "persona": ("b", np.int8),
+    "days_infected": ("i", np.int32),
+    "at_hospital": ("b", np.int8),
+    "hospital_days": ("i", np.int32),
+    "old": ("b", np.int8),             # job/persona changes: code before / after
+    "new": ("b", np.int8),
+    "cause": ("b", np.int8),           # deaths: index in CAUSES
+    "source": ("q", np.int64),         # transmissions: infector id; births: parent id
+}
+TALLY_KEY = ("kind", "old", "new", "cause")  # run totals are counted per distinct key
+
+
+class EventLog:
+    """
+    Append-only event buffers, flushed to `sink` in chunks of about
+    `chunk_size` rows (always on a day boundary). Without a sink, flushed
+    rows are simply dropped and only the totals are kept.
+
+    Per day: begin_day(day), then record()/record_rows() from the phases,
+    today(kind) for the day's rows, and end_day() to tally and maybe flush.
+
+    `tree` (optional transmission_tree.TransmissionTree) is given every
+    transmission with its distance by spread_infection, and is ended,
+    flushed and closed along with the log.
+    """
+
+    def __init__(self, sink=None, chunk_size: int = 65_536, tree=None):
+        self.sink = sink
+        self.tree = tree
+        self.chunk_size = chunk_size
+        self.buffers = {name: array(code) for name, (code, _) in COLUMNS.items()}
+        self.totals = Counter()   # (kind, old, new, cause) -> rows over the whole run
+        self.last_day = [0] * len(KINDS)  # rows of each kind on the last ended day
+        self.day = 0
+        self.day_start = 0        # first buffered row of the current day
+        self._today = None        # record array of the current day, rebuilt when rows are added
+
+    def __len__(self):
+        return len(self.buffers["day"])
+
+    def begin_day(self, day):
+        self.day = day
+        self.day_start = len(self)
+
+    def record(self, kind, r, old=-1, new=-1, cause=-1, source=-1):
+        """Append one event about the Habitant `r`."""
+        b = self.buffers
+        b["day"].append(self.day)
+        b["kind"].append(kind)
+        b["resident"].append(r.id)
+        b["job"].append(r.job_code)
+        b["persona"].append(r.persona_code)
+        b["days_infected"].append(r.days_infected)
+        b["at_hospital"].append(r.at_hospital)
+        b["hospital_days"].append(r.hospital_days)
+        b["old"].append(old)
+        b["new"].append(new)
+        b["cause"].append(cause)
+        b["source"].append(source)
+
+    def record_rows(self, kind, pop, rows, old=-1, new=-1, cause=-1, source=-1):
+        """
+        Append one event per row of a PopulationArrays.
+        old, new, cause and source are scalars or arrays aligned with `rows`.
+        """
+        n = len(rows)
+        if n == 0:
+            return
+        values = {
+            "day": self.day, "kind": kind, "resident": pop.id[rows],
+            "job": pop.job[rows], "persona": pop.persona[rows],
+            "days_infected": pop.days_infected[rows], "at_hospital": pop.at_hospital[rows],
+            "hospital_days": pop.hospital_days[rows],
+            "old": old, "new": new, "cause": cause, "source": source,
+        }
+        for name, (_, dtype) in COLUMNS.items():
+            column = np.broadcast_to(np.asarray(values[name], dtype=dtype), (n,))
+            self.buffers[name].frombytes(np.ascontiguousarray(column).tobytes())
+
+    def columns(self, start=0, stop=None):
+        """Buffered rows [start:stop] as {column: NumPy array} (copies)."""
+        stop = len(self) if stop is None else stop
+        return {name: np.frombuffer(buf, dtype=COLUMNS[name][1])[start:stop].copy()
+                for name, buf in self.buffers.items()}
+
+    def today(self, *kinds):
+        """Rows of the current day with one of `kinds`, as a NumPy record array."""
+        if self._today is None or len(self._today) != len(self) - self.day_start:
+            day = self.columns(self.day_start)
+            self._today = np.rec.fromarrays(list(day.values()), names=list(day))
+        if len(kinds) == 1:
+            return self._today[self._today.kind == kinds[0]]
+        return self._today[np.isin(self._today.kind, kinds)]
+
+    def end_day(self):
+        """Add the day's rows to the totals and to last_day; flush if the buffers are full."""
+        day = self.columns(self.day_start)
+        self.last_day = np.bincount(day["kind"], minlength=len(KINDS)).tolist()
+        if len(day["day"]):
+            # the key columns are int8: pack them 8 bits each in one integer to count in a single pass
+            packed = np.zeros(len(day["day"]), dtype=np.int64)
+            for name in TALLY_KEY:
+                packed = (packed << 8) | (day[name].astype(np.int64) + 128)
+            keys, counts = np.unique(packed, return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                fields = []
+                for _ in TALLY_KEY:
+                    key, code = divmod(key, 256)
+                    fields.append(code - 128)
+                self.totals[tuple(reversed(fields))] += count
+        self.day_start = len(self)
+        self._today = None
+        if self.tree is not None:
+            self.tree.end_day(self.day)
+        if len(self) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Hand the buffered rows to the sink and empty the buffers."""
+        if self.sink is not None and len(self):
+            self.sink.write(self.columns())
+        for name, (code, _) in COLUMNS.items():
+            self.buffers[name] = array(code)
+        self.day_start = 0
+        self._today = None
+        if self.tree is not None:
+            self.tree.flush()
+
+    def close(self):
+        self.flush()
+        if self.sink is not None:
+            self.sink.close()
+        if self.tree is not None:
+            self.tree.close()
+
+    def count(self, kind, old=None, new=None, cause=None):
+        """Run total of `kind` events, optionally restricted to old/new codes or a cause."""
+        return sum(n for (k, o, w, c), n in self.totals.items()
+                   if k == kind and old in (None, o) and new in (None, w) and cause in (None, c))
+
+
+# --- Sinks (write one chunk of columns at a time; `columns` is the schema, events.COLUMNS by default) ---
+class CSVSink:
+    def __init__(self, path, columns=COLUMNS):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, columns):
+        self.writer.writerows(zip(*(col.tolist() for col in columns.values())))
+
+    def close(self):
+        self.file.close()
+
+
+class ArrowSink:
+    """Arrow IPC file (format="arrow") or Parquet file (format="parquet"); needs pyarrow."""
+
+    def __init__(self, path, format="arrow", columns=COLUMNS):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(f"pyarrow is required to write {format} event logs "
+                              "(pip install pyarrow), or use a .csv path") from None
+        self.pa = pa
+        self.schema = pa.schema([(name, pa.from_numpy_dtype(dtype)) for name, (_, dtype) in columns.items()])
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, columns):
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def open_sink(path, columns=COLUMNS):
+    """Sink chosen by file extension: .csv, .arrow / .feather / .ipc, or .parquet."""
+    if path.endswith(".csv"):
+        return CSVSink(path, columns)
+    if path.endswith(".parquet"):
+        return ArrowSink(path, format="parquet", columns=columns)
+    if path.endswith((".arrow", ".feather", ".ipc")):
+        return ArrowSink(path, format="arrow", columns=columns)
+    raise ValueError(f"Unknown event log format: {path!r} (expected .csv, .arrow or .parquet)")
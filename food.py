@@ -0,0 +1,93 @@
+"""
+Food allocation engine shared by both backends (habitant.distribute_food,
+population_arrays.distribute_food) and the compartment engine.
+
+Every resident belongs to at most one priority tier, by (persona, job):
+
+    0 "rich"     rich residents, whatever their job
+    1 "workers"  doctors, farmers and workers
+    2 "jobless"  jobless residents
+    3 "poor"     poor residents without a job (job "none")
+
+Residents of no tier (strong / weak / normal children) are neither fed nor
+counted hungry, as in the original model. Rows are ordered by tier in one
+stable sort (population order inside a tier), and the cutoff where food runs
+out is found on a cumulative sum of the needs.
+
+Policies (config.food_policy):
+- "priority": tiers in order, each resident takes a full share until the
+  food runs out; the first one short eats what is left
+- "proportional": when food is short, everybody gets the same fraction of
+  their need (in whole units)
+- "quota": each tier named in config.food_quotas has that share of the stock
+  reserved; what a tier leaves goes on to the next tiers
+"""
+import numpy as np
+
+from habitant import PERSONAS, JOBS, RICH, POOR, DOCTOR, FARMER, WORKER, JOBLESS, NONE
+
+TIERS = ("rich", "workers", "jobless", "poor")
+POLICIES = ("priority", "proportional", "quota")
+
+
+def tier_table():
+    """tier[persona, job]: priority tier of a resident, -1 for none (int8 array)."""
+    tier = np.full((len(PERSONAS), len(JOBS)), -1, dtype=np.int8)
+    tier[:, [DOCTOR, FARMER, WORKER]] = 1
+    tier[:, JOBLESS] = 2
+    tier[POOR, NONE] = 3
+    tier[RICH] = 0
+    return tier
+
+
+TIER = tier_table()
+
+
+def _cutoff(need, budget):
+    """Given to each row when `budget` feeds the rows in order (the first short row eats the rest)."""
+    before = np.cumsum(need) - need
+    return np.clip(budget - before, 0, need)
+
+
+def allocate(need, tier, food, policy="priority", quotas=None):
+    """
+    Share `food` between rows.
+
+    Arguments: need (food needed per row), tier (per row, -1 = not fed), food,
+    policy (see POLICIES), quotas ({tier name: share of the stock}, for "quota")
+    Returns: given (per row, in the input order), food left
+    """
+    need = np.asarray(need, dtype=float)
+    order = np.argsort(tier, kind="stable")
+    order = order[tier[order] >= 0]
+    ordered = need[order]
+    total = ordered.sum()
+
+    if total <= food:
+        given_ordered = ordered
+    elif policy == "priority":
+        given_ordered = _cutoff(ordered, food)
+    elif policy == "proportional":
+        given_ordered = np.floor(ordered * (food / total))
+    elif policy == "quota":
+        quotas = quotas or {}
+        unknown = set(quotas) - set(TIERS)
+        if unknown:
+            raise ValueError(f"Unknown food tiers: {sorted(unknown)} (expected some of {TIERS})")
+        reserved = np.array([np.floor(quotas.get(name, 0) * food) for name in TIERS])
+        if reserved.sum() > food:
+            raise ValueError("food_quotas add up to more than the whole stock")
+        bounds = np.searchsorted(tier[order], np.arange(len(TIERS) + 1))
+        given_ordered = np.zeros_like(ordered)
+        free = food - reserved.sum()
+        for t in range(len(TIERS)):
+            rows = slice(bounds[t], bounds[t + 1])
+            budget = reserved[t] + free
+            given_ordered[rows] = _cutoff(ordered[rows], budget)
+            free = budget - given_ordered[rows].sum()
+    else:
+        raise ValueError(f"Unknown food policy: {policy!r} (expected one of {POLICIES})")
+
+    given = np.zeros_like(need)
+    given[order] = given_ordered
+    return given, food - float(given_ordered.sum())
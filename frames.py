@@ -0,0 +1,299 @@
+"""
+Headless frame export: each day's population is drawn into an RGB NumPy array
+(same background, legend, colours and dot sizes as renderer.PopulationRenderer)
+and written as PNG files or piped to a local ffmpeg, without a window.
+
+Dots are stamped with vectorized scatters: one precomputed pixel footprint per
+radius (halo, black outline, colour fill), applied to every resident of that
+radius at once, layer by layer. The static layers are drawn once with pygame
+on the SDL dummy driver. Frames are encoded on a writer thread, so the
+simulation keeps running while the previous frame is compressed.
+
+    python frames.py --size 20000 --days 10000 --out run.mp4 --fps 30
+    python frames.py --backend arrays --size 200000 --days 500 --out frames/ --every 5
+"""
+import argparse
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import zlib
+
+import numpy as np
+
+from habitant import INFECT, JOBS, Population
+
+WIDTH, HEIGHT = 1720, 880  # the window of final_test.py
+PAD = 16                    # px around the canvas, more than the largest dot reach
+
+
+# --- Colour codes of an array population ---
+def encode_arrays(pop):
+    """Same (x, y, colour code, radius) arrays as live.encode, for a PopulationArrays."""
+    from renderer import INFECTED, CHILD, JOB_COLORS
+
+    by_job = np.full(len(JOBS), CHILD, dtype=np.uint8)
+    for job, code in JOB_COLORS.items():
+        by_job[job] = code
+    codes = np.where(pop.state == INFECT, INFECTED, by_job[pop.job]).astype(np.uint8)
+    radii = np.where(pop.age < 12, 3, np.where(pop.age < 60, 5, 4)).astype(np.uint8)
+    return pop.x.astype(np.int16), pop.y.astype(np.int16), codes, radii
+
+
+def encode(population):
+    """(x, y, colour code, radius) arrays of a Population or a PopulationArrays."""
+    if isinstance(population, Population):
+        from live import encode as encode_residents
+        return encode_residents(population)
+    return encode_arrays(population)
+
+
+# --- Rasterizer ---
+def _disk(radius):
+    """(dy, dx) of the pixels pygame.draw.circle fills around its centre (it spans -radius..radius - 1)."""
+    import pygame
+
+    surf = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+    pygame.draw.circle(surf, (255, 255, 255), (radius, radius), radius)
+    dx, dy = np.nonzero(pygame.surfarray.array2d(surf))
+    return dy - radius, dx - radius
+
+
+class Rasterizer:
+    """
+    Draws (x, y, colour code, radius) arrays on a copy of the cached background
+    and returns the frame as a (height, width, 3) uint8 array.
+    """
+
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from renderer import PALETTE, HALO_COLOR, LEGEND_W, LEGEND_H, PopulationRenderer
+
+        pygame.font.init()
+        self.width, self.height = width, height
+        self.background = pygame.surfarray.array3d(
+            PopulationRenderer._make_background(width, height)).transpose(1, 0, 2).copy()
+        legend = PopulationRenderer._make_legend()
+        self.legend = pygame.surfarray.array3d(legend).transpose(1, 0, 2).astype(np.int32)
+        self.legend_alpha = pygame.surfarray.array_alpha(legend).T[:, :, None].astype(np.int32)
+        self.legend_x, self.legend_y = width - LEGEND_W - 20, height - LEGEND_H - 20
+        self.legend_h = LEGEND_H
+        self.palette = np.array(PALETTE + [(0, 0, 0), HALO_COLOR], dtype=np.uint8)
+        self.black, self.halo = len(PALETTE), len(PALETTE) + 1
+        self.stamps = {}  # radius -> flat offsets of the halo, outline and fill disks
+
+    def _stamp(self, radius):
+        """Flat offsets (on the padded canvas) of the halo, outline and fill disks of a radius."""
+        if radius not in self.stamps:
+            stride = self.width + 2 * PAD
+            self.stamps[radius] = tuple((dy * stride + dx).astype(np.int32)
+                                        for dy, dx in (_disk(radius + 4), _disk(radius + 1), _disk(radius)))
+        return self.stamps[radius]
+
+    def _paint(self, canvas, at, offsets, colors, chunk=1 << 15):
+        """Stamp `offsets` around the flat positions `at` with `colors` (later rows on top)."""
+        for start in range(0, len(at), chunk):
+            where = at[start:start + chunk, None] + offsets[None, :]
+            canvas[where.ravel()] = np.repeat(colors[start:start + chunk], len(offsets))
+
+    def draw(self, xs, ys, codes, radii):
+        """
+        Draw the residents with the renderer's footprints and colours. All the
+        halos are drawn first, then the dots grouped by radius (outline, then
+        fill), so where dots overlap the stacking differs from
+        renderer.PopulationRenderer, which draws each resident's sprite in
+        population order: here no halo covers a dot, and larger radii go on
+        top of smaller ones.
+
+        Arguments: xs, ys, codes (renderer colour codes), radii (parallel arrays)
+        Returns: RGB frame, (height, width, 3) uint8
+        """
+        from renderer import INFECTED, LEGEND_W
+
+        xs, ys = np.asarray(xs, dtype=np.int32), np.asarray(ys, dtype=np.int32).copy()
+        codes, radii = np.asarray(codes, dtype=np.uint8), np.asarray(radii)
+        # residents spawned under the legend are drawn slightly above it
+        under = ((xs >= self.legend_x) & (xs < self.legend_x + LEGEND_W) &
+                 (ys >= self.legend_y) & (ys < self.legend_y + self.legend_h))
+        ys[under] -= self.legend_h + 10
+        stride = self.width + 2 * PAD
+        at = (np.clip(ys, 0, self.height - 1) + PAD) * stride + np.clip(xs, 0, self.width - 1) + PAD
+
+        # colour indices on a canvas padded by PAD px, so that stamps never need clipping
+        canvas = np.full((self.height + 2 * PAD) * stride, 255, dtype=np.uint8)  # 255: background
+        sizes = np.unique(radii).tolist()
+        for radius in sizes:  # halos first, under every dot
+            sick = (radii == radius) & (codes == INFECTED)
+            self._paint(canvas, at[sick], self._stamp(radius)[0], np.full(int(sick.sum()), self.halo, np.uint8))
+        for radius in sizes:
+            rows = radii == radius
+            _, outline, fill = self._stamp(radius)
+            self._paint(canvas, at[rows], outline, np.full(int(rows.sum()), self.black, np.uint8))
+            self._paint(canvas, at[rows], fill, codes[rows])
+
+        index = canvas.reshape(-1, stride)[PAD:PAD + self.height, PAD:PAD + self.width]
+        frame = self.background.copy()
+        drawn = index != 255
+        frame[drawn] = self.palette[index[drawn]]
+        box = frame[self.legend_y:self.legend_y + self.legend_h, self.legend_x:self.legend_x + LEGEND_W]
+        base = box.astype(np.int32)  # blended like pygame's per-pixel alpha blit
+        box[:] = base + (((self.legend - base) * self.legend_alpha + self.legend) >> 8)
+        return frame
+
+    def draw_population(self, population):
+        return self.draw(*encode(population))
+
+
+# --- Writers ---
+def png_bytes(frame, level=1):
+    """A (height, width, 3) uint8 array as PNG file bytes (zlib level 1: fast, larger files)."""
+    height, width, _ = frame.shape
+    raw = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 0] = 0  # filter type "none" on every row
+    raw[:, 1:] = frame.reshape(height, -1)
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), level)) + chunk(b"IEND", b""))
+
+
+class PNGWriter:
+    """One PNG file per frame in `directory` (day-00001.png, ...)."""
+
+    def __init__(self, directory, level=1):
+        self.directory, self.level = directory, level
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, day, frame):
+        with open(os.path.join(self.directory, f"day-{day:05d}.png"), "wb") as f:
+            f.write(png_bytes(frame, self.level))
+
+    def close(self):
+        pass
+
+
+class FFmpegWriter:
+    """Raw RGB frames piped to a local ffmpeg process encoding `path` (.mp4, .webm, .gif...)."""
+
+    def __init__(self, path, width=WIDTH, height=HEIGHT, fps=30, ffmpeg="ffmpeg"):
+        binary = shutil.which(ffmpeg)
+        if binary is None:
+            raise RuntimeError(f"{ffmpeg} is required to write {path} (install ffmpeg), "
+                               "or give a directory to write PNG frames")
+        self.process = subprocess.Popen(
+            [binary, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+             "-s", f"{width}x{height}", "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", path],
+            stdin=subprocess.PIPE)
+
+    def write(self, day, frame):
+        self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+def open_writer(path, fps=30, width=WIDTH, height=HEIGHT):
+    """PNG frames when `path` is a directory (ends with / or has no extension), else an ffmpeg video."""
+    if path.endswith(os.sep) or not os.path.splitext(path)[1]:
+        return PNGWriter(path)
+    return FFmpegWriter(path, width, height, fps)
+
+
+class FrameExporter:
+    """
+    Rasterize populations and hand the frames to `writer` on a background
+    thread (at most `backlog` frames waiting, so memory stays bounded).
+    """
+
+    def __init__(self, writer, rasterizer=None, backlog: int = 4):
+        self.writer = writer
+        self.rasterizer = rasterizer or Rasterizer()
+        self.frames = queue.Queue(backlog)
+        self.error = None
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def _drain(self):
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            try:
+                self.writer.write(*item)
+            except Exception as error:  # re-raised in the simulation thread
+                self.error = error
+
+    def add(self, day, population):
+        if self.error is not None:
+            raise self.error
+        self.frames.put((day, self.rasterizer.draw_population(population)))
+
+    def close(self):
+        self.frames.put(None)
+        self.thread.join()
+        self.writer.close()
+        if self.error is not None:
+            raise self.error
+
+
+# --- CLI ---
+def main(argv=None):
+    import time
+
+    from config import parse_override
+
+    parser = argparse.ArgumentParser(description="Headless export of a run as PNG frames or a video")
+    parser.add_argument("--out", required=True, help="directory for PNG frames, or a video file (needs ffmpeg)")
+    parser.add_argument("--backend", choices=["objects", "arrays"], default="objects")
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--every", type=int, default=1, help="one frame every N days")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE")
+    args = parser.parse_args(argv)
+
+    overrides = dict(parse_override(t) for t in args.set)
+    overrides["size"] = args.size
+    exporter = FrameExporter(open_writer(args.out, args.fps))
+    start = time.perf_counter()
+    frames = 0
+    if args.backend == "objects":
+        from simulation import Simulation
+        sim = Simulation(overrides, seed=args.seed)
+        for _ in range(args.days):
+            sim.step()
+            day = sim.day - 1
+            if day % args.every == 0:
+                exporter.add(day, sim.population)
+                frames += 1
+    else:
+        import population_arrays
+        from config import as_config
+        from events import EventLog
+
+        config = as_config(overrides)
+        pop = population_arrays.PopulationArrays.random(args.size, 25, args.seed)
+        couples = population_arrays.form_couples(pop)
+        food, satisfaction, events = config.food, config.satisfaction, EventLog()
+        satisfaction_prev = satisfaction
+        for day in range(1, args.days + 1):
+            pop, food, satisfaction, *_, couples = population_arrays.simulate_day(
+                pop, food, satisfaction, day, satisfaction_prev, couples, config, events)
+            satisfaction_prev = satisfaction
+            if day % args.every == 0:
+                exporter.add(day, pop)
+                frames += 1
+    exporter.close()
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames written to {args.out} in {elapsed:.1f} s ({frames / max(elapsed, 1e-9):.1f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,143 @@
-from random import choices, random, shuffle
-from math import sqrt
+import heapq
+import math
+from array import array
+from random import getrandbits, random
+
+import numpy as np
+
+import rng as streams
+from config import DEFAULT_CONFIG
+from contacts import CellIndex, make_contacts
+from profiling import call
+from events import (EventLog, DEATH, BIRTH, VISIT, TRANSMISSION, JOB_CHANGE, PERSONA_CHANGE,
+                    NATURAL, STARVATION, INFECTION)
+from rng import CounterRNG, pick
+
+# --- Simulation settings (defaults; every phase takes a config.SimulationConfig) ---
+JOB_ACTION = DEFAULT_CONFIG.job_action  # farmer produces 35 food units/day, doctor can treat 3 ppl/day
+HEALTH_TTL_BY_PERSONA = DEFAULT_CONFIG.health_ttl_by_persona  # days before death if infected
+DAILY_NEED_BY_PERSONA_AND_JOB = DEFAULT_CONFIG.daily_need_by_persona_and_job
+
+# --- Integer codes (position in the tuple = code) ---
+STATES = ("healthy", "infect")
+PERSONAS = ("strong", "weak", "rich", "poor", "normal")
+JOBS = ("farmer", "doctor", "worker", "jobless", "none")
+HEALTHY, INFECT = range(len(STATES))
+STRONG, WEAK, RICH, POOR, NORMAL = range(len(PERSONAS))
+FARMER, DOCTOR, WORKER, JOBLESS, NONE = range(len(JOBS))
+CODES = {"state": STATES, "persona": PERSONAS, "job": JOBS}
+CODE_OF = {field: {name: code for code, name in enumerate(names)} for field, names in CODES.items()}
+
+# --- Categorical draws: (codes, weights) ---
+STATE_DRAW = ((INFECT, HEALTHY), (1, 99))
+PERSONA_DRAW = ((STRONG, WEAK, RICH, POOR, NORMAL), (5, 5, 5, 10, 75))
+JOB_DRAW = ((FARMER, DOCTOR, WORKER, JOBLESS), (17, 5, 45, 8))
+HIRE_DRAW = ((DOCTOR, FARMER, WORKER), (1, 30, 69))
+
+
+# --- Lookup tables (indexed by code) ---
+def daily_need_table(config=DEFAULT_CONFIG):
+    """need[persona][job]: food eaten per day."""
+    return tuple(
+        tuple(config.daily_need_by_persona_and_job[p] +
+              (config.job_action[j] if j in ["worker", "jobless"] else 0) for j in JOBS)
+        for p in PERSONAS
+    )
+
+
+def ttl_table(config=DEFAULT_CONFIG):
+    """ttl[persona]: days before death if infected."""
+    return tuple(config.health_ttl_by_persona[p] for p in PERSONAS)
+
+
+# --- Indexed fields (index field name -> attribute holding the indexed value) ---
+INDEXED_FIELDS = {"state": "state_code", "persona": "persona_code", "job": "job_code",
+                  "at_hospital": "at_hospital"}
+
+
+def _indexed_field(attr, field):
+    """Property that keeps the population index of `field` in sync when `attr` changes."""
+    private = "_" + attr
+
+    def get(self):
+        return getattr(self, private)
+
+    def set(self, value):
+        old = getattr(self, private, None)
+        setattr(self, private, value)
+        if self._index is not None and old != value:
+            self._index.move(self, field, old, value)
+
+    return property(get, set)
+
+
+def _string_view(name):
+    """String property over the integer code field `<name>_code`."""
+    names, code_of, code = CODES[name], CODE_OF[name], name + "_code"
+
+    def get(self):
+        return names[getattr(self, code)]
+
+    def set(self, value):
+        setattr(self, code, code_of[value])
+
+    return property(get, set)
+
+
+def _clocked_field(private, running):
+    """
+    Day counter that is not incremented by hand: while running(r) holds in a
+    population, `private` stores the disease clock value at which the count was 0
+    and the count is clock - private; otherwise it stores the count itself.
+    PopulationIndex._retime switches between the two when running(r) changes.
+    """
+
+    def get(self):
+        if self._index is not None and running(self):
+            return self._index.clock - getattr(self, private)
+        return getattr(self, private)
+
+    def set(self, value):
+        if self._index is not None and running(self):
+            setattr(self, private, self._index.clock - value)
+            self._index.schedule(self)
+        else:
+            setattr(self, private, value)
+
+    return property(get, set)
+
+
+def _is_infected(r):
+    return r._state_code == INFECT
+
+
+def _is_hospitalized(r):
+    return r._state_code == INFECT and r._at_hospital
 
-# --- Simulation settings ---
-JOB_ACTION = {"farmer": 35, "doctor": 3,"worker": 3, "jobless": 2}  # farmer produces 35 food units/day, doctor can treat 3 ppl/day
-HEALTH_TTL_BY_PERSONA = {"strong": 7, "weak": 3, "rich": 8, "poor": 4, "normal": 5}  # days before death if infected
-DAILY_NEED_BY_PERSONA_AND_JOB = {
-    "strong": 3, "weak": 3, "rich": 5, "poor": 1, "normal": 3,
-    "worker": 3, "jobless": 2
-}
 
 # --- hanitant class ---
 class Habitant:
-    def __init__(self, age: int = 25):
+    """
+    One resident. Categorical fields are stored as small integer codes
+    (state_code, persona_code, job_code); state, persona and job are string
+    views of them for the API boundary (logs, display, callers).
+    """
+
+    __slots__ = ("_state_code", "_persona_code", "_job_code", "_at_hospital", "_index",
+                 "age", "_days_infected", "_hospital_days", "food_deficit", "days_hungry",
+                 "partner", "id", "x", "y")
+
+    state_code = _indexed_field("state_code", "state")
+    persona_code = _indexed_field("persona_code", "persona")
+    job_code = _indexed_field("job_code", "job")
+    at_hospital = _indexed_field("at_hospital", "at_hospital")
+    days_infected = _clocked_field("_days_infected", _is_infected)
+    hospital_days = _clocked_field("_hospital_days", _is_hospitalized)
+    state = _string_view("state")
+    persona = _string_view("persona")
+    job = _string_view("job")
+
+    def __init__(self, age: int = 25, draws=None):
         """
         Initialize a habitant with:
         - infection state, persona, job, age
@@ -19,12 +145,15 @@ class Habitant:
         - food shortage tracking
         - partner
         - spawn position (screen-space)
+
+        draws: 5 uniforms (state, persona, job, x, y), given by Population.spawn;
+        taken from the `random` module when omitted.
         """
-        self.state = choices(["infect", "healthy"], weights=[1, 99])[0]
-        self.persona = choices(["strong", "weak", "rich", "poor", "normal"],
-                               weights=[5, 5, 5, 10, 75])[0]
-        self.job = choices(["farmer", "doctor", "worker", "jobless"],
-                           weights=[17, 5, 45, 8])[0] if age >= 15 else "none"
+        u_state, u_persona, u_job, u_x, u_y = draws or [random() for _ in range(5)]
+        self._index = None  # PopulationIndex of the population the resident lives in
+        self.state_code = pick(u_state, STATE_DRAW)
+        self.persona_code = pick(u_persona, PERSONA_DRAW)
+        self.job_code = pick(u_job, JOB_DRAW) if age >= 15 else NONE
         self.age = age
 
         # Disease / hospital
@@ -39,22 +168,425 @@ class Habitant:
         # Social
         self.partner = None
 
+        # Unique id, given by the Population the resident joins
+        self.id = None
+
         # Position (adapt as needed to avoid your legend zone)
-        self.x = int(random() * 1720)
-        self.y = int(random() * 860)
+        self.x = int(u_x * 1720)
+        self.y = int(u_y * 860)
+
+
+# --- Live per-category index ---
+# Categories whose members are listed; the others (majorities such as healthy
+# or normal residents) only keep a count and are selected by a plain scan.
+# Categories whose members are kept: the ones the daily phases select.
+# Every other category is only counted (select() scans for it).
+LISTED = {("state", INFECT), ("at_hospital", True)}
+
+
+class PopulationIndex:
+    """
+    Live count of every (field, value) category, e.g. ("job", DOCTOR) or
+    ("at_hospital", True), plus the members of the LISTED ones, kept up to
+    date by the Habitant property setters.
+    Values are integer codes; names ("doctor") are accepted and converted.
+    """
+
+    def __init__(self):
+        self.totals = {field: {} for field in INDEXED_FIELDS}    # field -> code -> count
+        self.members = {field: {} for field in INDEXED_FIELDS}   # field -> code -> {id: resident}
+        for field, value in LISTED:
+            self.members[field][value] = {}
+        self.triage = None  # TriageQueue told about infected residents that change (see track_triage)
+        self.clock = 0      # disease days elapsed, ticked by update_disease (see _clocked_field)
+        self.calendar = None  # DeathCalendar of the infected (see track_deaths)
+
+    @staticmethod
+    def code(field, value):
+        return CODE_OF[field][value] if isinstance(value, str) else value
+
+    def add(self, r):
+        for field, attr in INDEXED_FIELDS.items():
+            self._enter(r, field, getattr(r, attr))
+        self._retime(r, False, False)
+        if r.state_code == INFECT:
+            self.schedule(r)
+            if self.triage is not None:
+                self.triage.touch(r)
+
+    def discard(self, r):
+        for field, attr in INDEXED_FIELDS.items():
+            self._leave(r, field, getattr(r, attr))
+        self._retime(r, r.state_code == INFECT, r.state_code == INFECT and r.at_hospital, False, False)
+        if self.triage is not None and r.state_code == INFECT:
+            self.triage.touch(r)
+
+    def move(self, r, field, old, new):
+        self._leave(r, field, old)
+        self._enter(r, field, new)
+        if field == "state" or field == "at_hospital":
+            was_infected = old == INFECT if field == "state" else r._state_code == INFECT
+            was_hospitalized = was_infected and (old if field == "at_hospital" else r._at_hospital)
+            self._retime(r, was_infected, was_hospitalized)
+        if r.state_code == INFECT and field != "job":
+            self.schedule(r)
+        if self.triage is not None and (field == "state" or r.state_code == INFECT) and field != "job":
+            self.triage.touch(r)
+
+    def _retime(self, r, was_infected, was_hospitalized, infected=None, hospitalized=None):
+        """Switch the clocked day counters of `r` between stored count and clock offset."""
+        infected = _is_infected(r) if infected is None else infected
+        hospitalized = _is_hospitalized(r) if hospitalized is None else hospitalized
+        if was_infected != infected:
+            r._days_infected = self.clock - r._days_infected
+        if was_hospitalized != hospitalized:
+            r._hospital_days = self.clock - r._hospital_days
+
+    def schedule(self, r):
+        if self.calendar is not None and r._state_code == INFECT:
+            self.calendar.schedule(r, self.clock)
+
+    def _enter(self, r, field, value):
+        totals = self.totals[field]
+        totals[value] = totals.get(value, 0) + 1
+        group = self.members[field].get(value)
+        if group is not None:
+            group[r.id] = r
+
+    def _leave(self, r, field, value):
+        self.totals[field][value] -= 1
+        group = self.members[field].get(value)
+        if group is not None:
+            del group[r.id]
+
+    def listed(self, field, value):
+        return (field, self.code(field, value)) in LISTED
+
+    def group(self, field, value):
+        """Members of a LISTED category ({id: resident}, any order)."""
+        return self.members[field][self.code(field, value)]
+
+    def count(self, field, *values):
+        totals = self.totals[field]
+        return sum(totals.get(self.code(field, v), 0) for v in values)
+
+    def counts(self, field):
+        """{code: count} for one field."""
+        return dict(self.totals[field])
+
+
+# --- Disease calendar ---
+class DeathCalendar:
+    """
+    Day of the disease clock on which each infected resident dies if nothing
+    changes: the day days_infected exceeds the TTL of their persona. Residents
+    are (re)scheduled by the PopulationIndex when they are infected or their
+    persona or days_infected changes; cured, dead or rescheduled residents keep
+    stale entries, which update_disease drops when it reaches them.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.due = {}  # clock -> [residents]
+
+    def schedule(self, r, clock):
+        # r._days_infected is the clock offset of an infected resident
+        when = max(r._days_infected + self.ttl[r._persona_code] + 1, clock + 1)
+        self.due.setdefault(when, []).append(r)
+
+    def pop(self, clock):
+        return self.due.pop(clock, [])
+
+
+# --- Triage ---
+class TriageQueue:
+    """
+    Infected residents in two heaps, "ward" (at hospital) and "waiting", keyed
+    by (day of death if untreated, id): the most urgent first. The key does not
+    change from day to day (day and days_infected grow together), so residents
+    are only re-keyed when their state, persona or hospital status changes,
+    which the PopulationIndex reports through touch(). Entries of cured, dead or
+    re-keyed residents are left in the heaps and skipped when popped; every
+    entry carries its own serial number, so an old entry stays stale even if
+    the resident gets its old key back (e.g. normal -> rich -> normal).
+    """
+
+    def __init__(self):
+        self.heaps = {True: [], False: []}  # at_hospital -> [(death_day, id, serial, resident)]
+        self.key_of = {}    # id -> (death_day, at_hospital, serial) of its valid entry
+        self.pending = {}   # id -> resident changed since the last refresh
+        self.serial = 0
+
+    def touch(self, r):
+        self.pending[r.id] = r
+
+    def refresh(self, population, day, ttl):
+        """(Re)key the residents touched since the last call: O(k log n) for k changes."""
+        for r in self.pending.values():
+            if r in population and r.state_code == INFECT:
+                key = (day + ttl[r.persona_code] - r.days_infected, bool(r.at_hospital))
+                if self.key_of.get(r.id, (None, None))[:2] != key:
+                    self.serial += 1
+                    self.key_of[r.id] = key + (self.serial,)
+                    heapq.heappush(self.heaps[key[1]], (key[0], r.id, self.serial, r))
+            else:
+                self.key_of.pop(r.id, None)
+        self.pending = {}
+        for ward, heap in self.heaps.items():
+            if len(heap) > 2 * len(self.key_of) + 64:
+                heap[:] = [entry for entry in heap if self.key_of.get(entry[1]) == (entry[0], ward, entry[2])]
+                heapq.heapify(heap)
+
+    def pop(self, at_hospital, count):
+        """Remove and return up to `count` of the most urgent residents of one heap."""
+        heap, found = self.heaps[at_hospital], []
+        while heap and len(found) < count:
+            death_day, rid, serial, r = heapq.heappop(heap)
+            if self.key_of.get(rid) == (death_day, at_hospital, serial):
+                found.append(r)
+        return found
+
+    def push(self, residents):
+        """Put popped residents back, unchanged."""
+        for r in residents:
+            death_day, ward, serial = self.key_of[r.id]
+            heapq.heappush(self.heaps[ward], (death_day, r.id, serial, r))
+
+
+# --- Population container ---
+class Population:
+    """
+    List-like container of residents with O(1) removal and membership tests.
+    A removed resident leaves a tombstone (None) in its slot, so the order of
+    the others never changes; tombstones are dropped by compact(), which the
+    simulation calls once a day when they outnumber the living.
+    The slot of a resident is found by id in an array over the recent ids
+    (births take consecutive ids); other ids, e.g. immigrants, are in a dict.
+    """
+
+    def __init__(self, residents=()):
+        self._slots = []
+        self._id_base = 0
+        self._slot_by_id = array("i")  # slot of resident id _id_base + k, -1 if none
+        self._slot_by_other_id = {}    # resident id -> slot, for ids outside that array
+        self._dead = 0
+        self._next_id = 0
+        self.index = PopulationIndex()
+        self.cells = None  # CellIndex once positions change (see track_cells)
+        self.network = None  # ContactNetwork for config.contact_model "network" (see track_network)
+        for r in residents:
+            self.append(r)
+
+    def _slot_of(self, rid):
+        k = rid - self._id_base
+        if 0 <= k < len(self._slot_by_id):
+            slot = self._slot_by_id[k]
+            return slot if slot >= 0 else None
+        return self._slot_by_other_id.get(rid)
+
+    def _set_slot(self, rid, slot):
+        table = self._slot_by_id
+        if not table and not self._slot_by_other_id:
+            self._id_base = rid
+        k = rid - self._id_base
+        if 0 <= k < len(table):
+            table[k] = slot
+        elif len(table) <= k <= 2 * len(table) + 64:
+            table.extend(array("i", [-1]) * (k - len(table)))
+            table.append(slot)
+        else:
+            self._slot_by_other_id[rid] = slot
+
+    def _index_slots(self):
+        """Rebuild the id -> slot tables, the array spanning at most ~4 ids per resident."""
+        ids = [r.id for r in self._slots]
+        oldest = self._next_id - 4 * len(ids) - 64
+        self._id_base = min((i for i in ids if oldest <= i < self._next_id), default=self._next_id)
+        self._slot_by_id = table = array("i", [-1]) * (self._next_id - self._id_base)
+        self._slot_by_other_id = other = {}
+        for slot, i in enumerate(ids):
+            k = i - self._id_base
+            if 0 <= k < len(table):
+                table[k] = slot
+            else:
+                other[i] = slot
+
+    def append(self, r):
+        if r.id is None or self._slot_of(r.id) is not None:
+            r.id = self._next_id
+        self._next_id = max(self._next_id, r.id + 1)
+        self._set_slot(r.id, len(self._slots))
+        self._slots.append(r)
+        self.index.add(r)
+        r._index = self.index
+        if self.cells is not None:
+            self.cells.add(r)
+
+    def extend(self, residents):
+        for r in residents:
+            self.append(r)
+
+    def spawn(self, count, age, rng):
+        """
+        Append `count` new residents; their attributes are drawn from `rng`,
+        keyed by the ids they receive.
+
+        Arguments: count, age, rng (rng.CounterRNG)
+        Returns: list of the new residents
+        """
+        ids = range(self._next_id, self._next_id + count)
+        draws = zip(*(rng.uniform(streams.SPAWN, 0, ids, slot).tolist() for slot in range(5)))
+        born = []
+        for i, u in zip(ids, draws):
+            r = Habitant(age, u)
+            r.id = i
+            self.append(r)
+            born.append(r)
+        return born
+
+    def remove(self, r):
+        if r not in self:
+            raise ValueError("resident not in population")
+        k = r.id - self._id_base
+        if 0 <= k < len(self._slot_by_id):
+            slot, self._slot_by_id[k] = self._slot_by_id[k], -1
+        else:
+            slot = self._slot_by_other_id.pop(r.id)
+        self._slots[slot] = None
+        self._dead += 1
+        self.index.discard(r)
+        r._index = None
+        if self.cells is not None:
+            self.cells.discard(r)
+
+    def track_cells(self, cell_size):
+        """Start keeping a CellIndex of the residents (kept from then on by append/remove)."""
+        if self.cells is None or self.cells.cell_size != cell_size:
+            self.cells = CellIndex(cell_size)
+            for r in self:
+                self.cells.add(r)
+        return self.cells
+
+    def track_network(self, config=DEFAULT_CONFIG):
+        """Start keeping a ContactNetwork (network.py) of the residents, updated by spread_infection."""
+        if self.network is None:
+            from network import ContactNetwork
+            self.network = ContactNetwork(config.workplace_size, config.community_degree)
+        return self.network
+
+    def track_deaths(self, ttl):
+        """Start (or restart, for another TTL table) keeping a DeathCalendar of the infected."""
+        if self.index.calendar is None or self.index.calendar.ttl != ttl:
+            self.index.calendar = DeathCalendar(ttl)
+            for r in self.select("state", INFECT):
+                self.index.schedule(r)
+        return self.index.calendar
+
+    def track_triage(self):
+        """Start keeping a TriageQueue of the infected residents (see update_doctor)."""
+        if self.index.triage is None:
+            self.index.triage = TriageQueue()
+            for r in self.select("state", INFECT):
+                self.index.triage.touch(r)
+        return self.index.triage
+
+    def compact(self, force: bool = False):
+        """Drop tombstones when they outnumber the living (or always if force)."""
+        if self._dead and (force or self._dead > len(self)):
+            self._slots = [r for r in self._slots if r is not None]
+            self._index_slots()
+            self._dead = 0
+
+    def index_of(self, r):
+        """Position key of a resident: increasing in population order."""
+        k = r.id - self._id_base
+        if 0 <= k < len(self._slot_by_id):
+            return self._slot_by_id[k]
+        return self._slot_by_other_id[r.id]
+
+    def count(self, field, *values):
+        """Number of residents whose `field` is one of `values` (O(1))."""
+        return self.index.count(field, *values)
+
+    def select(self, field, *values):
+        """Residents whose `field` is one of `values`, in population order."""
+        if all(self.index.listed(field, v) for v in values):
+            found = [r for v in values for r in self.index.group(field, v).values()]
+            found.sort(key=self.index_of)
+            return found
+        attr = INDEXED_FIELDS[field]
+        wanted = {self.index.code(field, v) for v in values}
+        return [r for r in self if getattr(r, attr) in wanted]
+
+    def __contains__(self, r):
+        rid = getattr(r, "id", None)
+        slot = None if rid is None else self._slot_of(rid)
+        return slot is not None and self._slots[slot] is r
+
+    def __iter__(self):
+        for r in self._slots:
+            if r is not None:
+                yield r
+
+    def __len__(self):
+        return len(self._slots) - self._dead
+
+    def __getitem__(self, key):
+        return list(self)[key]
+
+
+# --- Aging ---
+def grow_older(population):
+    """Age everyone by 1 day (or 1 unit)."""
+    for r in population:
+        r.age += 1
+
+
+# --- Movement ---
+def move_residents(population, rng, day, config=DEFAULT_CONFIG):
+    """
+    Move everybody with the config.movement model (see movement.py). New
+    positions are computed on arrays; only residents that changed cell are
+    re-bucketed in the population's CellIndex.
+
+    Argments: population (Population), rng (rng.CounterRNG), day, config
+    Returns: population, number of residents that changed cell
+    """
+    from movement import step_positions
+
+    residents = list(population)
+    n = len(residents)
+    ids = np.fromiter((r.id for r in residents), np.int64, n)
+    x = np.fromiter((r.x for r in residents), np.int64, n)
+    y = np.fromiter((r.y for r in residents), np.int64, n)
+    job = np.fromiter((r.job_code for r in residents), np.int64, n)
+    at_hospital = np.fromiter((r.at_hospital for r in residents), bool, n)
+    new_x, new_y = step_positions(ids, x, y, job, at_hospital, rng, day, config)
+
+    cells = population.track_cells(config.contact_radius)
+    moved = np.flatnonzero((new_x != x) | (new_y != y))
+    size = cells.cell_size
+    crossed = moved[((new_x[moved] // size) != (x[moved] // size)) | ((new_y[moved] // size) != (y[moved] // size))]
+    xs, ys = new_x.tolist(), new_y.tolist()
+    for i in moved.tolist():
+        residents[i].x, residents[i].y = xs[i], ys[i]
+    for i in crossed.tolist():
+        cells.move(residents[i])
+    return population, len(crossed)
 
 
 # --- Couple formation ---
-def form_couples(population, existing_couples):
+def form_couples(population, existing_couples, rng, day=0):
     """
-    Pair up residents who are >=18 and currently single.
-    Returns old valid couples + newly formed ones.
+    Pair up residents who are >=18 and currently single, in random order.
+    Returns old valid couples + newly formed ones (membership is O(1) on a Population).
 
-    Argments: population, existing_couples
+    Argments: population, existing_couples, rng (rng.CounterRNG), day
     Returns: valid_old + new_couples
     """
     eligible = [r for r in population if r.partner is None and r.age >= 18]
-    shuffle(eligible)
+    keys = rng.uniform(streams.COUPLES, day, [r.id for r in eligible]).tolist()
+    eligible = [r for _, r in sorted(zip(keys, eligible), key=lambda pair: pair[0])]
 
     new_couples = []
     i = 0
@@ -69,244 +601,376 @@ def form_couples(population, existing_couples):
 
 
 # --- Births ---
-def handle_births(population, satisfaction, day, couples, food, consumption):
+def handle_births(population, satisfaction, couples, food, consumption, events, rng, day,
+                  config=DEFAULT_CONFIG):
     """
     Decide births when satisfaction is decent. Probability depends on food balance.
-    Returns (population, births_log).
-
-    Argments: population, satisfaction, day, couples, food, consumption
-    Returns: population, births
-    """
-    births = []
-    if satisfaction > 30:
-        p_birth = 0.05 if food < consumption else 0.2
-        if len(population) > 1000:
-            p_birth /= 10
-
-        for p1, p2 in couples:
-            if random() < p_birth:
-                child = Habitant(age=0)
-                population.append(child)
-                births.append((day, child.persona, child.job))
+    A couple is keyed by its smaller id; children are born in that order and
+    recorded in `events` (source = that parent).
+
+    Argments: population, satisfaction, couples, food, consumption, events (EventLog),
+    rng (rng.CounterRNG), day, config
+    Returns: population, nb_births
+    """
+    births = 0
+    if satisfaction > config.birth_min_satisfaction:
+        p_birth = config.birth_prob_shortage if food < consumption else config.birth_prob
+        if len(population) > config.crowding_size:
+            p_birth /= config.crowding_divisor
+
+        firsts = [min(p1.id, p2.id) for p1, p2 in couples]
+        draws = rng.uniform(streams.BIRTHS, day, firsts).tolist()
+        parents = sorted(parent for parent, u in zip(firsts, draws) if u < p_birth)
+        children = population.spawn(len(parents), 0, rng)
+        for child, parent in zip(children, parents):
+            events.record(BIRTH, child, source=parent)
+        if config.contact_model == "network":
+            population.track_network(config).born([r.id for r in children], parents)
+        births = len(parents)
     return population, births
 
 
 # --- Unified deaths (natural + starvation) ---
-def check_deaths(population, day, deaths_today):
+def check_deaths(population, events, rng, day, config=DEFAULT_CONFIG):
     """
     Remove residents who die either from:
       - natural death (age-based probability)
       - starvation (too many hungry days + deficit)
-    Appends a record to deaths_today and unlinks partners.
+    Records each death in `events` and unlinks partners.
 
-    Argments: population, day, deaths_today
-    Returns: population, deaths_today
+    Argments: population (Population), events (EventLog), rng (rng.CounterRNG), day, config
+    Returns: population, nb_deaths
     """
-    for r in population[:]:
+    deaths = 0
+    residents = list(population)
+    draws = rng.uniform(streams.DEATHS, day, [r.id for r in residents]).tolist()
+    for r, u in zip(residents, draws):
         cause = None
 
         # Natural death (independent of starvation)
         if 10 <= r.age <= 100:
-            p = 0.0005 if r.age < 60 else (0.0005 + (r.age - 60) / 40 * 0.0095)
-            if random() < p:
-                cause = "natural"
+            p = config.natural_death_prob if r.age < config.old_age else \
+                (config.natural_death_prob + (r.age - config.old_age) / 40 * config.old_age_extra_prob)
+            if u < p:
+                cause = NATURAL
 
         # Starvation death
-        if r.days_hungry >= 7 and r.food_deficit > 10:
-            cause = "starvation"
-
-        if cause:
-            deaths_today.append(
-                (day, r.job, r.persona, getattr(r, "days_infected", 0),
-                 getattr(r, "at_hospital", False), getattr(r, "hospital_days", 0),
-                 cause)
-            )
+        if r.days_hungry >= config.starvation_days and r.food_deficit > config.starvation_deficit:
+            cause = STARVATION
+
+        if cause is not None:
+            events.record(DEATH, r, cause=cause)
+            deaths += 1
             if r.partner:
                 r.partner.partner = None
             population.remove(r)
 
-    return population, deaths_today
+    return population, deaths
 
 
 # --- Food production & consumption ---
-def update_food(population, food):
+def update_food(population, food, config=DEFAULT_CONFIG):
     """
-    Update food for population
+    Update food for population (from the live job/persona counters)
 
-    Arguments: population, food
+    Arguments: population (Population), food, config
     Returns: new_food_stock, total_consumption_for_the_day).
     """
-    production = sum(JOB_ACTION["farmer"] for r in population if r.job == "farmer")
+    production = config.job_action["farmer"] * population.count("job", FARMER)
     consumption = sum(
-        DAILY_NEED_BY_PERSONA_AND_JOB[r.persona] +
-        (JOB_ACTION[r.job] if r.job in ["worker", "jobless"] else 0)
-        for r in population
-    )
+        config.daily_need_by_persona_and_job[PERSONAS[persona]] * nb
+        for persona, nb in population.index.counts("persona").items()
+    ) + sum(config.job_action[JOBS[job]] * population.count("job", job) for job in [WORKER, JOBLESS])
     food += production
     return food, consumption
 
 
 # --- Food distribution (priority-based) ---
-def distribute_food(population, food):
+def distribute_food(population, food, config=DEFAULT_CONFIG):
     """
-    Distribute food by priority groups.
+    Distribute food by priority tiers (food.py): every resident is served at
+    most once, with the config.food_policy rationing.
 
-    Argments: population, food
+    Argments: population (Population), food, config
     Returns: food, underfed
     """
-    for r in population:
-        r.daily_need = DAILY_NEED_BY_PERSONA_AND_JOB[r.persona] + \
-                       (JOB_ACTION[r.job] if r.job in ["worker", "jobless"] else 0)
+    from food import TIER, allocate
 
-    priority_groups = [
-        [r for r in population if r.persona == "rich"],
-        [r for r in population if r.job in ["doctor", "farmer", "worker"]],
-        [r for r in population if r.job == "jobless"],
-        [r for r in population if r.persona == "poor"]
-    ]
+    residents = list(population)
+    n = len(residents)
+    persona = np.fromiter((r.persona_code for r in residents), np.int64, n)
+    job = np.fromiter((r.job_code for r in residents), np.int64, n)
+    need = np.array(daily_need_table(config), dtype=np.int64)[persona, job]
+    tier = TIER[persona, job]
+    given, food = allocate(need, tier, food, config.food_policy, config.food_quotas)
 
     underfed = 0
-    for group in priority_groups:
-        for r in group:
-            if food >= r.daily_need:
-                food -= r.daily_need
-                r.days_hungry = 0
-                r.food_deficit = 0
-            else:
-                deficit = r.daily_need - food
-                food = 0
-                r.food_deficit += deficit
-                r.days_hungry += 1
-                underfed += 1
+    for i in np.flatnonzero(tier >= 0).tolist():
+        r = residents[i]
+        if given[i] >= need[i]:
+            r.days_hungry = 0
+            r.food_deficit = 0
+        else:
+            r.food_deficit += int(need[i] - given[i])
+            r.days_hungry += 1
+            underfed += 1
     return food, underfed
 
 
 # --- Social status changes ---
-def update_status_changes(population, satisfaction, satisfaction_prev):
+def update_status_changes(population, satisfaction, satisfaction_prev, events, rng, day):
     """
-    Random transitions between jobs/personas based on satisfaction trends.
+    Random transitions between jobs/personas based on satisfaction trends,
+    recorded in `events` as JOB_CHANGE / PERSONA_CHANGE (old -> new code).
+    Each resident has one draw per possible transition (slots 0-6).
 
-    Argments: population, satisfaction, satisfaction_prev
-    Returns: population, changes
+    Argments: population, satisfaction, satisfaction_prev, events (EventLog),
+    rng (rng.CounterRNG), day
+    Returns: population, nb_changes
 
     """
-    changes = []
-    for r in population:
-        if r.job == "worker" and random() < 0.01:
-            r.job = "jobless"
-            changes.append(f"Worker -> Jobless : Persona: {r.persona}")
-
-        if r.job == "jobless" and r.age >= 15 and random() < 0.05:
-            new_job = choices(["doctor", "farmer", "worker"], weights=[1, 30, 69])[0]
-            r.job = new_job
-            changes.append(f"Jobless -> {new_job} : Persona: {r.persona}")
-
-        if r.job == "none" and r.age >= 15:
-            r.job = choices(["farmer", "doctor", "worker", "jobless"], weights=[17, 5, 45, 8])[0]
-            changes.append(f"None -> {r.job} : Persona: {r.persona}")
-
-        if r.persona == "poor" and random() < 0.05:
-            r.persona = "normal"
-            changes.append(f"Poor -> Normal : Job: {r.job}")
-
-        if r.persona == "rich":
-            p = (100 - satisfaction) / 100 * 0.1 + (0.05 if satisfaction < satisfaction_prev else 0)
-            if random() < p:
-                r.persona = "normal"
-                changes.append(f"Rich -> Normal : Job: {r.job}")
-
-        if r.persona == "normal":
-            p = satisfaction / 100 * 0.05 + (0.05 if satisfaction > satisfaction_prev else 0)
-            if random() < p:
-                r.persona = "rich"
-                changes.append(f"Normal -> Rich : Job: {r.job}")
-
-    return population, changes
+    record = events.record
+    before = len(events)
+    p_ruin = (100 - satisfaction) / 100 * 0.1 + (0.05 if satisfaction < satisfaction_prev else 0)
+    p_enrich = satisfaction / 100 * 0.05 + (0.05 if satisfaction > satisfaction_prev else 0)
+    residents = list(population)
+    ids = [r.id for r in residents]
+    draws = zip(*(rng.uniform(streams.STATUS, day, ids, slot).tolist() for slot in range(7)))
+    for r, (u_quit, u_hire, u_hired_job, u_first_job, u_poor, u_ruin, u_enrich) in zip(residents, draws):
+        if r.job_code == WORKER and u_quit < 0.01:
+            r.job_code = JOBLESS
+            record(JOB_CHANGE, r, WORKER, JOBLESS)
+
+        if r.job_code == JOBLESS and r.age >= 15 and u_hire < 0.05:
+            r.job_code = pick(u_hired_job, HIRE_DRAW)
+            record(JOB_CHANGE, r, JOBLESS, r.job_code)
+
+        if r.job_code == NONE and r.age >= 15:
+            r.job_code = pick(u_first_job, JOB_DRAW)
+            record(JOB_CHANGE, r, NONE, r.job_code)
+
+        if r.persona_code == POOR and u_poor < 0.05:
+            r.persona_code = NORMAL
+            record(PERSONA_CHANGE, r, POOR, NORMAL)
+
+        if r.persona_code == RICH and u_ruin < p_ruin:
+            r.persona_code = NORMAL
+            record(PERSONA_CHANGE, r, RICH, NORMAL)
+
+        if r.persona_code == NORMAL and u_enrich < p_enrich:
+            r.persona_code = RICH
+            record(PERSONA_CHANGE, r, NORMAL, RICH)
+
+    return population, len(events) - before
+
+
+# --- Local virus transmission ---
+def spread_infection(population, rng, day, contacts=None, config=DEFAULT_CONFIG, events=None):
+    """
+    Each infected resident may pass the virus to healthy residents closer than
+    config.contact_radius (45px) with probability config.transmission_prob.
+    Each (healthy, infected) pair has its own draw, so every contact engine gives
+    the same infections; the infector is the first successful one in population order.
+
+    With config.contact_model == "network", the pairs are the network links
+    of the infected instead (see network.py and _spread_on_network).
+
+    Arguments: population (Population), rng (rng.CounterRNG), day,
+    contacts (engine from contacts.py, grid by default; not used when the
+    population tracks its cells, i.e. when residents move), config,
+    events (optional EventLog, one TRANSMISSION per new case with its infector as source;
+    its transmission tree, if any, also gets the distance)
+    Returns: population, transmissions
+    """
+    if config.contact_model == "network":
+        return _spread_on_network(population, rng, day, config, events)
+    if config.contact_model != "distance":
+        raise ValueError(f"Unknown contact model: {config.contact_model!r} (expected 'distance' or 'network')")
+    if population.cells is not None:
+        cells, radius = population.cells, config.contact_radius
+
+        def near_targets(a):
+            return [r for r in cells.near(a.x, a.y, radius) if r.state_code == HEALTHY]
+    else:
+        contacts = contacts or make_contacts(config.contacts, config.contact_radius)
+        targets = population.select("state", HEALTHY)
+        contacts.build(targets)
+
+        def near_targets(a):
+            return [targets[j] for j in contacts.query(a.x, a.y)]
+
+    chosen = {}  # target id -> (target, infector)
+    for a in population.select("state", INFECT):
+        near = near_targets(a)
+        if not near:
+            continue
+        draws = rng.uniform(streams.TRANSMISSION, day, [r.id for r in near], other=a.id)
+        for r, u in zip(near, draws.tolist()):
+            if r.id not in chosen and u < config.transmission_prob:
+                chosen[r.id] = (r, a)
+
+    to_infect = sorted(chosen.values(), key=lambda pair: population.index_of(pair[0]))
+    return population, _infect(to_infect, day, events)
+
+
+def _spread_on_network(population, rng, day, config, events):
+    """spread_infection over the population's ContactNetwork (synced first with today's population)."""
+    network = population.track_network(config)
+    residents = list(population)
+    n = len(residents)
+    ids = np.fromiter((r.id for r in residents), np.int64, n)
+    row = dict(zip(ids.tolist(), range(n)))
+    partner = np.fromiter((row[r.partner.id] if r.partner is not None else -1 for r in residents), np.int64, n)
+    job = np.fromiter((r.job_code for r in residents), np.int64, n)
+    state = np.fromiter((r.state_code for r in residents), np.int64, n)
+    nodes = network.sync(day, rng, ids, partner, job)
+
+    infectees, infectors = network.transmit(rng, day, nodes[state == INFECT], nodes[state == HEALTHY],
+                                            config.transmission_prob)
+    pairs = sorted((row[b], row[a]) for b, a in zip(infectees.tolist(), infectors.tolist()))  # population order
+    to_infect = [(residents[b], residents[a]) for b, a in pairs]
+    return population, _infect(to_infect, day, events)
+
+
+def _infect(to_infect, day, events):
+    """Infect the (target, infector) pairs, in order; returns how many."""
+    for r, source in to_infect:
+        r.state_code = INFECT
+        r.days_infected = 1
+        if events is not None:
+            events.record(TRANSMISSION, r, source=source.id)
+    if events is not None and events.tree is not None and to_infect:
+        events.tree.record(day, [a.id for _, a in to_infect], [r.id for r, _ in to_infect],
+                           [math.hypot(r.x - a.x, r.y - a.y) for r, a in to_infect])
+    return len(to_infect)
 
 
 # --- Disease update (death by infection threshold) ---
-def update_disease(population, day, deaths_today):
+def update_disease(population, events, config=DEFAULT_CONFIG):
     """
     Infected residents progress one day; if they exceed their TTL, they die.
+    Ticking the disease clock advances every days_infected / hospital_days at
+    once, and only the deaths the DeathCalendar has due today are looked at.
 
-    Argments: population, day, deaths_today 
-    Returns: population, []
+    Argments: population (Population), events (EventLog), config
+    Returns: population, nb_deaths
     """
-    for r in population[:]:
-        if r.state == "infect":
-            r.days_infected += 1
-            if r.at_hospital:
-                r.hospital_days += 1
-            if r.days_infected > HEALTH_TTL_BY_PERSONA[r.persona]:
-                deaths_today.append(
-                    (day, r.job, r.persona, r.days_infected, r.at_hospital, r.hospital_days, "infection")
-                )
-                if r.partner:
-                    r.partner.partner = None
-                population.remove(r)
-    return population, []
+    ttl = ttl_table(config)
+    calendar = population.track_deaths(ttl)
+    population.index.clock += 1
+    due = {r.id: r for r in calendar.pop(population.index.clock)
+           if r in population and r.state_code == INFECT and r.days_infected > ttl[r.persona_code]}
+    dying = sorted(due.values(), key=population.index_of)
+    for r in dying:
+        events.record(DEATH, r, cause=INFECTION)
+        if r.partner:
+            r.partner.partner = None
+        population.remove(r)
+    return population, len(dying)
 
 
 # --- Doctors visits & cures ---
-def update_doctor(population, day, visits_today):
+def update_doctor(population, day, events, rng, config=DEFAULT_CONFIG):
     """
     Doctors attend a number of visits per day; some infected are cured.
+    With config.triage == "urgency", patients are taken from the population's
+    TriageQueue, fewest days to death first, instead of in population order.
+    With config.hospital_beds, nobody is admitted while every bed is taken.
 
-    Argments: population, day, visits_today
-    Returns: population, visits_today, nb_doctors
+    Argments: population (Population), day, events (EventLog), rng (rng.CounterRNG), config
+    Returns: population, nb_visits, nb_doctors
     """
-    nb_doctors = sum(1 for r in population if r.job == "doctor")
-    visits_today = []
+    nb_doctors = population.count("job", DOCTOR)
+    visits = 0
 
-    if nb_doctors > 0 and day > 2:
-        capacity = nb_doctors * JOB_ACTION["doctor"]
+    if nb_doctors > 0 and day > config.doctor_start_day:
+        capacity = nb_doctors * config.job_action["doctor"]
+        queue = None
+        if config.triage == "urgency":
+            queue = population.track_triage()
+            queue.refresh(population, day, ttl_table(config))
 
         # Treat already hospitalized first
-        for r in [x for x in population if x.state == "infect" and x.at_hospital]:
-            if capacity <= 0:
-                break
-            success = max(0, 0.80 - (r.days_infected - 1) * 0.10)
-            if random() < success:
-                r.state = "healthy"
+        if queue is not None:
+            treated = queue.pop(True, capacity)
+        else:
+            treated = [x for x in population.select("at_hospital", True) if x.state_code == INFECT][:capacity]
+        draws = rng.uniform(streams.DOCTOR, day, [r.id for r in treated], 0).tolist()
+        for r, u in zip(treated, draws):
+            success = max(0, config.cure_base - (r.days_infected - 1) * config.cure_decay)
+            if u < success:
+                r.state_code = HEALTHY
                 r.days_infected = 0
                 r.at_hospital = False
                 r.hospital_days = 0
             capacity -= 1
-
-        # Then send new infected to hospital
-        if capacity > 0:
-            for r in [x for x in population if x.state == "infect" and not x.at_hospital]:
-                prob_to_visit = min(1, 0.30 + (r.days_infected - 1) * 0.10)
-                if random() < prob_to_visit:
-                    r.at_hospital = True
-                    r.hospital_days = 1
-                    visits_today.append((r.job, r.persona, r.days_infected))
-                    capacity -= 1
-                if capacity <= 0:
+        if queue is not None:
+            queue.push([r for r in treated if r.at_hospital])
+
+        # Then send new infected to hospital, while doctors and beds are available
+        admissions = capacity
+        if config.hospital_beds:
+            admissions = min(capacity, config.hospital_beds - population.count("at_hospital", True))
+        if admissions > 0 and queue is None:
+            waiting = [x for x in population.select("state", INFECT) if not x.at_hospital]
+            visits = _admit(waiting, admissions, day, events, rng, config)
+        elif admissions > 0:
+            # most urgent first, popped by batches (one draw call each); the others go back at the end
+            popped = []
+            while visits < admissions:
+                batch = queue.pop(False, 64)
+                if not batch:
                     break
-
-    return population, visits_today, nb_doctors
+                popped += batch
+                visits += _admit(batch, admissions - visits, day, events, rng, config)
+            queue.push([r for r in popped if not r.at_hospital])
+
+    return population, visits, nb_doctors
+
+
+def _admit(waiting, admissions, day, events, rng, config):
+    """Send infected residents to hospital in order until `admissions` are made; returns the visits."""
+    visits = 0
+    draws = rng.uniform(streams.DOCTOR, day, [r.id for r in waiting], 1).tolist()
+    for r, u in zip(waiting, draws):
+        prob_to_visit = min(1, config.visit_base + (r.days_infected - 1) * config.visit_growth)
+        if u < prob_to_visit:
+            r.at_hospital = True
+            r.hospital_days = 1
+            events.record(VISIT, r)
+            visits += 1
+            if visits >= admissions:
+                break
+    return visits
 
 
 # --- Satisfaction scoring ---
-def calculate_satisfaction(satisfaction, consumption, food, deaths_today,
-                           nb_hospitalized, nb_doctors, population, underfed_count):
+def calculate_satisfaction(satisfaction, consumption, food, nb_deaths,
+                           nb_hospitalized, nb_doctors, population, underfed_count,
+                           config=DEFAULT_CONFIG):
     """
     Aggregate score influenced by food balance, mortality, hospital load, hunger.
     
-    Argments: satisfaction, consumption, food, deaths_today,
-    nb_hospitalized, nb_doctors, population, underfed_count
+    Argments: satisfaction, consumption, food, nb_deaths,
+    nb_hospitalized, nb_doctors, population, underfed_count, config
 
     Returns: new satisfaction in [0, 100]
 
     """
+    return satisfaction_score(satisfaction, consumption, food, nb_deaths, nb_hospitalized, nb_doctors,
+                              len(population), underfed_count, config)
+
+
+def satisfaction_score(satisfaction, consumption, food, nb_deaths, nb_hospitalized, nb_doctors, size,
+                       underfed_count, config=DEFAULT_CONFIG):
+    """calculate_satisfaction from the population size alone (compartments.py has no residents)."""
     deficit = max(0, consumption - food)
     deficit_ratio = deficit / consumption if consumption > 0 else 0
     surplus = max(0, food - consumption)
     surplus_ratio = surplus / consumption if consumption > 0 else 0
 
-    mortality_ratio = len(deaths_today) / len(population) if population else 0
-    capacity_doctors = nb_doctors * JOB_ACTION["doctor"]
+    mortality_ratio = nb_deaths / size if size else 0
+    capacity_doctors = nb_doctors * config.job_action["doctor"]
     hospital_ratio = nb_hospitalized / capacity_doctors if capacity_doctors > 0 else 0
 
     food_impact = (5 + 2 * surplus_ratio) if deficit_ratio == 0 else -5 * deficit_ratio * (1.2 if deficit_ratio > 0.3 else 1)
@@ -322,61 +986,79 @@ def calculate_satisfaction(satisfaction, consumption, food, deaths_today,
 
 
 # --- One-day simulation ---
-def simulate_day(population, food, satisfaction, day, satisfaction_prev, couples):
+def simulate_day(population, food, satisfaction, day, satisfaction_prev, couples, contacts=None,
+                 config=DEFAULT_CONFIG, events=None, rng=None, profiler=None, before_day=None):
     """
     Runs one full day of the simulation
     
-    Argments: population, food, satisfaction, day, satisfaction_prev, couples
-
-    Returns: population, food, satisfaction, deaths_today, visits_today, 
+    Argments: population, food, satisfaction, day, satisfaction_prev, couples,
+    contacts (optional contact engine, see contacts.py), config (config.SimulationConfig),
+    events (events.EventLog kept across days; a throwaway one if None),
+    rng (rng.CounterRNG of the run; if None, one seeded from the `random` module),
+    profiler (optional profiling.PhaseProfiler timing every phase),
+    before_day (optional callable run before the first phase, inside the day's event
+    window; regions.py applies the infections from across the borders there)
+
+    Returns: population (as a Population), food, satisfaction, deaths_today, visits_today,
     status_changes, births, couples
+    (the four event groups are record arrays of the day's rows, see events.COLUMNS)
     """
-    deaths_today = []
-    visits_today = []
-    status_changes = []
-    births = []
+    if events is None:
+        events = EventLog()
+    events.begin_day(day)
+    if rng is None:
+        rng = CounterRNG(getrandbits(64))
+    run = call
+    if profiler is not None:
+        profiler.begin_day(day)
+        run = profiler.run
 
-    # Age everyone by 1 day (or 1 unit)
-    for r in population:
-        r.age += 1
+    if not isinstance(population, Population):
+        population = Population(population)
+    population.compact()
 
-    couples = form_couples(population, couples)
-    population, deaths_today = check_deaths(population, day, deaths_today)
+    if before_day is not None:
+        run("before_day", len(population), before_day)
 
-    food, consumption = update_food(population, food)
-    population, births = handle_births(population, satisfaction, day, couples, food, consumption)
+    run("grow_older", len(population), grow_older, population)
 
-    population, status_changes = update_status_changes(population, satisfaction, satisfaction_prev)
+    couples = run("form_couples", len(population), form_couples, population, couples, rng, day)
+    population, nb_deaths = run("check_deaths", len(population), check_deaths, population, events, rng, day,
+                                config)
 
-    food, underfed = distribute_food(population, food)
+    food, consumption = run("update_food", len(population), update_food, population, food, config)
+    population, _ = run("handle_births", len(couples), handle_births, population, satisfaction, couples,
+                        food, consumption, events, rng, day, config)
 
-    # Local virus transmission based on distance
-    transmissions = 0
-    to_infect = []
-    for a in population:
-        if a.state == "infect":
-            for b in population:
-                if b.state == "healthy" and b not in to_infect:
-                    dist = sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
-                    if dist < 45 and random() < 0.45:
-                        to_infect.append(b)
-                        transmissions += 1
-    for r in to_infect:
-        r.state = "infect"
-        r.days_infected = 1
-    print(f"Day {day} : {transmissions} transmissions")
+    population, _ = run("update_status_changes", len(population), update_status_changes, population,
+                        satisfaction, satisfaction_prev, events, rng, day)
 
-    population, deaths_disease = update_disease(population, day, deaths_today)
-    deaths_today.extend(deaths_disease)
+    food, underfed = run("distribute_food", len(population), distribute_food, population, food, config)
 
-    population, visits_today, nb_doctors = update_doctor(population, day, visits_today)
-    nb_hospitalized = sum(1 for r in population if r.at_hospital)
-
-    satisfaction = calculate_satisfaction(
-        satisfaction, consumption, food, deaths_today,
-        nb_hospitalized, nb_doctors, population, underfed
-    )
+    if config.movement != "none":
+        run("move_residents", len(population), move_residents, population, rng, day, config)
 
+    # Local virus transmission based on distance
+    population, _ = run("spread_infection", population.count("state", INFECT), spread_infection,
+                        population, rng, day, contacts, config, events)
+
+    population, deaths_disease = run("update_disease", population.count("state", INFECT), update_disease,
+                                     population, events, config)
+    nb_deaths += deaths_disease
+
+    population, _, nb_doctors = run("update_doctor", population.count("state", INFECT), update_doctor,
+                                    population, day, events, rng, config)
+    nb_hospitalized = population.count("at_hospital", True)
+
+    satisfaction = run("calculate_satisfaction", 1, calculate_satisfaction,
+                       satisfaction, consumption, food, nb_deaths,
+                       nb_hospitalized, nb_doctors, population, underfed, config)
+
+    deaths_today, visits_today = events.today(DEATH), events.today(VISIT)
+    status_changes, births = events.today(JOB_CHANGE, PERSONA_CHANGE), events.today(BIRTH)
+    events.end_day()
+    if profiler is not None:
+        profiler.end_day(len(population))
     return population, food, satisfaction, deaths_today, visits_today, status_changes, births, couples
 
 
@@ -385,15 +1067,15 @@ def simulate_day(population, food, satisfaction, day, satisfaction_prev, couples
 
 
 if __name__ == "__main__":
-    from random import seed
-    seed(42)  # makes the run deterministic for testing
+    rng = CounterRNG(42)  # makes the run deterministic for testing
 
     # Initial population
-    population = [Habitant(age=25) for _ in range(50)]
+    population = Population()
+    population.spawn(50, 25, rng)
     food = 500
     satisfaction = 70
     day = 1
-    couples = form_couples(population, [])
+    couples = form_couples(population, [], rng)
 
     print("=== TEST SIMULATION (running model.py directly) ===")
     print(f"Initial population: {len(population)} | Food: {food} | Satisfaction: {satisfaction}")
@@ -401,7 +1083,7 @@ if __name__ == "__main__":
     # Simulate 5 days
     for _ in range(5):
         population, food, satisfaction, deaths, visits, status_changes, births, couples = simulate_day(
-            population, food, satisfaction, day, satisfaction, couples
+            population, food, satisfaction, day, satisfaction, couples, rng=rng
         )
         print(f"Day {day}: 👥 {len(population)} | 🍖 {food:.0f} | 😊 {satisfaction:.1f} | ⚰️ {len(deaths)} deaths | 👶 {len(births)} births")
         day += 1
@@ -0,0 +1,163 @@
+"""
+Live mode: the simulation runs in a worker process and publishes one compact
+snapshot per day (x, y, colour code, radius) into a shared-memory ring buffer;
+the Pygame loop renders the newest snapshot at its own frame rate.
+"""
+import time
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from renderer import color_code, radius_of
+
+HEADER = 4  # per slot: seq, day, population, infected
+
+
+# --- Shared-memory ring buffer ---
+class SnapshotRing:
+    """
+    `slots` snapshots of up to `capacity` residents each, in one SharedMemory block.
+    The writer fills slot seq % slots, then publishes seq as the latest one; a
+    reader copies the latest slot and checks its seq did not change meanwhile.
+    """
+
+    def __init__(self, capacity: int = 100_000, slots: int = 4, name=None):
+        self.capacity, self.slots = capacity, slots
+        slot_bytes = HEADER * 8 + capacity * (2 + 2 + 1 + 1)
+        size = 8 + slots * slot_bytes
+        self.shm = SharedMemory(name=name, create=name is None, size=size)
+        self.owner = name is None
+        buf = self.shm.buf
+        self.latest = np.ndarray((1,), np.int64, buf, 0)
+        if self.owner:
+            self.latest[0] = -1
+        self.views = []
+        for i in range(slots):
+            base = 8 + i * slot_bytes
+            header = np.ndarray((HEADER,), np.int64, buf, base)
+            base += HEADER * 8
+            xs = np.ndarray((capacity,), np.int16, buf, base)
+            ys = np.ndarray((capacity,), np.int16, buf, base + 2 * capacity)
+            codes = np.ndarray((capacity,), np.uint8, buf, base + 4 * capacity)
+            radii = np.ndarray((capacity,), np.uint8, buf, base + 5 * capacity)
+            self.views.append((header, xs, ys, codes, radii))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, seq, day, xs, ys, codes, radii, population, infected):
+        """Publish one snapshot (truncated to capacity; the header keeps the true counts)."""
+        header, vx, vy, vc, vr = self.views[seq % self.slots]
+        n = min(len(xs), self.capacity)
+        header[0] = -1  # slot being written
+        vx[:n], vy[:n], vc[:n], vr[:n] = xs[:n], ys[:n], codes[:n], radii[:n]
+        header[1:] = day, population, infected
+        header[0] = seq
+        self.latest[0] = seq
+        return n
+
+    def read_latest(self):
+        """
+        Copy the newest complete snapshot.
+
+        Returns: None, or (seq, day, population, infected, xs, ys, codes, radii)
+        """
+        while True:
+            seq = int(self.latest[0])
+            if seq < 0:
+                return None
+            header, vx, vy, vc, vr = self.views[seq % self.slots]
+            if header[0] != seq:
+                continue  # overwritten between the two reads, try the new latest
+            day, population, infected = (int(v) for v in header[1:])
+            n = min(population, self.capacity)
+            snapshot = (vx[:n].copy(), vy[:n].copy(), vc[:n].copy(), vr[:n].copy())
+            if header[0] == seq:
+                return (seq, day, population, infected, *snapshot)
+
+    def close(self):
+        self.latest = self.views = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def encode(population):
+    """Compact arrays (x, y, colour code, radius) of a population."""
+    residents = list(population)
+    return (np.fromiter((r.x for r in residents), np.int16, len(residents)),
+            np.fromiter((r.y for r in residents), np.int16, len(residents)),
+            np.fromiter((color_code(r) for r in residents), np.uint8, len(residents)),
+            np.fromiter((radius_of(r.age) for r in residents), np.uint8, len(residents)))
+
+
+# --- Worker process ---
+def run_worker(ring_name, capacity, slots, control, config, seed, days):
+    """
+    Simulation loop of the worker process.
+    control: shared array [stop, paused, steps_requested, days_per_second (0 = max speed)]
+    """
+    from simulation import Simulation
+
+    ring = SnapshotRing(capacity, slots, name=ring_name)
+    sim = Simulation(config, seed=seed)
+    seq = 0
+    ring.write(seq, 0, *encode(sim.population), len(sim.population),
+               sim.population.count("state", "infect"))
+    while not control[0] and (days is None or sim.day <= days):
+        if control[1]:
+            with control.get_lock():
+                step = control[2] > 0
+                if step:
+                    control[2] -= 1
+            if not step:
+                time.sleep(0.01)
+                continue
+        start = time.perf_counter()
+        stats = sim.step()
+        seq += 1
+        ring.write(seq, sim.day - 1, *encode(sim.population), stats["population"], stats["infected"])
+        if control[3] > 0 and not control[1]:
+            time.sleep(max(0.0, 1 / control[3] - (time.perf_counter() - start)))
+    ring.close()
+
+
+class LiveSimulation:
+    """
+    Starts the worker process and exposes the controls to the UI thread.
+    """
+
+    def __init__(self, config=None, seed=None, days=None, capacity=100_000, slots=4, days_per_second=4):
+        ctx = get_context("spawn")
+        self.ring = SnapshotRing(capacity, slots)
+        self.control = ctx.Array("d", [0, 0, 0, days_per_second])
+        self.speed = days_per_second
+        self.process = ctx.Process(
+            target=run_worker, daemon=True,
+            args=(self.ring.name, capacity, slots, self.control, config, seed, days))
+        self.process.start()
+
+    @property
+    def paused(self):
+        return bool(self.control[1])
+
+    def toggle_pause(self):
+        self.control[1] = 0 if self.control[1] else 1
+
+    def step(self, days=1):
+        """Run `days` more days while paused."""
+        with self.control.get_lock():
+            self.control[2] += days
+
+    def toggle_max_speed(self):
+        self.control[3] = 0 if self.control[3] else self.speed
+
+    def latest(self):
+        return self.ring.read_latest()
+
+    def stop(self):
+        self.control[0] = 1
+        self.process.join(timeout=5)
+        self.ring.close()
@@ -0,0 +1,77 @@
+"""
+Daily movement of the residents, computed on whole position arrays and shared
+by both backends (habitant.move_residents, population_arrays.move_residents).
+
+Models (config.movement):
+- "none": nobody moves (the original model, and the default)
+- "random_walk": every resident steps up to config.movement_step px in x and y
+- "commute": on workdays (day % 7 < 5) employed residents are at a spot of their
+  job's area (config.workplaces), the rest of the time at home (spawn position)
+- "hospital": hospitalized residents walk toward config.hospital_xy at
+  config.movement_speed px per day, the others random-walk
+
+Positions stay integers inside the WIDTH x HEIGHT map, and every draw is keyed
+by (day, resident id), so both backends move everybody the same way.
+"""
+import numpy as np
+
+import rng as streams
+from habitant import JOBS, NONE, JOBLESS
+
+WIDTH, HEIGHT = 1720, 860
+MODELS = ("none", "random_walk", "commute", "hospital")
+
+
+def _clamp(x, y):
+    return np.clip(x, 0, WIDTH - 1).astype(np.int64), np.clip(y, 0, HEIGHT - 1).astype(np.int64)
+
+
+def random_walk(ids, x, y, rng, day, config):
+    step = config.movement_step
+    dx = np.floor((2 * rng.uniform(streams.MOVEMENT, day, ids, 0) - 1) * step + 0.5)
+    dy = np.floor((2 * rng.uniform(streams.MOVEMENT, day, ids, 1) - 1) * step + 0.5)
+    return _clamp(x + dx, y + dy)
+
+
+def commute(ids, x, y, job, rng, day, config):
+    home_x = np.floor(rng.uniform(streams.SPAWN, 0, ids, 3) * WIDTH)
+    home_y = np.floor(rng.uniform(streams.SPAWN, 0, ids, 4) * HEIGHT)
+    if day % 7 >= 5:
+        return _clamp(home_x, home_y)
+    anchors = np.array([config.workplaces.get(name, [np.nan, np.nan]) for name in JOBS], dtype=float)
+    spread = config.workplace_spread
+    # same spot every workday: the draws are keyed by id only (day 0)
+    work_x = anchors[job, 0] + np.floor((2 * rng.uniform(streams.MOVEMENT, 0, ids, 2) - 1) * spread)
+    work_y = anchors[job, 1] + np.floor((2 * rng.uniform(streams.MOVEMENT, 0, ids, 3) - 1) * spread)
+    at_work = (job != NONE) & (job != JOBLESS) & ~np.isnan(work_x)
+    return _clamp(np.where(at_work, work_x, home_x), np.where(at_work, work_y, home_y))
+
+
+def toward_hospital(ids, x, y, at_hospital, rng, day, config):
+    new_x, new_y = random_walk(ids, x, y, rng, day, config)
+    hx, hy = config.hospital_xy
+    dx, dy = hx - x, hy - y
+    dist = np.hypot(dx, dy)
+    scale = np.minimum(1.0, config.movement_speed / np.maximum(dist, 1e-9))
+    walk_x, walk_y = _clamp(x + np.floor(dx * scale + 0.5), y + np.floor(dy * scale + 0.5))
+    return np.where(at_hospital, walk_x, new_x), np.where(at_hospital, walk_y, new_y)
+
+
+def step_positions(ids, x, y, job, at_hospital, rng, day, config):
+    """
+    New positions of the residents for `day`.
+
+    Arguments: ids, x, y, job, at_hospital (arrays, one row per resident),
+    rng (rng.CounterRNG), day, config (config.movement names the model)
+    Returns: new x, new y (int64 arrays)
+    """
+    x, y = np.asarray(x, dtype=np.int64), np.asarray(y, dtype=np.int64)
+    if config.movement == "none" or len(x) == 0:
+        return x, y
+    if config.movement == "random_walk":
+        return random_walk(ids, x, y, rng, day, config)
+    if config.movement == "commute":
+        return commute(ids, x, y, np.asarray(job, dtype=np.int64), rng, day, config)
+    if config.movement == "hospital":
+        return toward_hospital(ids, x, y, np.asarray(at_hospital, dtype=bool), rng, day, config)
+    raise ValueError(f"Unknown movement model: {config.movement!r} (expected one of {MODELS})")
@@ -0,0 +1,328 @@
+"""
+Contact network: the alternative to distance-based contacts selected by
+config.contact_model = "network". Residents only meet
+- their household: partner, children (from handle_births) and siblings
+- their workplace: doctors, farmers and workers are split into workplaces of
+  config.workplace_size residents on average, one clique per workplace
+- config.community_degree random community links made by each resident
+
+The adjacency is kept in CSR form over dense node indices, one per resident
+id (indptr / indices / kinds arrays). Births, deaths, new couples and job changes only append edges
+to a pending buffer or flip a per-node flag: edges of the dead, and workplace
+edges whose ends no longer share a workplace, are skipped when read and
+dropped when the pending edges are merged into the CSR arrays (compact()).
+Transmission reads the edges of the infected only: O(infected x degree).
+
+    python network.py --size 20000 --days 100
+"""
+import argparse
+
+import numpy as np
+
+import rng as streams
+from habitant import JOBS, INFECT, DOCTOR, FARMER, WORKER
+
+HOUSEHOLD, WORK, COMMUNITY = range(3)  # edge kinds
+KINDS = ("household", "work", "community")
+WORKPLACE_JOBS = (DOCTOR, FARMER, WORKER)
+STATE = ("ids", "indptr", "indices", "kinds", "alive", "job", "partner", "home", "workplace")  # saved by checkpoint.py
+
+
+def _ranges(starts, counts):
+    """Concatenated np.arange(start, start + count) for each pair, in one pass."""
+    total = int(counts.sum())
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return shift + np.arange(total)
+
+
+def _first(key):
+    """Order of `key` (stable sort) and, in that order, a mask of the first row of each distinct value."""
+    order = np.argsort(key, kind="stable")
+    ordered = key[order]
+    return order, np.concatenate([np.ones(min(1, len(key)), dtype=bool), ordered[1:] != ordered[:-1]])
+
+
+class ContactNetwork:
+    """
+    Household / workplace / community network of one population, kept up to
+    date by sync() once a day (plus born() for the parents of newborns).
+    Each resident id seen gets a dense node index (ids can be sparse, e.g.
+    k * regions.ID_STRIDE in region k); nodes are never reused, a dead one
+    just stays empty. Edges and per-node arrays are indexed by node.
+
+    Arguments: workplace_size, community_degree
+    """
+
+    def __init__(self, workplace_size: int = 10, community_degree: int = 2):
+        if workplace_size < 1:
+            raise ValueError("workplace_size must be at least 1")
+        self.workplace_size = workplace_size
+        self.community_degree = community_degree
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.kinds = np.zeros(0, dtype=np.int8)
+        self.pending = (np.zeros(0, dtype=np.int64),) * 2 + (np.zeros(0, dtype=np.int8),)
+        # per node
+        self.ids = np.zeros(0, dtype=np.int64)        # resident id of each node
+        self.alive = np.zeros(0, dtype=bool)
+        self.job = np.zeros(0, dtype=np.int8)
+        self.partner = np.zeros(0, dtype=np.int64)    # node of the partner, -1 if single
+        self.home = np.zeros(0, dtype=np.int64)       # node of the parent who keys the household, -1 if none
+        self.workplace = np.zeros(0, dtype=np.int64)  # workplace number * len(JOBS) + job, -1 if none
+        self._sorted = np.zeros(0, dtype=np.int64)    # ids, sorted...
+        self._node_of = np.zeros(0, dtype=np.int64)   # ...and their nodes
+        self.births = []        # (child ids, parent ids) since the last sync
+        self.dropped = 0        # nodes died since the last compaction
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    # --- Checkpoints ---
+    def state(self):
+        """{name: array} of the network, pending edges merged first (between two days: no births queued)."""
+        self.compact()
+        return {name: getattr(self, name) for name in STATE}
+
+    @classmethod
+    def from_state(cls, arrays, workplace_size: int = 10, community_degree: int = 2):
+        network = cls(workplace_size, community_degree)
+        for name in STATE:
+            setattr(network, name, np.asarray(arrays[name], dtype=getattr(network, name).dtype))
+        network._node_of = np.argsort(network.ids, kind="stable")
+        network._sorted = network.ids[network._node_of]
+        return network
+
+    # --- Ids and nodes ---
+    def nodes(self, ids):
+        """Node of each resident id (-1 for ids never seen)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(self._sorted) == 0:
+            return np.full(len(ids), -1, dtype=np.int64)
+        at = np.minimum(np.searchsorted(self._sorted, ids), len(self._sorted) - 1)
+        return np.where(self._sorted[at] == ids, self._node_of[at], -1)
+
+    def _add(self, ids):
+        """New nodes for `ids` (not seen before); returns them."""
+        old, size = len(self.ids), len(self.ids) + len(ids)
+        nodes = np.arange(old, size)
+        self.ids = np.concatenate([self.ids, ids])
+        order = np.argsort(ids, kind="stable")
+        at = np.searchsorted(self._sorted, ids[order])
+        self._sorted = np.insert(self._sorted, at, ids[order])
+        self._node_of = np.insert(self._node_of, at, nodes[order])
+        self.indptr = np.concatenate([self.indptr, np.full(len(ids), self.indptr[-1])])
+        for name, fill in (("alive", False), ("job", 0), ("partner", -1), ("home", -1), ("workplace", -1)):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.full(len(ids), fill, dtype=column.dtype)]))
+        return nodes
+
+    # --- Updates ---
+    def _link(self, a, b, kind):
+        """Queue undirected edges a[i] - b[i] (both directions)."""
+        keep = a != b
+        a, b = a[keep], b[keep]
+        src, dst, kinds = self.pending
+        self.pending = (np.concatenate([src, a, b]), np.concatenate([dst, b, a]),
+                        np.concatenate([kinds, np.full(2 * len(a), kind, dtype=np.int8)]))
+
+    def _join(self, joiners, labels, kind):
+        """Link each of `joiners` to every living node with the same label (once per pair)."""
+        if len(joiners) == 0:
+            return
+        members = np.flatnonzero(self.alive & np.isin(labels, labels[joiners]))
+        members = members[np.argsort(labels[members], kind="stable")]
+        lo = np.searchsorted(labels[members], labels[joiners], "left")
+        hi = np.searchsorted(labels[members], labels[joiners], "right")
+        a = np.repeat(joiners, hi - lo)
+        b = members[_ranges(lo, hi - lo)]
+        joining = np.zeros(len(self.alive), dtype=bool)
+        joining[joiners] = True
+        once = ~joining[b] | (b > a)  # pairs of two joiners are seen from both sides
+        self._link(a[once], b[once], kind)
+
+    def born(self, children, parents):
+        """Record the parent (couple key) of newborns; they join its household at the next sync."""
+        self.births.append((np.asarray(children, dtype=np.int64), np.asarray(parents, dtype=np.int64)))
+
+    def sync(self, day, rng, ids, partner, job):
+        """
+        Bring the network up to date with the population: add the newborns to
+        their household, link new couples, (re)assign workplaces after job
+        changes, give new residents their community links, and forget the dead.
+        Changes are found by comparing whole columns (vectorized, O(n)); only
+        the edges of the residents that changed are touched.
+
+        Arguments: day, rng (rng.CounterRNG), ids, partner (row of the partner
+        in these arrays, -1 if single), job (codes), all in population order
+        Returns: node of each row
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        nodes = self.nodes(ids)
+        unseen = nodes < 0
+        if unseen.any():
+            nodes[unseen] = self._add(ids[unseen])
+        now = np.zeros(len(self.alive), dtype=bool)
+        now[nodes] = True
+        was_alive = self.alive
+        new = nodes[~was_alive[nodes]]
+        self.dropped += int((was_alive & ~now).sum())
+        self.alive = now
+
+        # couples
+        partner = np.asarray(partner, dtype=np.int64)
+        partner = np.where(partner >= 0, nodes[partner], -1)
+        old_partner = self.partner[nodes]
+        self.partner[nodes] = partner
+        paired = nodes[(partner != old_partner) & (partner > nodes)]
+        self._link(paired, self.partner[paired], HOUSEHOLD)
+
+        # households of the newborns: parent, the parent's partner, siblings
+        if self.births:
+            children = self.nodes(np.concatenate([c for c, _ in self.births]))
+            parents = self.nodes(np.concatenate([p for _, p in self.births]))
+            self.births = []
+            keep = (children >= 0) & (parents >= 0)
+            children, parents = children[keep], parents[keep]
+            keep = self.alive[children]
+            children, parents = children[keep], parents[keep]
+            self.home[children] = parents
+            self._link(children, parents, HOUSEHOLD)
+            partners = self.partner[parents]
+            with_partner = partners >= 0
+            self._link(children[with_partner], partners[with_partner], HOUSEHOLD)
+            self._join(children, self.home, HOUSEHOLD)
+
+        # workplaces: new residents and job changes
+        old_job = self.job[nodes]
+        self.job[nodes] = job
+        moved = nodes[was_alive[nodes] & (old_job != self.job[nodes])]
+        self.workplace[moved] = -1
+        changed = np.concatenate([new, moved])
+        joiners = changed[np.isin(self.job[changed], WORKPLACE_JOBS)]
+        if len(joiners):
+            per_job = np.bincount(self.job[nodes], minlength=len(JOBS))
+            places = np.maximum(1, -(-per_job // self.workplace_size))
+            jobs = self.job[joiners].astype(np.int64)
+            u = rng.uniform(streams.NETWORK, day, self.ids[joiners], 0)
+            self.workplace[joiners] = (u * places[jobs]).astype(np.int64) * len(JOBS) + jobs
+            self._join(np.sort(joiners), self.workplace, WORK)
+
+        # community links of new residents, to anybody alive
+        if len(new) and len(nodes) > 1:
+            for slot in range(1, self.community_degree + 1):
+                u = rng.uniform(streams.NETWORK, day, self.ids[new], slot)
+                self._link(new, nodes[(u * len(nodes)).astype(np.int64)], COMMUNITY)
+
+        if len(self.pending[0]) > max(4096, len(self.indices) // 4) or self.dropped > max(64, len(nodes) // 10):
+            self.compact()
+        return nodes
+
+    # --- Reading ---
+    def _valid(self, src, dst, kinds):
+        same_place = (self.workplace[src] == self.workplace[dst]) & (self.workplace[src] >= 0)
+        return self.alive[src] & self.alive[dst] & ((kinds != WORK) | same_place)
+
+    def edges(self, sources=None):
+        """
+        Valid edges leaving `sources` (nodes; default: every living node), each pair once.
+
+        Returns: src, dst (node arrays sorted by src then dst; self.ids gives their
+        resident ids), kind of one of the pair's edges
+        """
+        if sources is None:
+            sources = np.flatnonzero(self.alive)
+        sources = np.asarray(sources, dtype=np.int64)
+        counts = self.indptr[sources + 1] - self.indptr[sources]
+        at = _ranges(self.indptr[sources], counts)
+        p_src, p_dst, p_kinds = self.pending
+        queued = np.isin(p_src, sources)
+        src = np.concatenate([np.repeat(sources, counts), p_src[queued]])
+        dst = np.concatenate([self.indices[at], p_dst[queued]])
+        kinds = np.concatenate([self.kinds[at], p_kinds[queued]])
+        keep = self._valid(src, dst, kinds)
+        n = len(self.alive)
+        key = src[keep] * n + dst[keep]
+        order, first = _first(key)
+        key = key[order][first]
+        return key // n, key % n, kinds[keep][order][first]
+
+    def compact(self):
+        """Merge the pending edges into the CSR arrays, dropping the invalid and duplicate ones."""
+        n = len(self.alive)
+        p_src, p_dst, p_kinds = self.pending
+        src = np.concatenate([np.repeat(np.arange(n), np.diff(self.indptr)), p_src])
+        dst = np.concatenate([self.indices, p_dst])
+        kinds = np.concatenate([self.kinds, p_kinds])
+        keep = self._valid(src, dst, kinds)
+        key = (src[keep] * n + dst[keep]) * len(KINDS) + kinds[keep]
+        key.sort()
+        key = key[np.concatenate([np.ones(min(1, len(key)), dtype=bool), key[1:] != key[:-1]])]
+        pair, kinds = key // len(KINDS), (key % len(KINDS)).astype(np.int8)
+        src = pair // n
+        self.indices, self.kinds = pair % n, kinds
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n))])
+        self.pending = (np.zeros(0, dtype=np.int64),) * 2 + (np.zeros(0, dtype=np.int8),)
+        self.dropped = 0
+
+    def degrees(self):
+        """Mean valid degree per edge kind, over the living nodes."""
+        src, dst, kinds = self.edges()
+        living = max(1, len(self))
+        return {name: float((kinds == k).sum()) / living for k, name in enumerate(KINDS)}
+
+    # --- Transmission ---
+    def transmit(self, rng, day, infected, susceptible, p):
+        """
+        Every (infected, susceptible) pair linked in the network has its own
+        draw, keyed like the distance model's pairs; a resident is infected if
+        any of its pairs succeeds, by the infector with the smallest id (the
+        first one in population order).
+
+        Arguments: rng, day, infected (nodes), susceptible (nodes), p (transmission probability)
+        Returns: infectees (ids, increasing), infectors (aligned ids)
+        """
+        exposed = np.zeros(len(self.alive), dtype=bool)
+        exposed[susceptible] = True
+        src, dst, _ = self.edges(infected)
+        keep = exposed[dst]
+        src, dst = self.ids[src[keep]], self.ids[dst[keep]]
+        hit = rng.uniform(streams.TRANSMISSION, day, dst, other=src) < p
+        src, dst = src[hit], dst[hit]
+        order = np.lexsort((src, dst))
+        src, dst = src[order], dst[order]
+        first = np.concatenate([np.ones(min(1, len(dst)), dtype=bool), dst[1:] != dst[:-1]])
+        return dst[first], src[first]
+
+
+# --- CLI ---
+def main(argv=None):
+    import time
+
+    from config import parse_override
+    from simulation import Simulation
+
+    parser = argparse.ArgumentParser(description="Run with the household / workplace / community contact network")
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE")
+    args = parser.parse_args(argv)
+
+    overrides = dict(parse_override(t) for t in args.set)
+    overrides.update(size=args.size, contact_model="network")
+    sim = Simulation(overrides, seed=args.seed)
+    start = time.perf_counter()
+    for _ in range(args.days):
+        sim.step()
+    elapsed = time.perf_counter() - start
+    network = sim.population.network
+    print(f"{args.days} days in {elapsed:.2f} s: {len(sim.population)} residents, "
+          f"{sim.population.count('state', INFECT)} infected")
+    if network is not None:
+        degrees = network.degrees()
+        print("mean degree: " + ", ".join(f"{name} {d:.2f}" for name, d in degrees.items())
+              + f" (total {sum(degrees.values()):.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,557 @@
+import numpy as np
+
+import habitant
+import rng as streams
+from config import DEFAULT_CONFIG
+from events import (EventLog, DEATH, BIRTH, VISIT, TRANSMISSION, JOB_CHANGE, PERSONA_CHANGE,
+                    NATURAL, STARVATION, INFECTION)
+from food import TIER, allocate
+from habitant import (HEALTHY, INFECT, RICH, POOR, NORMAL, FARMER, DOCTOR, WORKER, JOBLESS, NONE,
+                      STATE_DRAW, PERSONA_DRAW, JOB_DRAW, HIRE_DRAW, calculate_satisfaction)
+from network import ContactNetwork
+from profiling import call
+from rng import CounterRNG, categorical
+
+
+# --- Lookup tables (indexed by code) ---
+def ttl_table(config=DEFAULT_CONFIG):
+    """TTL[persona]: days before death if infected."""
+    return np.array(habitant.ttl_table(config), dtype=np.int32)
+
+
+def daily_need_table(config=DEFAULT_CONFIG):
+    """DAILY_NEED[persona, job]: food eaten per day."""
+    return np.array(habitant.daily_need_table(config), dtype=np.int32)
+
+
+COLUMNS = {
+    "id": np.int64,
+    "state": np.int8,
+    "persona": np.int8,
+    "job": np.int8,
+    "age": np.int32,
+    "days_infected": np.int32,
+    "at_hospital": np.bool_,
+    "hospital_days": np.int32,
+    "food_deficit": np.int32,
+    "days_hungry": np.int32,
+    "partner": np.int32,   # row index of the partner, -1 if single
+    "x": np.float32,
+    "y": np.float32,
+}
+
+
+# --- Structure-of-arrays population ---
+class PopulationArrays:
+    """
+    Same residents as a list of Habitant, stored column by column.
+    Row i of every column is resident i; rows stay packed (dead rows are
+    compacted away) so every phase is a handful of NumPy operations.
+    Random draws come from a rng.CounterRNG keyed by resident id, the same
+    as the object model: same seed, same run.
+    """
+
+    def __init__(self, capacity: int = 1024, seed=None):
+        self.rng = CounterRNG(seed)
+        self.n = 0
+        self.next_id = 0
+        self.columns = {name: np.zeros(max(1, capacity), dtype=dt) for name, dt in COLUMNS.items()}
+        self.network = None  # ContactNetwork for config.contact_model "network" (see track_network)
+        for name in COLUMNS:
+            setattr(self, name, self.columns[name][:0])
+
+    @classmethod
+    def random(cls, size: int, age: int = 25, seed=None):
+        """Population of `size` new residents drawn like Population.spawn."""
+        pop = cls(capacity=size, seed=seed)
+        pop.add_residents(size, age)
+        return pop
+
+    @classmethod
+    def from_habitants(cls, habitants, seed=None):
+        """
+        Copy a list of Habitant objects, or a Population (partners become row
+        indices). Ids are kept, since the random draws are keyed by them.
+        """
+        next_id = getattr(habitants, "_next_id", 0)
+        habitants = list(habitants)
+        pop = cls(capacity=len(habitants), seed=seed)
+        row = {id(r): i for i, r in enumerate(habitants)}
+        pop._grow(len(habitants))
+        pop.id[:] = [r.id for r in habitants]
+        pop.next_id = max(next_id, int(pop.id.max()) + 1 if len(habitants) else 0)
+        pop.state[:] = [r.state_code for r in habitants]
+        pop.persona[:] = [r.persona_code for r in habitants]
+        pop.job[:] = [r.job_code for r in habitants]
+        for name in ("age", "days_infected", "at_hospital", "hospital_days",
+                     "food_deficit", "days_hungry", "x", "y"):
+            getattr(pop, name)[:] = [getattr(r, name) for r in habitants]
+        pop.partner[:] = [row.get(id(r.partner), -1) for r in habitants]
+        return pop
+
+    def __len__(self):
+        return self.n
+
+    def _grow(self, extra):
+        """Make room for `extra` rows and refresh the column views."""
+        start, end = self.n, self.n + extra
+        capacity = len(self.columns["id"])
+        if end > capacity:
+            capacity = max(end, 2 * capacity)
+            for name, col in self.columns.items():
+                bigger = np.zeros(capacity, dtype=col.dtype)
+                bigger[:start] = col[:start]
+                self.columns[name] = bigger
+        self.n = end
+        for name in COLUMNS:
+            setattr(self, name, self.columns[name][:end])
+        self.id[start:end] = np.arange(self.next_id, self.next_id + extra)
+        self.next_id += extra
+        return slice(start, end)
+
+    def add_residents(self, count: int, age: int):
+        """Append `count` residents with the same random draws as Population.spawn."""
+        rows = self._grow(count)
+        u = [self.rng.uniform(streams.SPAWN, 0, self.id[rows], slot) for slot in range(5)]
+        self.state[rows] = categorical(u[0], STATE_DRAW)
+        self.persona[rows] = categorical(u[1], PERSONA_DRAW)
+        self.job[rows] = categorical(u[2], JOB_DRAW) if age >= 15 else NONE
+        self.age[rows] = age
+        for name in ("days_infected", "hospital_days", "food_deficit", "days_hungry"):
+            getattr(self, name)[rows] = 0
+        self.at_hospital[rows] = False
+        self.partner[rows] = -1
+        self.x[rows] = np.floor(u[3] * 1720)
+        self.y[rows] = np.floor(u[4] * 860)
+        return rows
+
+    def remove(self, dead):
+        """Drop the rows where `dead` is True, unlinking partners and remapping indices."""
+        if not dead.any():
+            return
+        widowed = self.partner[dead]
+        self.partner[widowed[widowed >= 0]] = -1
+        alive = ~dead
+        new_row = np.cumsum(alive) - 1
+        keep = np.flatnonzero(alive)
+        for name in COLUMNS:
+            col = self.columns[name]
+            col[:len(keep)] = col[keep]
+        self.n = len(keep)
+        for name in COLUMNS:
+            setattr(self, name, self.columns[name][:self.n])
+        has_partner = self.partner >= 0
+        self.partner[has_partner] = new_row[self.partner[has_partner]]
+
+    def track_network(self, config=DEFAULT_CONFIG):
+        """Start keeping a ContactNetwork (network.py) of the residents, updated by spread_infection."""
+        if self.network is None:
+            self.network = ContactNetwork(config.workplace_size, config.community_degree)
+        return self.network
+
+    def couples(self):
+        """(k, 2) array of row pairs, each couple listed once."""
+        rows = np.flatnonzero(self.partner > np.arange(self.n))
+        return np.column_stack([rows, self.partner[rows]])
+
+    def daily_need(self, config=DEFAULT_CONFIG):
+        return daily_need_table(config)[self.persona, self.job]
+
+
+# --- Vectorized neighbour search (grid buckets + searchsorted) ---
+def neighbour_pairs(src_x, src_y, dst_x, dst_y, radius: float = 45, chunk: int = 1 << 16):
+    """
+    Yield every (source, destination) pair strictly closer than `radius`, by batches.
+    Sources are bucketed into radius-sized cells; each destination looks at its 3x3 block.
+
+    Arguments: src_x, src_y, dst_x, dst_y, radius, chunk (destinations per batch)
+    Yields: (src, dst) index arrays
+    """
+    if len(src_x) == 0 or len(dst_x) == 0:
+        return
+
+    scx = (src_x // radius).astype(np.int64) + 1
+    scy = (src_y // radius).astype(np.int64) + 1
+    height = int(max(scy.max(), (dst_y // radius).max() + 1)) + 2
+    order = np.argsort(scx * height + scy, kind="stable")
+    sorted_keys = (scx * height + scy)[order]
+    r2 = radius * radius
+
+    for start in range(0, len(dst_x), chunk):
+        tx = dst_x[start:start + chunk]
+        ty = dst_y[start:start + chunk]
+        tcx = (tx // radius).astype(np.int64) + 1
+        tcy = (ty // radius).astype(np.int64) + 1
+        for ox in (-1, 0, 1):
+            for oy in (-1, 0, 1):
+                keys = (tcx + ox) * height + (tcy + oy)
+                lo = np.searchsorted(sorted_keys, keys, side="left")
+                hi = np.searchsorted(sorted_keys, keys, side="right")
+                n_pairs = hi - lo
+                total = int(n_pairs.sum())
+                if total == 0:
+                    continue
+                dst = np.repeat(np.arange(len(tx)), n_pairs)
+                offsets = np.arange(total) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+                src = order[np.repeat(lo, n_pairs) + offsets]
+                dx = src_x[src] - tx[dst]
+                dy = src_y[src] - ty[dst]
+                close = dx * dx + dy * dy < r2
+                yield src[close], dst[close] + start
+
+
+def count_neighbours(src_x, src_y, dst_x, dst_y, radius: float = 45, chunk: int = 1 << 16):
+    """
+    For every destination point, count the source points strictly closer than `radius`.
+
+    Arguments: src_x, src_y, dst_x, dst_y, radius, chunk (destinations per batch)
+    Returns: counts (int array, one per destination)
+    """
+    counts = np.zeros(len(dst_x), dtype=np.int64)
+    for _, dst in neighbour_pairs(src_x, src_y, dst_x, dst_y, radius, chunk):
+        counts += np.bincount(dst, minlength=len(dst_x))
+    return counts
+
+
+# --- Vectorized phases ---
+def grow_older(pop):
+    pop.age += 1
+
+
+def form_couples(pop, existing_couples=None, day=0):
+    """
+    Pair up single residents >=18 in random order.
+
+    Arguments: pop, existing_couples (ignored, the partner column is the truth), day
+    Returns: couples as a (k, 2) array of resident ids
+    """
+    eligible = np.flatnonzero((pop.partner < 0) & (pop.age >= 18))
+    keys = pop.rng.uniform(streams.COUPLES, day, pop.id[eligible])
+    eligible = eligible[np.argsort(keys, kind="stable")]
+    pairs = eligible[:len(eligible) // 2 * 2].reshape(-1, 2)
+    pop.partner[pairs[:, 0]] = pairs[:, 1]
+    pop.partner[pairs[:, 1]] = pairs[:, 0]
+    return pop.id[pop.couples()]
+
+
+def handle_births(pop, satisfaction, couples, food, consumption, events, day, config=DEFAULT_CONFIG):
+    """
+    A couple is keyed by its smaller id (rows, hence ids, are in population order).
+
+    Arguments: pop, satisfaction, couples ((k, 2) ids), food, consumption, events, day, config
+    Returns: pop, nb_births
+    """
+    nb_births = 0
+    if satisfaction > config.birth_min_satisfaction:
+        p_birth = config.birth_prob_shortage if food < consumption else config.birth_prob
+        if len(pop) > config.crowding_size:
+            p_birth /= config.crowding_divisor
+        firsts = couples[:, 0]
+        parents = np.sort(firsts[pop.rng.uniform(streams.BIRTHS, day, firsts) < p_birth])
+        nb_births = len(parents)
+        if nb_births:
+            rows = pop.add_residents(nb_births, age=0)
+            events.record_rows(BIRTH, pop, np.arange(rows.start, rows.stop), source=parents)
+            if config.contact_model == "network":
+                pop.track_network(config).born(pop.id[rows], parents)
+    return pop, nb_births
+
+
+def check_deaths(pop, events, day, config=DEFAULT_CONFIG):
+    """
+    Natural deaths (age-based) and starvation deaths, in bulk.
+
+    Arguments: pop, events, day, config
+    Returns: pop, nb_deaths
+    """
+    age = pop.age
+    p = np.where(age < config.old_age, config.natural_death_prob,
+                 config.natural_death_prob + (age - config.old_age) / 40 * config.old_age_extra_prob)
+    natural = (age >= 10) & (age <= 100) & (pop.rng.uniform(streams.DEATHS, day, pop.id) < p)
+    starvation = (pop.days_hungry >= config.starvation_days) & (pop.food_deficit > config.starvation_deficit)
+
+    dead = natural | starvation
+    rows = np.flatnonzero(dead)
+    events.record_rows(DEATH, pop, rows, cause=np.where(starvation[rows], STARVATION, NATURAL))
+    pop.remove(dead)
+    return pop, int(dead.sum())
+
+
+def update_food(pop, food, config=DEFAULT_CONFIG):
+    """
+    Arguments: pop, food, config
+    Returns: new_food_stock, total_consumption_for_the_day
+    """
+    production = config.job_action["farmer"] * int((pop.job == FARMER).sum())
+    consumption = int(pop.daily_need(config).sum())
+    return food + production, consumption
+
+
+def distribute_food(pop, food, config=DEFAULT_CONFIG):
+    """
+    Same priority tiers and policy as the object model (food.py): one stable
+    sort by tier, then the cutoff where food runs out on a cumulative sum.
+
+    Arguments: pop, food, config
+    Returns: food, underfed
+    """
+    need = pop.daily_need(config)
+    tier = TIER[pop.persona, pop.job]
+    given, food = allocate(need, tier, food, config.food_policy, config.food_quotas)
+
+    listed = tier >= 0
+    fed = listed & (given >= need)
+    hungry = listed & ~fed
+    pop.days_hungry[fed] = 0
+    pop.food_deficit[fed] = 0
+    pop.food_deficit[hungry] += (need[hungry] - given[hungry]).astype(np.int32)
+    pop.days_hungry[hungry] += 1
+    return food, int(hungry.sum())
+
+
+def update_status_changes(pop, satisfaction, satisfaction_prev, events, day):
+    """
+    Job/persona transitions, applied in the same order as the object model
+    and with the same draw slots.
+
+    Arguments: pop, satisfaction, satisfaction_prev, events, day
+    Returns: pop, nb_changes
+    """
+    u = [pop.rng.uniform(streams.STATUS, day, pop.id, slot) for slot in range(7)]
+    before = len(events)
+
+    def log(kind, mask, old, column):
+        rows = np.flatnonzero(mask)
+        events.record_rows(kind, pop, rows, old=old, new=column[rows])
+
+    quit_job = (pop.job == WORKER) & (u[0] < 0.01)
+    pop.job[quit_job] = JOBLESS
+    log(JOB_CHANGE, quit_job, WORKER, pop.job)
+
+    hired = (pop.job == JOBLESS) & (pop.age >= 15) & (u[1] < 0.05)
+    pop.job[hired] = categorical(u[2][hired], HIRE_DRAW)
+    log(JOB_CHANGE, hired, JOBLESS, pop.job)
+
+    grown = (pop.job == NONE) & (pop.age >= 15)
+    pop.job[grown] = categorical(u[3][grown], JOB_DRAW)
+    log(JOB_CHANGE, grown, NONE, pop.job)
+
+    richer = (pop.persona == POOR) & (u[4] < 0.05)
+    pop.persona[richer] = NORMAL
+    log(PERSONA_CHANGE, richer, POOR, pop.persona)
+
+    p = (100 - satisfaction) / 100 * 0.1 + (0.05 if satisfaction < satisfaction_prev else 0)
+    ruined = (pop.persona == RICH) & (u[5] < p)
+    pop.persona[ruined] = NORMAL
+    log(PERSONA_CHANGE, ruined, RICH, pop.persona)
+
+    p = satisfaction / 100 * 0.05 + (0.05 if satisfaction > satisfaction_prev else 0)
+    enriched = (pop.persona == NORMAL) & (u[6] < p)
+    pop.persona[enriched] = RICH
+    log(PERSONA_CHANGE, enriched, NORMAL, pop.persona)
+
+    return pop, len(events) - before
+
+
+def move_residents(pop, day, config=DEFAULT_CONFIG):
+    """
+    Move everybody with the config.movement model (see movement.py).
+    The neighbour search buckets positions on every call, so nothing else to update.
+
+    Returns: pop, number of residents that moved
+    """
+    from movement import step_positions
+
+    new_x, new_y = step_positions(pop.id, pop.x, pop.y, pop.job, pop.at_hospital, pop.rng, day, config)
+    moved = (new_x != pop.x) | (new_y != pop.y)
+    pop.x[:], pop.y[:] = new_x, new_y
+    return pop, int(moved.sum())
+
+
+def spread_infection(pop, day, config=DEFAULT_CONFIG, events=None, chunk: int = 1 << 16):
+    """
+    Every (healthy, infected) pair closer than config.contact_radius has its own
+    draw, as in the object model; a healthy resident is infected if any of its
+    pairs succeeds, and its infector is the first successful one in row order.
+
+    With config.contact_model == "network", the pairs are the network links
+    of the infected (network.py), as in habitant.spread_infection.
+
+    Arguments: pop, day, config, events (optional), chunk (healthy residents per batch)
+    Returns: pop, transmissions
+    """
+    radius, p = config.contact_radius, config.transmission_prob
+    infected = np.flatnonzero(pop.state == INFECT)
+    healthy = np.flatnonzero(pop.state == HEALTHY)
+    if config.contact_model == "network":
+        network = pop.track_network(config)
+        nodes = network.sync(day, pop.rng, pop.id, pop.partner, pop.job)
+        infectees, infectors = network.transmit(pop.rng, day, nodes[infected], nodes[healthy], p)
+        caught, sources = np.searchsorted(pop.id, infectees), np.searchsorted(pop.id, infectors)
+    elif config.contact_model == "distance":
+        no_source = len(infected)
+        source = np.full(len(healthy), no_source, dtype=np.int64)
+        for src, dst in neighbour_pairs(pop.x[infected], pop.y[infected], pop.x[healthy], pop.y[healthy],
+                                        radius, chunk):
+            hit = pop.rng.uniform(streams.TRANSMISSION, day, pop.id[healthy[dst]], other=pop.id[infected[src]]) < p
+            np.minimum.at(source, dst[hit], src[hit])
+        caught_at = np.flatnonzero(source < no_source)
+        caught, sources = healthy[caught_at], infected[source[caught_at]]
+    else:
+        raise ValueError(f"Unknown contact model: {config.contact_model!r} (expected 'distance' or 'network')")
+    pop.state[caught] = INFECT
+    pop.days_infected[caught] = 1
+    if events is not None:
+        events.record_rows(TRANSMISSION, pop, caught, source=pop.id[sources])
+        if events.tree is not None:
+            events.tree.record(day, pop.id[sources], pop.id[caught],
+                               np.hypot(pop.x[caught] - pop.x[sources], pop.y[caught] - pop.y[sources]))
+    return pop, len(caught)
+
+
+def update_disease(pop, events, config=DEFAULT_CONFIG):
+    """
+    Arguments: pop, events, config
+    Returns: pop, nb_deaths
+    """
+    infected = pop.state == INFECT
+    pop.days_infected[infected] += 1
+    pop.hospital_days[infected & pop.at_hospital] += 1
+    dead = infected & (pop.days_infected > ttl_table(config)[pop.persona])
+    events.record_rows(DEATH, pop, np.flatnonzero(dead), cause=INFECTION)
+    pop.remove(dead)
+    return pop, int(dead.sum())
+
+
+def update_doctor(pop, day, events, config=DEFAULT_CONFIG):
+    """
+    Hospitalized patients are treated first, then new infected are sent to
+    hospital until doctor capacity (or config.hospital_beds) runs out; in row
+    order, or fewest days to death first with config.triage == "urgency".
+
+    Arguments: pop, day, events, config
+    Returns: pop, nb_visits, nb_doctors
+    """
+    nb_doctors = int((pop.job == DOCTOR).sum())
+    nb_visits = 0
+
+    if nb_doctors > 0 and day > config.doctor_start_day:
+        rng = pop.rng
+        capacity = nb_doctors * config.job_action["doctor"]
+        infected = pop.state == INFECT
+
+        treated = _triage(pop, np.flatnonzero(infected & pop.at_hospital), day, config)[:capacity]
+        success = np.maximum(0, config.cure_base - (pop.days_infected[treated] - 1) * config.cure_decay)
+        cured = treated[rng.uniform(streams.DOCTOR, day, pop.id[treated], 0) < success]
+        pop.state[cured] = HEALTHY
+        pop.days_infected[cured] = 0
+        pop.at_hospital[cured] = False
+        pop.hospital_days[cured] = 0
+        capacity -= len(treated)
+        admissions = capacity
+        if config.hospital_beds:
+            admissions = min(capacity, config.hospital_beds - int(pop.at_hospital.sum()))
+
+        if admissions > 0:
+            waiting = np.flatnonzero((pop.state == INFECT) & ~pop.at_hospital)  # cured ones stay home
+            waiting = _triage(pop, waiting, day, config)
+            prob_to_visit = np.minimum(1, config.visit_base + (pop.days_infected[waiting] - 1) * config.visit_growth)
+            visiting = waiting[rng.uniform(streams.DOCTOR, day, pop.id[waiting], 1) < prob_to_visit][:admissions]
+            pop.at_hospital[visiting] = True
+            pop.hospital_days[visiting] = 1
+            events.record_rows(VISIT, pop, visiting)
+            nb_visits = len(visiting)
+
+    return pop, nb_visits, nb_doctors
+
+
+def _triage(pop, rows, day, config):
+    """`rows` in the order patients are seen: unchanged, or by (day of death, id) for "urgency"."""
+    if config.triage != "urgency":
+        return rows
+    death_day = day + ttl_table(config)[pop.persona[rows]] - pop.days_infected[rows]
+    return rows[np.lexsort((pop.id[rows], death_day))]
+
+
+# --- One-day simulation ---
+def simulate_day(pop, food, satisfaction, day, satisfaction_prev, couples, config=DEFAULT_CONFIG,
+                 events=None, profiler=None, before_day=None):
+    """
+    Runs one full day on a PopulationArrays, with the same contract (and the
+    same profiler phase names) as habitant.simulate_day.
+
+    Arguments: pop, food, satisfaction, day, satisfaction_prev, couples, config, events, profiler,
+    before_day (optional callable run before the first phase, inside the day's event window)
+
+    Returns: pop, food, satisfaction, deaths_today, visits_today,
+    status_changes, births, couples
+    """
+    if events is None:
+        events = EventLog()
+    events.begin_day(day)
+    run = call
+    if profiler is not None:
+        profiler.begin_day(day)
+        run = profiler.run
+
+    if before_day is not None:
+        run("before_day", len(pop), before_day)
+
+    run("grow_older", len(pop), grow_older, pop)
+
+    couples = run("form_couples", len(pop), form_couples, pop, couples, day)
+    pop, nb_deaths = run("check_deaths", len(pop), check_deaths, pop, events, day, config)
+
+    food, consumption = run("update_food", len(pop), update_food, pop, food, config)
+    pop, _ = run("handle_births", len(couples), handle_births, pop, satisfaction, couples, food, consumption,
+                 events, day, config)
+
+    pop, _ = run("update_status_changes", len(pop), update_status_changes, pop, satisfaction,
+                 satisfaction_prev, events, day)
+
+    food, underfed = run("distribute_food", len(pop), distribute_food, pop, food, config)
+
+    if config.movement != "none":
+        run("move_residents", len(pop), move_residents, pop, day, config)
+
+    nb_infected = int((pop.state == INFECT).sum())
+    pop, _ = run("spread_infection", nb_infected, spread_infection, pop, day, config, events)
+
+    nb_infected = int((pop.state == INFECT).sum())
+    pop, deaths_disease = run("update_disease", nb_infected, update_disease, pop, events, config)
+    nb_deaths += deaths_disease
+
+    nb_infected = int((pop.state == INFECT).sum())
+    pop, _, nb_doctors = run("update_doctor", nb_infected, update_doctor, pop, day, events, config)
+    nb_hospitalized = int(pop.at_hospital.sum())
+
+    satisfaction = run("calculate_satisfaction", 1, calculate_satisfaction,
+                       satisfaction, consumption, food, nb_deaths,
+                       nb_hospitalized, nb_doctors, pop, underfed, config)
+
+    deaths_today, visits_today = events.today(DEATH), events.today(VISIT)
+    status_changes, births = events.today(JOB_CHANGE, PERSONA_CHANGE), events.today(BIRTH)
+    events.end_day()
+    if profiler is not None:
+        profiler.end_day(len(pop))
+    return pop, food, satisfaction, deaths_today, visits_today, status_changes, births, pop.id[pop.couples()]
+
+
+# --- TEST FONCTION ---
+
+
+if __name__ == "__main__":
+    import time
+
+    print("=== ARRAY BACKEND: 100 000 residents, 10 days ===")
+    pop = PopulationArrays.random(100_000, age=25, seed=42)
+    food, satisfaction = 500, 70
+    couples = form_couples(pop)
+    for day in range(1, 11):
+        start = time.perf_counter()
+        pop, food, satisfaction, deaths, visits, status_changes, births, couples = simulate_day(
+            pop, food, satisfaction, day, satisfaction, couples
+        )
+        print(f"Day {day}: 👥 {len(pop)} | 🍖 {food:.0f} | 😊 {satisfaction:.1f} | "
+              f"⚰️ {len(deaths)} deaths | 👶 {len(births)} births | {time.perf_counter() - start:.3f}s")
+    print("=== END OF TEST ===")
@@ -0,0 +1,137 @@
+"""
+Opt-in per-phase instrumentation of simulate_day.
+
+Pass a PhaseProfiler as `profiler=` to simulate_day (or Simulation): each phase
+is then timed, with its call count and the number of items it processed.
+Without a profiler the phases are called directly, with no timing at all.
+
+    python profiling.py --size 5000 --days 60 --trace trace.json
+    python profiling.py --backend arrays --size 200000 --days 20
+"""
+import argparse
+import json
+from time import perf_counter_ns
+
+
+def call(phase, items, fn, *args):
+    """What simulate_day uses instead of PhaseProfiler.run when profiling is off."""
+    return fn(*args)
+
+
+class PhaseProfiler:
+    """
+    Wall time, calls and items per (day, phase).
+    Hooks are called after every phase as hook(day, phase, seconds, items).
+    """
+
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+        self.spans = []  # (day, phase, start_ns, duration_ns, items)
+        self.day = 0
+        self._day_start = None
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def begin_day(self, day):
+        self.day = day
+        self._day_start = perf_counter_ns()
+
+    def end_day(self, items):
+        self._record("day", self._day_start, perf_counter_ns() - self._day_start, items)
+
+    def run(self, phase, items, fn, *args):
+        """Call fn(*args) and record it as `phase` having processed `items` items."""
+        start = perf_counter_ns()
+        result = fn(*args)
+        self._record(phase, start, perf_counter_ns() - start, items)
+        return result
+
+    def _record(self, phase, start, duration, items):
+        self.spans.append((self.day, phase, start, duration, items))
+        for hook in self.hooks:
+            hook(self.day, phase, duration / 1e9, items)
+
+    # --- Reports ---
+    def summary(self):
+        """
+        Returns: {phase: {"calls", "seconds", "mean_ms", "items", "ns_per_item", "share"}},
+        in first-call order; "share" is the fraction of the total day time.
+        """
+        totals = {}
+        for _, phase, _, duration, items in self.spans:
+            row = totals.setdefault(phase, {"calls": 0, "ns": 0, "items": 0})
+            row["calls"] += 1
+            row["ns"] += duration
+            row["items"] += items
+        day_ns = totals.get("day", {}).get("ns") or sum(row["ns"] for row in totals.values()) or 1
+        return {
+            phase: {
+                "calls": row["calls"],
+                "seconds": row["ns"] / 1e9,
+                "mean_ms": row["ns"] / row["calls"] / 1e6,
+                "items": row["items"],
+                "ns_per_item": row["ns"] / row["items"] if row["items"] else 0.0,
+                "share": row["ns"] / day_ns,
+            }
+            for phase, row in totals.items()
+        }
+
+    def report(self):
+        """End-of-run table, slowest phase first (the "day" row is the total)."""
+        rows = sorted(self.summary().items(), key=lambda item: (item[0] != "day", -item[1]["seconds"]))
+        lines = [f"{'phase':24} {'calls':>6} {'total s':>9} {'mean ms':>9} {'items':>11} {'ns/item':>9} {'share':>6}"]
+        for phase, row in rows:
+            lines.append(f"{phase:24} {row['calls']:6} {row['seconds']:9.3f} {row['mean_ms']:9.3f} "
+                         f"{row['items']:11} {row['ns_per_item']:9.1f} {row['share']:6.1%}")
+        return "\n".join(lines)
+
+    def chrome_trace(self, path):
+        """Write the spans in Chrome trace format (chrome://tracing, Perfetto)."""
+        origin = min((start for _, _, start, _, _ in self.spans), default=0)
+        events = [
+            {"name": phase, "ph": "X", "pid": 1, "tid": 1,
+             "ts": (start - origin) / 1e3, "dur": duration / 1e3,
+             "args": {"day": day, "items": items}}
+            for day, phase, start, duration, items in self.spans
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-phase timing of simulate_day")
+    parser.add_argument("--backend", choices=["objects", "arrays"], default="objects")
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", help="write a Chrome trace JSON file")
+    args = parser.parse_args(argv)
+
+    profiler = PhaseProfiler()
+    if args.backend == "objects":
+        from simulation import Simulation
+        sim = Simulation({"size": args.size}, seed=args.seed, profiler=profiler)
+        for _ in range(args.days):
+            sim.step()
+    else:
+        import population_arrays
+        pop = population_arrays.PopulationArrays.random(args.size, seed=args.seed)
+        food, satisfaction = 0, 50
+        couples = population_arrays.form_couples(pop)
+        satisfaction_prev = satisfaction
+        for day in range(1, args.days + 1):
+            pop, food, satisfaction, *_, couples = population_arrays.simulate_day(
+                pop, food, satisfaction, day, satisfaction_prev, couples, profiler=profiler)
+            satisfaction_prev = satisfaction
+
+    print(f"=== {args.backend}: {args.size} residents, {args.days} days ===")
+    print(profiler.report())
+    if args.trace:
+        profiler.chrome_trace(args.trace)
+        print(f"Trace written to {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Multi-region world: several Simulations (each with its own population, food
+stock and satisfaction) laid out on a grid of 1720x860 tiles, one worker
+process per region.
+
+Every day each region first receives, in bulk, the migrants sent to it and
+the infected residents standing within contact_radius of its borders in the
+neighbouring tiles ("ghosts", who may infect across the border), then runs
+simulate_day, then sends its own migrants and ghosts. A one-region world with
+the same seed is exactly Simulation(config, seed).
+
+    python regions.py --regions 8 --cols 4 --size 2000 --days 100 --migration 0.002
+"""
+import argparse
+import math
+from multiprocessing import get_context
+
+import numpy as np
+
+import rng as streams
+from checkpoint import pack_residents, unpack_residents
+from config import as_config, parse_override
+from contacts import make_contacts
+from events import TRANSMISSION
+from habitant import HEALTHY, INFECT
+from movement import WIDTH, HEIGHT
+from simulation import Simulation, METRICS
+
+ID_STRIDE = 1 << 40  # region k numbers its residents from k * ID_STRIDE
+SIDES = {"left": (-1, 0), "right": (1, 0), "up": (0, -1), "down": (0, 1)}
+
+
+# --- Layout ---
+def neighbours(k, n_regions, cols):
+    """Returns: {side: region index} of the tiles sharing a border with tile k."""
+    x, y = k % cols, k // cols
+    found = {}
+    for side, (dx, dy) in SIDES.items():
+        nx, ny = x + dx, y + dy
+        j = ny * cols + nx
+        if 0 <= nx < cols and ny >= 0 and j < n_regions:
+            found[side] = j
+    return found
+
+
+# --- One region ---
+class RegionWorker:
+    """
+    One region: a Simulation plus the daily exchange with its neighbours.
+    Runs in its own process (see _serve) or in-process when processes are off.
+    """
+
+    def __init__(self, k, n_regions, cols, config, seed, migration_rate):
+        self.k = k
+        self.neighbours = neighbours(k, n_regions, cols)
+        self.migration_rate = migration_rate
+        self.sim = Simulation(config, seed=seed, first_id=k * ID_STRIDE)
+
+    def step(self, migrants, ghosts):
+        """
+        Run one day of the region.
+
+        Arguments: migrants (list of column dicts), ghosts (list of (ids, x, y) arrays),
+        both in this region's coordinates
+        Returns: metrics, {region: migrant columns}, {region: (ids, x, y)}
+        """
+        sim = self.sim
+        for columns in migrants:
+            self.settle(columns)
+        ids = np.concatenate([g[0] for g in ghosts]) if ghosts else np.zeros(0, np.int64)
+        infected_across = 0
+
+        def border():
+            nonlocal infected_across
+            xs = np.concatenate([g[1] for g in ghosts])
+            ys = np.concatenate([g[2] for g in ghosts])
+            infected_across = infect_from_border(sim, ids, xs, ys)
+
+        metrics = sim.step(border if len(ids) else None)
+        metrics["infected_across"] = infected_across
+        out_migrants = self.emigrate(sim.day - 1)
+        metrics["emigrants"] = sum(len(c["id"]) for c in out_migrants.values())
+        return metrics, out_migrants, self.border_ghosts()
+
+    def settle(self, columns):
+        """Add migrants; their ids come from other regions and must not move our id counter."""
+        population = self.sim.population
+        next_id = population._next_id
+        population.extend(unpack_residents(columns))
+        population._next_id = next_id
+
+    def emigrate(self, day):
+        """Single, non-hospitalized adults leave with probability migration_rate, to a random neighbour."""
+        if not self.migration_rate or not self.neighbours:
+            return {}
+        population, rng = self.sim.population, self.sim.rng
+        candidates = [r for r in population if r.partner is None and not r.at_hospital and r.age >= 15]
+        if not candidates:
+            return {}
+        ids = [r.id for r in candidates]
+        leave = rng.uniform(streams.MIGRATION, day, ids, 0) < self.migration_rate
+        sides = list(self.neighbours.values())
+        where = (rng.uniform(streams.MIGRATION, day, ids, 1) * len(sides)).astype(np.int64)
+        by_region = {}
+        for r, go, side in zip(candidates, leave.tolist(), where.tolist()):
+            if go:
+                by_region.setdefault(sides[side], []).append(r)
+        for residents in by_region.values():
+            for r in residents:
+                population.remove(r)
+        return {j: pack_residents(residents) for j, residents in by_region.items()}
+
+    def border_ghosts(self):
+        """Infected residents within contact_radius of a shared border, in each neighbour's coordinates."""
+        radius = self.sim.config.contact_radius
+        infected = self.sim.population.select("state", INFECT)
+        if not infected or not self.neighbours:
+            return {}
+        ids = np.fromiter((r.id for r in infected), np.int64, len(infected))
+        x = np.fromiter((r.x for r in infected), np.int64, len(infected))
+        y = np.fromiter((r.y for r in infected), np.int64, len(infected))
+        near = {"left": x < radius, "right": x >= WIDTH - radius, "up": y < radius, "down": y >= HEIGHT - radius}
+        ghosts = {}
+        for side, j in self.neighbours.items():
+            dx, dy = SIDES[side]
+            mask = near[side]
+            if mask.any():
+                ghosts[j] = (ids[mask], x[mask] - dx * WIDTH, y[mask] - dy * HEIGHT)
+        return ghosts
+
+
+def infect_from_border(sim, ids, xs, ys):
+    """
+    Healthy residents closer than contact_radius to a ghost may catch the virus
+    (pair draws on the transmission stream, slot 1; the first ghost in order wins).
+    Run by Simulation.step before the first phase of the day (see RegionWorker.step),
+    so the TRANSMISSION events fall in that day's event window.
+
+    Returns: number of new infections
+    """
+    population, config = sim.population, sim.config
+    targets = population.select("state", HEALTHY)
+    contacts = make_contacts(config.contacts, config.contact_radius)
+    contacts.build(targets)
+    chosen = {}
+    for ghost, x, y in zip(ids.tolist(), xs.tolist(), ys.tolist()):
+        near = contacts.query(x, y)
+        if not near:
+            continue
+        draws = sim.rng.uniform(streams.TRANSMISSION, sim.day, [targets[j].id for j in near], 1, other=ghost)
+        for j, u in zip(near, draws.tolist()):
+            if j not in chosen and u < config.transmission_prob:
+                chosen[j] = (ghost, x, y)
+    for j in sorted(chosen):
+        r = targets[j]
+        r.state_code = INFECT
+        r.days_infected = 1
+        sim.events.record(TRANSMISSION, r, source=chosen[j][0])
+    if sim.events.tree is not None and chosen:
+        rows = [(chosen[j][0], targets[j].id, math.hypot(targets[j].x - chosen[j][1], targets[j].y - chosen[j][2]))
+                for j in sorted(chosen)]
+        sim.events.tree.record(sim.day, *zip(*rows))
+    return len(chosen)
+
+
+def _serve(conn, args):
+    """Worker process: build the region, then answer one "step" request per day."""
+    worker = RegionWorker(*args)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        conn.send(worker.step(*message))
+    conn.close()
+
+
+# --- World ---
+class World:
+    """
+    Regions on a grid `cols` tiles wide, stepped day by day in lock-step.
+
+    Arguments: regions (list of config overrides / SimulationConfig, one per region),
+    cols, seed (region k uses seed + k), migration_rate (per single adult per day),
+    processes (one worker process per region; False runs them in this process)
+    """
+
+    def __init__(self, regions, cols=None, seed=0, migration_rate=0.0, processes=True):
+        self.n = len(regions)
+        self.cols = cols or self.n
+        self.day = 1
+        args = [(k, self.n, self.cols, as_config(config), seed + k, migration_rate)
+                for k, config in enumerate(regions)]
+        self.inbox = [([], []) for _ in range(self.n)]
+        self.workers, self.conns, self.processes = [], [], []
+        if processes:
+            ctx = get_context("spawn")
+            for job in args:
+                parent, child = ctx.Pipe()
+                proc = ctx.Process(target=_serve, args=(child, job), daemon=True)
+                proc.start()
+                self.conns.append(parent)
+                self.processes.append(proc)
+        else:
+            self.workers = [RegionWorker(*job) for job in args]
+
+    def step(self):
+        """
+        Run one day in every region, then route migrants and ghosts.
+
+        Returns: list of per-region metrics (METRICS + infected_across, emigrants)
+        """
+        if self.conns:
+            for conn, message in zip(self.conns, self.inbox):
+                conn.send(message)
+            results = [conn.recv() for conn in self.conns]
+        else:
+            results = [worker.step(*message) for worker, message in zip(self.workers, self.inbox)]
+        self.inbox = [([], []) for _ in range(self.n)]
+        for _, migrants, ghosts in results:
+            for j, columns in migrants.items():
+                self.inbox[j][0].append(columns)
+            for j, points in ghosts.items():
+                self.inbox[j][1].append(points)
+        self.day += 1
+        return [metrics for metrics, _, _ in results]
+
+    def run(self, days):
+        """Returns: {metric: [world total per day]} and the per-region rows of every day."""
+        rows = [self.step() for _ in range(days)]
+        totals = {metric: [sum(region[metric] for region in day) for day in rows]
+                  for metric in METRICS + ("infected_across", "emigrants")}
+        return totals, rows
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(None)
+        for proc in self.processes:
+            proc.join()
+        self.conns, self.processes = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-region simulation, one process per region")
+    parser.add_argument("--regions", type=int, default=4)
+    parser.add_argument("--cols", type=int, default=None, help="tiles per row (default: all in one row)")
+    parser.add_argument("--size", type=int, default=1000, help="initial residents per region")
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--migration", type=float, default=0.001)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--in-process", action="store_true", help="no worker processes")
+    args = parser.parse_args(argv)
+
+    overrides = dict(parse_override(t) for t in args.set)
+    overrides["size"] = args.size
+    with World([overrides] * args.regions, args.cols, args.seed, args.migration,
+               processes=not args.in_process) as world:
+        totals, _ = world.run(args.days)
+    print(f"{args.regions} regions x {args.days} days: final population {totals['population'][-1]} | "
+          f"peak infected {max(totals['infected'])} | migrants {sum(totals['emigrants'])} | "
+          f"cross-border infections {sum(totals['infected_across'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import pygame
+
+from habitant import INFECT, FARMER as JOB_FARMER, DOCTOR as JOB_DOCTOR, WORKER as JOB_WORKER, \
+    JOBLESS as JOB_JOBLESS
+
+# --- Colour codes (one per legend entry) ---
+INFECTED, FARMER, DOCTOR, WORKER, JOBLESS, CHILD = range(6)
+LEGEND = [
+    ("Infected",   (220, 20, 60)),     # red
+    ("Farmer",     (255, 215, 0)),     # yellow
+    ("Doctor",     (34, 139, 34)),     # green
+    ("Worker",     (65, 105, 225)),    # blue
+    ("Jobless",    (128, 128, 128)),   # gray
+    ("Child",      (255, 140, 0)),     # orange
+]
+PALETTE = [color for _, color in LEGEND]
+JOB_COLORS = {JOB_FARMER: FARMER, JOB_DOCTOR: DOCTOR, JOB_WORKER: WORKER, JOB_JOBLESS: JOBLESS}
+HALO_COLOR = (255, 160, 160)
+
+LEGEND_W, LEGEND_H = 260, 200
+
+
+def color_code(r):
+    """Colour code of a resident: infected first, then by job (children = orange)."""
+    if r.state_code == INFECT:
+        return INFECTED
+    return JOB_COLORS.get(r.job_code, CHILD)
+
+
+def radius_of(age):
+    """Radius by age bucket (tiny stylistic cue)."""
+    return 3 if age < 12 else 5 if age < 60 else 4
+
+
+def background_color(y):
+    """Cyan/blue gradient colour of screen row y."""
+    r = 100 + (y // 15) * 1
+    g = 150 - (y // 20) * 2
+    b = 255 - (y // 10) * 1
+    return min(150, max(100, r)), min(150, max(50, g)), min(255, max(50, b))
+
+
+# --- Renderer ---
+class PopulationRenderer:
+    """
+    Draws the population on a screen.
+    The gradient background and the legend are rendered once; each
+    (colour, radius, halo) dot is pre-drawn on a small sprite, and a frame is
+    one background blit plus a single Surface.blits batch.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        width, height = screen.get_size()
+        self.legend_pos = (width - LEGEND_W - 20, height - LEGEND_H - 20)
+        self.legend_rect = pygame.Rect(*self.legend_pos, LEGEND_W, LEGEND_H)
+        self.background = self._make_background(width, height)
+        self.legend = self._make_legend()
+        self.sprites = {}  # (code, radius) -> (surface, offset)
+
+    @staticmethod
+    def _make_background(width, height):
+        surf = pygame.Surface((width, height))
+        for y in range(height):
+            pygame.draw.line(surf, background_color(y), (0, y), (width, y))
+        return surf
+
+    @staticmethod
+    def _make_legend():
+        font = pygame.font.SysFont("Segoe UI", 20, bold=True)
+        surf = pygame.Surface((LEGEND_W, LEGEND_H), pygame.SRCALPHA)
+        surf.fill((0, 120, 180, 180))  # semi-transparent cyan/blue
+        y = 10
+        for text, col in LEGEND:
+            pygame.draw.circle(surf, col, (15, y + 10), 8)
+            surf.blit(font.render(text, True, (240, 240, 255)), (35, y))
+            y += 30
+        return surf
+
+    def sprite(self, code, radius):
+        """Pre-drawn dot: halo (infected only), black outline, colour fill."""
+        key = (code, radius)
+        if key not in self.sprites:
+            reach = radius + 4
+            surf = pygame.Surface((2 * reach + 1, 2 * reach + 1), pygame.SRCALPHA)
+            center = (reach, reach)
+            if code == INFECTED:
+                pygame.draw.circle(surf, HALO_COLOR, center, radius + 4)
+            pygame.draw.circle(surf, (0, 0, 0), center, radius + 1)
+            pygame.draw.circle(surf, PALETTE[code], center, radius)
+            self.sprites[key] = (surf, reach)
+        return self.sprites[key]
+
+    def draw_points(self, xs, ys, codes, radii):
+        """
+        Draw residents given as parallel sequences (x, y, colour code, radius).
+
+        Arguments: xs, ys, codes, radii
+        """
+        left, top, right, bottom = (self.legend_rect.left, self.legend_rect.top,
+                                    self.legend_rect.right, self.legend_rect.bottom)
+        sprites = self.sprites
+        batch = []
+        for x, y, code, radius in zip(xs, ys, codes, radii):
+            # If a resident spawns under the legend, draw it slightly above
+            if left <= x < right and top <= y < bottom:
+                y -= LEGEND_H + 10
+            surf, reach = sprites.get((code, radius)) or self.sprite(code, radius)
+            batch.append((surf, (x - reach, y - reach)))
+
+        self.screen.blit(self.background, (0, 0))
+        self.screen.blits(batch, doreturn=False)
+        self.screen.blit(self.legend, self.legend_pos)
+        pygame.display.flip()
+
+    def draw(self, population):
+        """Draw a population of Habitant objects."""
+        residents = list(population)
+        self.draw_points([r.x for r in residents], [r.y for r in residents],
+                         [color_code(r) for r in residents], [radius_of(r.age) for r in residents])
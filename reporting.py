@@ -0,0 +1,268 @@
+"""
+Progress reporters: what a run shows while it goes, decoupled from simulate_day
+(which prints nothing).
+
+A reporter gets start(info) once, day(report) after every day and end(events)
+at the end of the run. Day reports are built by day_report() from aggregate
+counters only: the population index (or one bincount per column for the array
+backend) and the event log's per-day kind counts, never a scan of the residents.
+
+    make_reporter("silent" | "progress" | "jsonl" | "console" | "dashboard", ...)
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+from events import (DEATH, BIRTH, VISIT, TRANSMISSION, JOB_CHANGE, PERSONA_CHANGE,
+                    CAUSES, INFECTION, STARVATION, NATURAL)
+from habitant import CODES, JOBS, PERSONAS, Population
+
+
+# --- Day reports ---
+def population_counts(population):
+    """
+    Returns: {field: {name: count}} for state, persona and job, plus
+    "population" and "at_hospital", for a Population or a PopulationArrays.
+    """
+    if isinstance(population, Population):
+        index = population.index
+        counts = {field: {name: index.count(field, code) for code, name in enumerate(names)}
+                  for field, names in CODES.items()}
+        counts["at_hospital"] = index.count("at_hospital", True)
+    else:
+        counts = {field: dict(zip(names, np.bincount(getattr(population, field), minlength=len(names)).tolist()))
+                  for field, names in CODES.items()}
+        counts["at_hospital"] = int(population.at_hospital.sum())
+    counts["population"] = len(population)
+    return counts
+
+
+def day_report(day, population, food, satisfaction, couples, events):
+    """
+    Summary of the day that just ended (call after simulate_day).
+
+    Arguments: day, population, food, satisfaction, couples, events (the run's EventLog)
+    Returns: dict of plain numbers (JSON-serializable)
+    """
+    counts = population_counts(population)
+    last = events.last_day
+    return {
+        "day": day,
+        "population": counts["population"],
+        "infected": counts["state"]["infect"],
+        "at_hospital": counts["at_hospital"],
+        "couples": len(couples),
+        "food": float(food),
+        "satisfaction": float(satisfaction),
+        "transmissions": last[TRANSMISSION],
+        "deaths": last[DEATH],
+        "visits": last[VISIT],
+        "births": last[BIRTH],
+        "status_changes": last[JOB_CHANGE] + last[PERSONA_CHANGE],
+        "states": counts["state"],
+        "jobs": counts["job"],
+        "personas": counts["persona"],
+    }
+
+
+def run_totals(events):
+    """Run totals of the event log as a dict of plain numbers."""
+    return {
+        "deaths": events.count(DEATH),
+        "deaths_by_cause": {CAUSES[code]: events.count(DEATH, cause=code) for code in range(len(CAUSES))},
+        "visits": events.count(VISIT),
+        "births": events.count(BIRTH),
+        "transmissions": events.count(TRANSMISSION),
+        "job_changes": events.count(JOB_CHANGE),
+        "persona_changes": events.count(PERSONA_CHANGE),
+    }
+
+
+# --- Reporters ---
+class Reporter:
+    """Base reporter: ignores everything (the silent mode)."""
+
+    def start(self, info):
+        pass
+
+    def day(self, report):
+        pass
+
+    def end(self, events):
+        pass
+
+
+class ProgressReporter(Reporter):
+    """
+    One short line every `every` days, at most once per `min_interval` seconds;
+    lines are buffered and written `flush_lines` at a time.
+    """
+
+    def __init__(self, every: int = 1, min_interval: float = 0.0, flush_lines: int = 50, stream=None):
+        self.every, self.min_interval, self.flush_lines = every, min_interval, flush_lines
+        self.stream = stream or sys.stdout
+        self.lines = []
+        self.last_time = None
+
+    def day(self, report):
+        if report["day"] % self.every:
+            return
+        now = time.monotonic()
+        if self.last_time is not None and now - self.last_time < self.min_interval:
+            return
+        self.last_time = now
+        self.lines.append(f" Day {report['day']:3} → 👥 {report['population']} | 🦠 Infected: {report['infected']}"
+                          f" | ⚰️ Deaths: {report['deaths']} | Transmissions: {report['transmissions']}")
+        if len(self.lines) >= self.flush_lines:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.stream.write("\n".join(self.lines) + "\n")
+            self.stream.flush()
+            self.lines = []
+
+    def end(self, events):
+        self.flush()
+        totals = run_totals(events)
+        self.stream.write(f"Done: {totals['deaths']} deaths, {totals['births']} births, "
+                          f"{totals['transmissions']} transmissions\n")
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per line: {"start": info}, then one per day, then {"totals": ...}."""
+
+    def __init__(self, stream=None, every: int = 1):
+        self.stream = stream or sys.stdout
+        self.every = every
+
+    def start(self, info):
+        self.stream.write(json.dumps({"start": info}) + "\n")
+
+    def day(self, report):
+        if report["day"] % self.every == 0:
+            self.stream.write(json.dumps(report) + "\n")
+
+    def end(self, events):
+        self.stream.write(json.dumps({"totals": run_totals(events)}) + "\n")
+        self.stream.flush()
+
+
+class ConsoleReporter(Reporter):
+    """The classic console output: a line per day, a snapshot block every `snapshot_every` days."""
+
+    def __init__(self, snapshot_every: int = 5, stream=None):
+        self.snapshot_every = snapshot_every
+        self.stream = stream or sys.stdout
+
+    def _print(self, *lines):
+        self.stream.write("\n".join(lines) + "\n")
+
+    def start(self, info):
+        self._print("\n╔════════════════════════════════════════════╗",
+                    " 🎬   SIMULATION STARTED",
+                    f" 💞 Initial couples: {info.get('couples', 0)}",
+                    "╚════════════════════════════════════════════╝\n")
+
+    def day(self, report):
+        if report["day"] % self.snapshot_every:
+            self._print(f" Day {report['day']:3} → 👥 {report['population']} | "
+                        f"🦠 Infected: {report['infected']} | ⚰️ Deaths: {report['deaths']}")
+            return
+        lines = [
+            "════════════════════════════════════════════",
+            f" 📊 DAY {report['day']} - SNAPSHOT",
+            "────────────────────────────────────────────",
+            f" 👥 Pop: {report['population']}   |   💞 Couples: {report['couples']}",
+            f" 🍖 Food: {int(report['food'])}        |   😊 Satisf.: {int(report['satisfaction'])}",
+            "────────────────────────────────────────────",
+            f" 🩺 States : {report['states']}   |   👨‍⚕️ Patients: {report['at_hospital']}",
+            f" 🏭 Jobs   : {report['jobs']}",
+            f" 💡 Persona: {report['personas']}",
+            "────────────────────────────────────────────",
+        ]
+        if report["deaths"]:
+            lines.append(f" ⚰️ Deaths today: {report['deaths']}")
+        if report["visits"]:
+            lines.append(f" 🩺 Doctor visits: {report['visits']}")
+        if report["status_changes"]:
+            lines.append(f" 🔄 Status changes: {report['status_changes']}")
+        lines.append(f" 👶 Births: {report['births']}" if report["births"] else " 😔 No births")
+        lines.append("════════════════════════════════════════════\n")
+        self._print(*lines)
+
+    def end(self, events):
+        lines = ["\n🏁 END OF SIMULATION",
+                 "--- Final Report ---",
+                 f"⚰️ Total deaths: {events.count(DEATH)}",
+                 "📊 Causes of death:"]
+        for code in (INFECTION, STARVATION, NATURAL):
+            lines.append(f"   - {CAUSES[code]}: {events.count(DEATH, cause=code)}")
+        lines.append(f"🩺 Doctor visits: {events.count(VISIT)}")
+        lines.append("🔄 Conversions:")
+        for (kind, old, new, _), count in sorted(events.totals.items()):
+            names = JOBS if kind == JOB_CHANGE else PERSONAS if kind == PERSONA_CHANGE else None
+            if names:
+                lines.append(f"   - {names[old].capitalize()} -> {names[new].capitalize()}: {count}")
+        lines.append(f"👶 Total births: {events.count(BIRTH)}")
+        self._print(*lines)
+        self.stream.flush()
+
+
+class DashboardReporter(Reporter):
+    """Live terminal dashboard redrawn in place (needs rich), at most `refresh` times per second."""
+
+    def __init__(self, refresh: float = 4.0, stream=None):
+        try:
+            from rich.console import Console
+            from rich.live import Live
+            from rich.table import Table
+        except ImportError:
+            raise ImportError("rich is required for the dashboard reporter (pip install rich), "
+                              "or use the progress reporter") from None
+        self.stream = stream or sys.stdout
+        self.Table = Table
+        self.live = Live(Table(), console=Console(file=self.stream), refresh_per_second=refresh)
+        self.peak_infected = 0
+
+    def start(self, info):
+        self.live.start()
+
+    def day(self, report):
+        self.peak_infected = max(self.peak_infected, report["infected"])
+        table = self.Table(title=f"Day {report['day']}")
+        table.add_column("metric")
+        table.add_column("value", justify="right")
+        for name in ("population", "infected", "at_hospital", "couples", "food", "satisfaction",
+                     "transmissions", "deaths", "visits", "births", "status_changes"):
+            value = report[name]
+            table.add_row(name, f"{value:.0f}" if isinstance(value, float) else str(value))
+        table.add_row("peak infected", str(self.peak_infected))
+        for field in ("jobs", "personas"):
+            table.add_row(field, " ".join(f"{k}={v}" for k, v in report[field].items()))
+        self.live.update(table)
+
+    def end(self, events):
+        self.live.stop()
+        totals = run_totals(events)
+        self.stream.write(f"Done: {totals['deaths']} deaths, {totals['births']} births, "
+                          f"{totals['transmissions']} transmissions\n")
+        self.stream.flush()
+
+
+REPORTERS = {
+    "silent": Reporter,
+    "progress": ProgressReporter,
+    "jsonl": JsonLinesReporter,
+    "console": ConsoleReporter,
+    "dashboard": DashboardReporter,
+}
+
+
+def make_reporter(mode, **options):
+    """Reporter by name (see REPORTERS); options go to its constructor."""
+    if mode not in REPORTERS:
+        raise ValueError(f"Unknown reporter: {mode!r} (expected one of {', '.join(REPORTERS)})")
+    return REPORTERS[mode](**options)
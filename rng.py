@@ -0,0 +1,90 @@
+"""
+Counter-based random numbers.
+
+Every draw is a pure function of (seed, phase, day, slot, resident id[, second id]):
+the per-phase keys come from SeedSequence(seed).spawn(), and the rest is
+hashed with the SplitMix64 finalizer. Nothing depends on call order, so a
+phase gives the same result whether it loops over residents (habitant.py),
+runs vectorized (population_arrays.py) or is split in chunks, and draws are
+generated in batches instead of one random() call at a time.
+"""
+from bisect import bisect
+from itertools import accumulate
+
+import numpy as np
+
+# --- Streams (one per phase of the day) ---
+PHASES = ("spawn", "couples", "births", "deaths", "status", "transmission", "doctor", "movement", "migration",
+          "network")
+SPAWN, COUPLES, BIRTHS, DEATHS, STATUS, TRANSMISSION, DOCTOR, MOVEMENT, MIGRATION, NETWORK = range(len(PHASES))
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_M1, _M2 = 0xBF58476D1CE4E5B9, 0x94D049BB133111EB
+
+
+def _mix_int(z):
+    """SplitMix64 finalizer on a Python int."""
+    z = ((z ^ (z >> 30)) * _M1) & _MASK
+    z = ((z ^ (z >> 27)) * _M2) & _MASK
+    return z ^ (z >> 31)
+
+
+def _mix(z):
+    """SplitMix64 finalizer on a uint64 array (products wrap modulo 2**64)."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_M1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_M2)
+    return z ^ (z >> np.uint64(31))
+
+
+class CounterRNG:
+    """
+    Keyed random numbers for one run.
+
+    uniform(phase, day, ids, slot) returns one U[0, 1) per id; `slot`
+    separates several draws made for the same resident in the same phase.
+    """
+
+    def __init__(self, seed=None):
+        self.seed_seq = np.random.SeedSequence(seed)
+        self.seed = self.seed_seq.entropy
+        self.keys = [int(child.generate_state(1, np.uint64)[0])
+                     for child in self.seed_seq.spawn(len(PHASES))]
+
+    def __getstate__(self):
+        return {"seed": self.seed}
+
+    def __setstate__(self, state):
+        self.__init__(state["seed"])
+
+    def uniform(self, phase, day, ids, slot=0, other=None):
+        """
+        Arguments: phase (index in PHASES), day, ids (sequence of resident ids),
+        slot, other (optional second id per draw, or one id for all, for pairs)
+        Returns: float64 array, one value per id
+        """
+        base = _mix_int(self.keys[phase] ^ _mix_int(((day << 8 | slot) + _GOLDEN) & _MASK))
+        h = _mix(np.asarray(ids, dtype=np.int64).astype(np.uint64).reshape(-1) ^ np.uint64(base))
+        if other is not None:
+            other = np.asarray(other, dtype=np.int64).astype(np.uint64).reshape(-1)
+            h = _mix(h ^ (other * np.uint64(_GOLDEN)))
+        return (h >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+def categorical(u, draw):
+    """
+    Map uniforms to codes with the same rule as random.choices.
+
+    Arguments: u (array of U[0, 1)), draw ((codes, weights) table)
+    Returns: int8 array of codes
+    """
+    codes, weights = draw
+    cum = np.cumsum(weights, dtype=float)
+    return np.asarray(codes, dtype=np.int8)[np.searchsorted(cum, u * cum[-1], side="right")]
+
+
+def pick(u, draw):
+    """categorical() for a single uniform, in plain Python."""
+    codes, weights = draw
+    cum = list(accumulate(weights))
+    return codes[bisect(cum, u * float(cum[-1]))]
@@ -0,0 +1,84 @@
+from config import as_config
+from contacts import make_contacts
+from events import EventLog, NATURAL, STARVATION, INFECTION
+from habitant import INFECT, Population, form_couples, simulate_day
+from reporting import day_report
+from rng import CounterRNG
+
+# --- Per-day aggregates recorded by Simulation.step ---
+METRICS = (
+    "population", "infected", "hospitalized", "couples", "food", "satisfaction",
+    "births", "visits", "status_changes",
+    "deaths_infection", "deaths_starvation", "deaths_natural",
+)
+
+
+class Simulation:
+    """
+    Whole state of one run (what final_test.main keeps in local variables),
+    advanced one day at a time without any display.
+    """
+
+    def __init__(self, config=None, seed=None, contacts=None, events=None, profiler=None,
+                 reporter=None, first_id=0):
+        """
+        Arguments: config (SimulationConfig or dict of overrides), seed (of the run's
+        rng.CounterRNG; None = fresh entropy),
+        contacts (engine instance, default: built from config.contacts),
+        events (events.EventLog, e.g. with a file sink; default: totals only),
+        profiler (profiling.PhaseProfiler, off by default),
+        reporter (reporting.Reporter given a day_report after each step; None = quiet),
+        first_id (id of the first resident; regions.py keeps ids unique across regions)
+        """
+        self.config = as_config(config)
+        self.rng = CounterRNG(seed)
+        self.population = Population()
+        self.population._next_id = first_id
+        self.population.spawn(self.config.size, 25, self.rng)
+        self.food = self.config.food
+        self.satisfaction = self.config.satisfaction
+        self.satisfaction_prev = self.satisfaction
+        self.couples = form_couples(self.population, [], self.rng)
+        self.contacts = contacts or make_contacts(self.config.contacts, self.config.contact_radius)
+        self.events = events if events is not None else EventLog()  # an empty log is falsy
+        if self.events.tree is not None:
+            self.events.tree.seed([r.id for r in self.population.select("state", INFECT)], day=0)
+        self.profiler = profiler
+        self.reporter = reporter
+        self.day = 1
+
+    def step(self, before_day=None):
+        """
+        Run one day.
+
+        Arguments: before_day (optional callable run inside the day's event window,
+        before the first phase; see habitant.simulate_day)
+        Returns: dict with one value per name in METRICS
+        """
+        (self.population, self.food, self.satisfaction, deaths_today,
+         visits_today, status_changes, births, self.couples) = simulate_day(
+            self.population, self.food, self.satisfaction, self.day,
+            self.satisfaction_prev, self.couples, self.contacts, self.config, self.events, self.rng,
+            self.profiler, before_day
+        )
+        self.satisfaction_prev = self.satisfaction
+        if self.reporter is not None:
+            self.reporter.day(day_report(self.day, self.population, self.food, self.satisfaction,
+                                         self.couples, self.events))
+        self.day += 1
+
+        causes = deaths_today.cause
+        return {
+            "population": len(self.population),
+            "infected": self.population.count("state", "infect"),
+            "hospitalized": self.population.count("at_hospital", True),
+            "couples": len(self.couples),
+            "food": self.food,
+            "satisfaction": self.satisfaction,
+            "births": len(births),
+            "visits": len(visits_today),
+            "status_changes": len(status_changes),
+            "deaths_infection": int((causes == INFECTION).sum()),
+            "deaths_starvation": int((causes == STARVATION).sum()),
+            "deaths_natural": int((causes == NATURAL).sum()),
+        }
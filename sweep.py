@@ -0,0 +1,175 @@
+"""
+Parameter sweeps over config.SimulationConfig, resumable through an on-disk cache.
+
+    python sweep.py --grid job_action.doctor=2,3,5 --grid health_ttl_by_persona.weak=2,3,4 \\
+                    --seeds 4 --days 150 --out sweep.csv
+    python sweep.py --lhs transmission_prob=0.2:0.6 --lhs job_action.doctor=1:6 --samples 20
+
+Grid axes and latin-hypercube ranges can be combined (every LHS point is run at every grid point).
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+from multiprocessing import Pool
+
+from batch import run_simulation
+from config import DEFAULT_CONFIG, parse_override
+
+
+# --- Designs ---
+def grid_design(space):
+    """
+    Full factorial design.
+
+    Arguments: space ({key: [values]})
+    Returns: list of override dicts
+    """
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def latin_hypercube(space, samples, seed=0):
+    """
+    Latin-hypercube design: each range is cut into `samples` strata and every
+    stratum is used exactly once per parameter. Integer bounds give integers.
+
+    Arguments: space ({key: (low, high)}), samples, seed
+    Returns: list of override dicts
+    """
+    rng = random.Random(seed)
+    columns = {}
+    for key, (low, high) in space.items():
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        values = [low + (s + rng.random()) / samples * (high - low) for s in strata]
+        if isinstance(low, int) and isinstance(high, int):
+            values = [int(round(v)) for v in values]
+        columns[key] = values
+    return [{key: columns[key][i] for key in space} for i in range(samples)]
+
+
+# --- Run summaries (one row per (config, seed)) ---
+def summarize_run(result):
+    """Reduce the per-day series of run_simulation to scalar outcomes."""
+    return {
+        "final_population": result["population"][-1],
+        "peak_infected": max(result["infected"]),
+        "final_food": result["food"][-1],
+        "mean_satisfaction": sum(result["satisfaction"]) / len(result["satisfaction"]),
+        "births": sum(result["births"]),
+        "deaths_infection": sum(result["deaths_infection"]),
+        "deaths_starvation": sum(result["deaths_starvation"]),
+        "deaths_natural": sum(result["deaths_natural"]),
+    }
+
+
+def _run_key(config, seed, days):
+    return f"{config.key()}-s{seed}-d{days}"
+
+
+def _run_job(job):
+    key, config, seed, days = job
+    return key, summarize_run(run_simulation(config, seed, days))
+
+
+def run_sweep(design, seeds, days, base_config=DEFAULT_CONFIG, cache_dir=".sweep_cache",
+              processes=None, out=None, stream=None):
+    """
+    Run every (design point, seed) pair, skipping those already in `cache_dir`.
+    Each finished run is written to the cache as soon as it completes, so an
+    interrupted sweep resumes where it stopped.
+
+    Arguments: design (list of override dicts), seeds (list), days, base_config,
+    cache_dir, processes (None = all cores), out (CSV path or None),
+    stream (file for progress lines, None = quiet)
+    Returns: columns ({column: [values]}, one entry per run)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    runs = []
+    for point in design:
+        config = base_config.with_overrides(point)
+        for seed in seeds:
+            runs.append((point, seed, _run_key(config, seed, days), config))
+
+    todo = [(key, config, seed, days) for _, seed, key, config in runs
+            if not os.path.exists(os.path.join(cache_dir, key + ".json"))]
+    if stream:
+        stream.write(f"{len(runs)} runs, {len(runs) - len(todo)} cached, {len(todo)} to do\n")
+
+    if todo:
+        with Pool(processes) as pool:
+            for done, (key, summary) in enumerate(pool.imap_unordered(_run_job, todo), 1):
+                path = os.path.join(cache_dir, key + ".json")
+                with open(path + ".tmp", "w") as f:
+                    json.dump(summary, f)
+                os.replace(path + ".tmp", path)
+                if stream:
+                    stream.write(f"  [{done}/{len(todo)}] {key}\n")
+                    stream.flush()
+
+    params = sorted({k for point, *_ in runs for k in point})
+    columns = {name: [] for name in ["run", "seed", *params]}
+    for point, seed, key, _ in runs:
+        with open(os.path.join(cache_dir, key + ".json")) as f:
+            summary = json.load(f)
+        columns["run"].append(key)
+        columns["seed"].append(seed)
+        for name in params:
+            columns[name].append(point.get(name))
+        for name, value in summary.items():
+            columns.setdefault(name, []).append(value)
+
+    if out:
+        write_table(columns, out)
+    return columns
+
+
+def write_table(columns, path):
+    """Write {column: [values]} as CSV."""
+    names = list(columns)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(zip(*(columns[n] for n in names)))
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parameter sweep of the virus simulation")
+    parser.add_argument("--grid", action="append", default=[], metavar="KEY=V1,V2,...",
+                        help="grid axis, e.g. job_action.doctor=2,3,5")
+    parser.add_argument("--lhs", action="append", default=[], metavar="KEY=LOW:HIGH",
+                        help="latin-hypercube range, e.g. transmission_prob=0.2:0.6")
+    parser.add_argument("--samples", type=int, default=10, help="latin-hypercube points")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="fixed override applied to every run")
+    parser.add_argument("--seeds", type=int, default=4, help="replicates per design point")
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--cache", default=".sweep_cache")
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args(argv)
+
+    base = DEFAULT_CONFIG.with_overrides(dict(parse_override(t) for t in args.set))
+    grid = {}
+    for text in args.grid:
+        key, _, values = text.partition("=")
+        grid[key] = [parse_override(f"{key}={v}")[1] for v in values.split(",")]
+    ranges = {}
+    for text in args.lhs:
+        key, _, bounds = text.partition("=")
+        ranges[key] = tuple(json.loads(b) for b in bounds.split(":"))
+    lhs = latin_hypercube(ranges, args.samples) if ranges else [{}]
+    design = [{**g, **h} for g in grid_design(grid) for h in lhs]
+
+    run_sweep(design, list(range(args.seeds)), args.days, base, args.cache, args.processes, args.out,
+              stream=sys.stdout)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
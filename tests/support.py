@@ -0,0 +1,53 @@
+"""Helpers shared by the tests: the same run on both backends, day by day."""
+import numpy as np
+
+import habitant
+import population_arrays
+from checkpoint import pack_population
+from config import as_config
+from events import EventLog
+from rng import CounterRNG
+
+COMPARED_COLUMNS = ("id", "state", "persona", "job", "age", "days_infected", "at_hospital",
+                    "hospital_days", "food_deficit", "days_hungry", "x", "y")
+
+
+def run_objects(config, seed, size, days):
+    """Returns: per-day tuples, final Population, couples, EventLog"""
+    config = as_config(config)
+    rng = CounterRNG(seed)
+    pop = habitant.Population()
+    pop.spawn(size, 25, rng)
+    couples = habitant.form_couples(pop, [], rng)
+    food, satisfaction, events, rows = config.food, config.satisfaction, EventLog(), []
+    satisfaction_prev = satisfaction
+    for day in range(1, days + 1):
+        pop, food, satisfaction, deaths, visits, changes, births, couples = habitant.simulate_day(
+            pop, food, satisfaction, day, satisfaction_prev, couples, None, config, events, rng)
+        satisfaction_prev = satisfaction
+        rows.append((day, len(pop), food, satisfaction, len(deaths), len(visits), len(changes), len(births),
+                     pop.count("state", habitant.INFECT), pop.count("at_hospital", True)))
+    return rows, pop, couples, events
+
+
+def run_arrays(config, seed, size, days):
+    """Returns: per-day tuples, final PopulationArrays, couples, EventLog"""
+    config = as_config(config)
+    pop = population_arrays.PopulationArrays.random(size, 25, seed)
+    couples = population_arrays.form_couples(pop)
+    food, satisfaction, events, rows = config.food, config.satisfaction, EventLog(), []
+    satisfaction_prev = satisfaction
+    for day in range(1, days + 1):
+        pop, food, satisfaction, deaths, visits, changes, births, couples = population_arrays.simulate_day(
+            pop, food, satisfaction, day, satisfaction_prev, couples, config, events)
+        satisfaction_prev = satisfaction
+        rows.append((day, len(pop), food, satisfaction, len(deaths), len(visits), len(changes), len(births),
+                     int((pop.state == habitant.INFECT).sum()), int(pop.at_hospital.sum())))
+    return rows, pop, couples, events
+
+
+def assert_same_residents(population, pop):
+    """Every compared column of a Population equals that of a PopulationArrays."""
+    columns = pack_population(population, [])
+    for name in COMPARED_COLUMNS:
+        np.testing.assert_array_equal(columns[name], np.asarray(getattr(pop, name)), err_msg=name)
@@ -0,0 +1,86 @@
+"""A run resumed from a snapshot is the run that was never interrupted."""
+import numpy as np
+import pytest
+
+from checkpoint import load_checkpoint, pack_population, restore, save_checkpoint, snapshot
+from config import as_config
+from events import EventLog
+from simulation import Simulation
+from transmission_tree import TransmissionTree
+
+CONFIGS = [
+    {"size": 300},
+    {"size": 300, "movement": "random_walk"},
+    {"size": 300, "contact_model": "network", "transmission_prob": 0.1},  # lives past the snapshot
+    {"size": 300, "triage": "urgency", "hospital_beds": 8},
+]
+
+
+def _assert_same_state(a, b):
+    columns_a, columns_b = pack_population(a.population, a.couples), pack_population(b.population, b.couples)
+    assert columns_a.keys() == columns_b.keys()
+    for name in columns_a:
+        np.testing.assert_array_equal(columns_a[name], columns_b[name], err_msg=name)
+    assert (a.day, a.food, a.satisfaction) == (b.day, b.food, b.satisfaction)
+    assert a.events.totals == b.events.totals
+
+
+@pytest.mark.parametrize("overrides", CONFIGS, ids=lambda o: ",".join(f"{k}={v}" for k, v in o.items()))
+def test_resume_matches_uninterrupted_run(overrides):
+    reference = Simulation(overrides, seed=5)
+    expected = [reference.step() for _ in range(80)]
+
+    sim = Simulation(overrides, seed=5)
+    rows = [sim.step() for _ in range(35)]
+    data = snapshot(sim)
+    for _ in range(10):  # days thrown away: restoring must not see them
+        sim.step()
+    sim = restore(data)
+    rows += [sim.step() for _ in range(45)]
+
+    assert rows == expected
+    _assert_same_state(reference, sim)
+
+
+def test_checkpoint_file_round_trip(tmp_path):
+    overrides = {"size": 300, "contact_model": "network", "transmission_prob": 0.1, "triage": "urgency",
+                 "hospital_beds": 8}
+    reference = Simulation(overrides, seed=9)
+    expected = [reference.step() for _ in range(50)]
+
+    sim = Simulation(overrides, seed=9)
+    rows = [sim.step() for _ in range(20)]
+    save_checkpoint(sim, str(tmp_path / "day-0020.npz"))
+    sim = load_checkpoint(str(tmp_path / "day-0020.npz"))
+    rows += [sim.step() for _ in range(30)]
+
+    assert rows == expected
+    _assert_same_state(reference, sim)
+
+
+def test_resume_keeps_the_transmission_tree():
+    config = as_config({"size": 300})
+    reference = Simulation(config, seed=5, events=EventLog(tree=TransmissionTree(config=config)))
+    for _ in range(80):
+        reference.step()
+
+    sim = Simulation(config, seed=5, events=EventLog(tree=TransmissionTree(config=config)))
+    for _ in range(35):
+        sim.step()
+    sim = restore(snapshot(sim))
+    for _ in range(45):
+        sim.step()
+
+    expected, tree = reference.events.tree, sim.events.tree
+    assert tree.reproduction() == expected.reproduction()
+    assert tree.summary() == expected.summary()
+    assert tree.offspring_distribution().tolist() == expected.offspring_distribution().tolist()
+
+
+def test_snapshot_leaves_the_run_alone():
+    sim = Simulation({"size": 300}, seed=5)
+    for _ in range(10):
+        sim.step()
+    buffered = len(sim.events)
+    snapshot(sim)
+    assert buffered and len(sim.events) == buffered
@@ -0,0 +1,104 @@
+"""Scenario comparison: paired seeds, running statistics and adaptive stopping."""
+import io
+import math
+import random
+
+import numpy as np
+import pytest
+
+import compare
+from compare import Running, compare_scenarios, t_quantile
+from config import as_config
+
+BASE = as_config({"size": 40})
+VARIANTS = {"cautious": {"transmission_prob": 0.2}}
+EFFECT = 10  # fake metric per unit of transmission_prob
+
+
+def fake_metric(config, seed):
+    """Seeded noise (sd 3) plus an effect of the config."""
+    return random.Random(seed).gauss(0, 3) + EFFECT * config.transmission_prob
+
+
+def fake_job(job):
+    name, config, seed, days = job
+    fake_job.seeds.append((name, seed))
+    return name, seed, {"deaths_infection": fake_metric(config, seed)}
+
+
+@pytest.fixture
+def fake_runs(monkeypatch):
+    fake_job.seeds = []
+    monkeypatch.setattr(compare, "_run_job", fake_job)
+    return fake_job.seeds
+
+
+def test_running_matches_numpy():
+    values = np.random.default_rng(1).normal(5, 2, 37)
+    running = Running()
+    assert running.variance == math.inf and running.half_width(0.95) == math.inf
+    for v in values:
+        running.add(v)
+    assert running.n == 37
+    assert running.mean == pytest.approx(values.mean())
+    assert running.variance == pytest.approx(values.var(ddof=1))
+    assert running.half_width(0.95) == pytest.approx(t_quantile(0.95, 36) * values.std(ddof=1) / math.sqrt(37))
+    for dof, table in ((4, 2.776), (10, 2.228), (30, 2.042)):  # Student t, 95%
+        assert t_quantile(0.95, dof) == pytest.approx(table, abs=0.05)
+
+
+def test_common_random_numbers_pair_the_seeds(fake_runs):
+    report, replicates = compare_scenarios(VARIANTS, 10, {"deaths_infection": 1.0}, BASE,
+                                           min_replicates=4, seed=7, processes=1)
+    assert replicates == 4  # paired differences have no noise: precise at once
+    by_name = {name: sorted(seed for n, seed in fake_runs if n == name) for name in ("baseline", "cautious")}
+    assert by_name["baseline"] == by_name["cautious"] == [7, 8, 9, 10]
+    row = report["cautious"]["deaths_infection"]
+    effect = EFFECT * (0.2 - BASE.transmission_prob)
+    assert row["difference"] == pytest.approx(effect)
+    assert row["half_width"] == pytest.approx(0, abs=1e-9)
+    assert row["variance_reduction"] == math.inf
+
+    fake_runs.clear()
+    report, _ = compare_scenarios(VARIANTS, 10, {"deaths_infection": 1.0}, BASE, min_replicates=4,
+                                  max_replicates=4, seed=7, processes=1, common_random_numbers=False)
+    baseline = {seed for n, seed in fake_runs if n == "baseline"}
+    assert baseline == {7, 8, 9, 10} and not baseline & {seed for n, seed in fake_runs if n == "cautious"}
+    assert report["cautious"]["deaths_infection"]["half_width"] > 1
+
+
+def test_paired_simulations_of_the_same_config_do_not_differ():
+    report, replicates = compare_scenarios({"same": {}}, 10, {"deaths_natural": 0.1, "peak_infected": 0.1},
+                                           BASE, min_replicates=2, processes=1)
+    assert replicates == 2
+    for row in report["same"].values():
+        assert row["difference"] == 0 and row["half_width"] == 0
+
+
+def test_adaptive_stopping_ends_once_the_interval_is_narrow_enough(fake_runs):
+    width = 4.0
+    stream = io.StringIO()
+    _, replicates = compare_scenarios(VARIANTS, 10, {"deaths_infection": width}, BASE, min_replicates=5,
+                                      batch=3, processes=1, common_random_numbers=False, stream=stream)
+    assert 5 < replicates < 200 and (replicates - 5) % 3 == 0
+
+    seeds = {name: sorted(seed for m, seed in fake_runs if m == name) for name in ("baseline", "cautious")}
+    variant = BASE.with_overrides(VARIANTS["cautious"])
+
+    def interval(n):  # full CI width of the difference after the first n replicates
+        diff = Running()
+        for a, b in zip(seeds["baseline"][:n], seeds["cautious"][:n]):
+            diff.add(fake_metric(variant, b) - fake_metric(BASE, a))
+        return 2 * diff.half_width(0.95)
+
+    assert interval(replicates) <= width < interval(replicates - 3)
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1 + (replicates - 5) // 3
+    assert lines[-1].startswith(f"  {replicates} replicates:")
+
+
+def test_adaptive_stopping_gives_up_at_max_replicates(fake_runs, capsys):
+    _, replicates = compare_scenarios(VARIANTS, 10, {"deaths_infection": 0.01}, BASE, min_replicates=5,
+                                      max_replicates=12, batch=4, processes=1, common_random_numbers=False)
+    assert replicates == 12
+    assert capsys.readouterr().out == ""
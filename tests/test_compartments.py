@@ -0,0 +1,29 @@
+"""Compartment model: residents are conserved, and calibrate() finds a known scale."""
+import math
+
+import pytest
+
+from compartments import CompartmentModel, calibrate
+
+CONFIGS = [{}, {"food": 100, "hospital_beds": 20, "triage": "urgency"}, {"food_policy": "proportional"}]
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_population_changes_only_by_births_and_deaths(config):
+    model = CompartmentModel(config, size=2000)
+    total = model.total()
+    for _ in range(150):
+        row = model.step()
+        deaths = row["deaths_natural"] + row["deaths_starvation"] + row["deaths_infection"]
+        assert row["population"] == pytest.approx(total + row["births"] - deaths, abs=1e-6)
+        assert model.ages.sum() == pytest.approx(model.total(), abs=1e-6)
+        assert (model.n >= -1e-9).all()
+        total = row["population"]
+
+
+@pytest.mark.parametrize("scale", [0.05, 0.4, 2.5, 6.0])
+def test_calibrate_recovers_a_known_contact_scale(scale):
+    config = {"size": 400}
+    trajectory = CompartmentModel(config, contact_scale=scale).run(60)
+    fit = calibrate(config, days=60, runs=[trajectory], tolerance=0.01)
+    assert abs(math.log10(fit["contact_scale"] / scale)) <= 0.01
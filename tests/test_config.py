@@ -0,0 +1,16 @@
+"""SimulationConfig overrides."""
+import pytest
+
+from config import DEFAULT_CONFIG
+
+
+def test_dotted_override_sets_table_entry():
+    config = DEFAULT_CONFIG.with_overrides({"job_action.doctor": 5, "size": 500})
+    assert config.job_action["doctor"] == 5 and config.size == 500
+    assert DEFAULT_CONFIG.job_action["doctor"] == 3
+
+
+@pytest.mark.parametrize("key", ["job_action.docter", "size.value", "sise"])
+def test_unknown_override_raises(key):
+    with pytest.raises(KeyError):
+        DEFAULT_CONFIG.with_overrides({key: 5})
@@ -0,0 +1,47 @@
+"""Every contact engine finds the same targets, in the same order, as the brute-force reference."""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from contacts import CONTACT_BACKENDS, CellIndex, make_contacts
+from support import run_objects
+
+
+def _points(count, seed):
+    rng = random.Random(seed)
+    return [SimpleNamespace(id=i, x=rng.uniform(0, 1700), y=rng.uniform(0, 860)) for i in range(count)]
+
+
+@pytest.mark.parametrize("radius", [20, 45, 130])
+@pytest.mark.parametrize("name", sorted(CONTACT_BACKENDS))
+def test_engines_match_brute_force(name, radius):
+    targets = _points(2000, radius)
+    reference, engine = make_contacts("brute", radius), make_contacts(name, radius)
+    reference.build(targets)
+    engine.build(targets)
+    for q in _points(300, radius + 1) + targets[:50]:
+        assert engine.query(q.x, q.y) == reference.query(q.x, q.y)
+
+
+def test_cell_index_follows_moves():
+    residents = _points(1500, 7)
+    index, rng = CellIndex(45), random.Random(8)
+    for r in residents:
+        index.add(r)
+    for r in residents[::3]:
+        r.x, r.y = rng.uniform(0, 1700), rng.uniform(0, 860)
+        index.move(r)
+    for r in residents[::5]:
+        index.discard(r)
+    alive = [r for i, r in enumerate(residents) if i % 5]
+    reference = make_contacts("brute", 45)
+    reference.build(alive)
+    for q in _points(300, 9):
+        found = sorted(r.id for r in index.near(q.x, q.y, 45))
+        assert found == [alive[j].id for j in reference.query(q.x, q.y)]
+
+
+def test_engines_give_the_same_run():
+    runs = [run_objects({"contacts": name}, 3, 400, 40)[0] for name in sorted(CONTACT_BACKENDS)]
+    assert runs[0] == runs[1] == runs[2]
@@ -0,0 +1,92 @@
+"""Event log: typed buffers, run totals and the sinks."""
+import csv
+
+import numpy as np
+import pytest
+
+from events import (COLUMNS, DEATH, INFECTION, JOB_CHANGE, PERSONA_CHANGE, TRANSMISSION, EventLog,
+                    open_sink)
+from habitant import Population
+from population_arrays import PopulationArrays
+from rng import CounterRNG
+
+
+def _population():
+    pop = Population()
+    pop.spawn(40, 25, CounterRNG(3))
+    return pop
+
+
+def _fill(log, days=6):
+    """Record a few days of events; returns {column: array} of every row recorded."""
+    residents, recorded = list(_population()), []
+    for day in range(1, days + 1):
+        log.begin_day(day)
+        for i, r in enumerate(residents[day:day + 5]):
+            log.record(JOB_CHANGE, r, old=i, new=i + 1)
+            log.record(TRANSMISSION, r, source=residents[0].id)
+        log.record(DEATH, residents[day], cause=INFECTION)
+        recorded.append(log.columns(log.day_start))
+        log.end_day()
+    return {name: np.concatenate([day[name] for day in recorded]) for name in COLUMNS}
+
+
+def test_record_rows_matches_record():
+    population = _population()
+    objects, arrays = EventLog(), EventLog()
+    objects.begin_day(4)
+    arrays.begin_day(4)
+    for r in population:
+        objects.record(PERSONA_CHANGE, r, old=2, new=r.persona_code, source=7)
+    pop = PopulationArrays.from_habitants(population)
+    arrays.record_rows(PERSONA_CHANGE, pop, np.arange(len(pop)), old=2, new=pop.persona, source=7)
+    a, b = objects.columns(), arrays.columns()
+    for name, (_, dtype) in COLUMNS.items():
+        assert a[name].dtype == dtype
+        np.testing.assert_array_equal(a[name], b[name], err_msg=name)
+    assert len(objects.today(PERSONA_CHANGE)) == len(population)
+
+
+def test_totals_keep_codes_above_15():
+    log = EventLog()
+    log.begin_day(1)
+    r = next(iter(_population()))
+    for old, new in ((1, 2), (15, 16), (16, 15), (100, 127), (-1, 31), (15, 16)):
+        log.record(JOB_CHANGE, r, old=old, new=new)
+    log.record(DEATH, r, cause=20)
+    log.end_day()
+    assert log.totals == {(JOB_CHANGE, 1, 2, -1): 1, (JOB_CHANGE, 15, 16, -1): 2, (JOB_CHANGE, 16, 15, -1): 1,
+                          (JOB_CHANGE, 100, 127, -1): 1, (JOB_CHANGE, -1, 31, -1): 1, (DEATH, -1, -1, 20): 1}
+    assert log.count(JOB_CHANGE, old=15) == 2 and log.count(DEATH, cause=20) == 1
+
+
+def test_csv_sink_round_trip(tmp_path):
+    path = str(tmp_path / "events.csv")
+    log = EventLog(open_sink(path), chunk_size=16)
+    expected = _fill(log)
+    log.close()
+    with open(path, newline="") as f:
+        header, *rows = list(csv.reader(f))
+    assert header == list(COLUMNS)
+    for name, values in zip(header, zip(*rows)):
+        np.testing.assert_array_equal(np.array(values, dtype=np.int64), expected[name], err_msg=name)
+
+
+@pytest.mark.parametrize("suffix", [".arrow", ".parquet"])
+def test_arrow_sinks_round_trip(tmp_path, suffix):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"events{suffix}")
+    log = EventLog(open_sink(path), chunk_size=16)
+    expected = _fill(log)
+    log.close()
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        with pa.ipc.open_file(path) as reader:
+            table = reader.read_all()
+    assert table.column_names == list(COLUMNS)
+    for name, (_, dtype) in COLUMNS.items():
+        column = table.column(name).to_numpy()
+        assert column.dtype == dtype
+        np.testing.assert_array_equal(column, expected[name], err_msg=name)
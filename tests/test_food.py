@@ -0,0 +1,97 @@
+"""Food allocation: every policy gives what a loop over the residents would, on both backends."""
+import copy
+import math
+
+import numpy as np
+import pytest
+
+import habitant
+import population_arrays
+from config import as_config
+from food import TIER, TIERS, allocate
+from rng import CounterRNG
+
+CASES = [("priority", {}), ("proportional", {}), ("quota", {"poor": 0.3, "jobless": 0.1}),
+         ("quota", {"rich": 0.2, "workers": 0.5})]
+SHARES = [0.0, 0.3, 0.75, 1.0, 1.5]  # food, as a share of the total need
+
+
+def serve(need, tier, food, policy, quotas):
+    """The policies of food.py written one resident at a time: given per resident, food left."""
+    listed = sorted((i for i in range(len(need)) if tier[i] >= 0), key=lambda i: tier[i])
+    total = sum(need[i] for i in listed)
+    given = [0] * len(need)
+    if total <= food:
+        for i in listed:
+            given[i] = need[i]
+    elif policy == "priority":
+        left = food
+        for i in listed:
+            given[i] = min(need[i], left)
+            left -= given[i]
+    elif policy == "proportional":
+        for i in listed:
+            given[i] = math.floor(need[i] * (food / total))
+    else:
+        reserved = [math.floor(quotas.get(name, 0) * food) for name in TIERS]
+        free = food - sum(reserved)
+        for t in range(len(TIERS)):
+            budget = reserved[t] + free
+            for i in listed:
+                if tier[i] == t:
+                    given[i] = min(need[i], budget)
+                    budget -= given[i]
+            free = budget
+    return given, food - sum(given)
+
+
+def small_population():
+    pop = habitant.Population()
+    pop.spawn(60, 25, CounterRNG(4))
+    pop.spawn(30, 0, CounterRNG(5))  # children: poor ones are fed last, the others not at all
+    for k, r in enumerate(pop):  # some residents already hungry
+        r.days_hungry, r.food_deficit = k % 3, k % 5
+    return pop
+
+
+@pytest.mark.parametrize("policy, quotas", CASES)
+@pytest.mark.parametrize("share", SHARES)
+def test_allocate_matches_a_loop_over_residents(policy, quotas, share):
+    rng = np.random.default_rng(7)
+    need = rng.integers(0, 6, 50)
+    tier = rng.integers(-1, len(TIERS), 50).astype(np.int8)
+    food = int(share * need[tier >= 0].sum())
+    given, left = allocate(need, tier, food, policy, quotas)
+    expected, expected_left = serve(need.tolist(), tier.tolist(), food, policy, quotas)
+    assert given.tolist() == expected
+    assert left == expected_left
+
+
+@pytest.mark.parametrize("policy, quotas", CASES)
+@pytest.mark.parametrize("share", SHARES)
+def test_distribute_food_matches_a_loop_over_residents(policy, quotas, share):
+    config = as_config({"food_policy": policy, "food_quotas": quotas})
+    population = small_population()
+    residents = list(population)
+    table = habitant.daily_need_table(config)
+    need = [table[r.persona_code][r.job_code] for r in residents]
+    tier = [int(TIER[r.persona_code, r.job_code]) for r in residents]
+    assert set(tier) == {-1, 0, 1, 2, 3}
+    food = int(share * sum(n for n, t in zip(need, tier) if t >= 0))
+    given, left = serve(need, tier, food, policy, quotas)
+
+    expected = []
+    for r, n, t, g in zip(residents, need, tier, given):
+        if t < 0:
+            expected.append((r.days_hungry, r.food_deficit))
+        elif g >= n:
+            expected.append((0, 0))
+        else:
+            expected.append((r.days_hungry + 1, r.food_deficit + n - g))
+    underfed = sum(1 for n, t, g in zip(need, tier, given) if t >= 0 and g < n)
+
+    pop = population_arrays.PopulationArrays.from_habitants(copy.deepcopy(population))
+    assert habitant.distribute_food(population, food, config) == (left, underfed)
+    assert [(r.days_hungry, r.food_deficit) for r in residents] == expected
+    assert population_arrays.distribute_food(pop, food, config) == (left, underfed)
+    assert list(zip(pop.days_hungry.tolist(), pop.food_deficit.tolist())) == expected
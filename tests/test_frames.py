@@ -0,0 +1,77 @@
+"""Headless frames: the same picture as the pygame renderer, and PNG files that decode to the frame."""
+import os
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import habitant  # noqa: E402
+from frames import HEIGHT, PNGWriter, Rasterizer, WIDTH, encode, png_bytes  # noqa: E402
+from renderer import LEGEND_H, LEGEND_W, PopulationRenderer  # noqa: E402
+from rng import CounterRNG  # noqa: E402
+
+LEGEND_X, LEGEND_Y = WIDTH - LEGEND_W - 20, HEIGHT - LEGEND_H - 20
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.quit()
+
+
+def small_population():
+    """Children, adults and elders, some infected, 60 px apart; the last one under the legend."""
+    population = habitant.Population()
+    rng = CounterRNG(1)
+    residents = population.spawn(12, 0, rng) + population.spawn(24, 25, rng) + population.spawn(12, 70, rng)
+    for k, r in enumerate(residents):
+        r.x, r.y = 100 + 60 * (k % 12), 100 + 60 * (k // 12)
+        if k % 3 == 0:
+            r.state_code = habitant.INFECT
+    residents[-1].x, residents[-1].y = LEGEND_X + 40, LEGEND_Y + 40
+    return population
+
+
+def test_frame_matches_the_renderer(screen):
+    population = small_population()
+    PopulationRenderer(screen).draw(population)
+    expected = pygame.surfarray.array3d(screen).transpose(1, 0, 2)
+    frame = Rasterizer().draw_population(population)  # no dots overlap, so no stacking difference
+    assert frame.dtype == np.uint8
+    np.testing.assert_array_equal(frame, expected)
+
+
+def read_png(data):
+    """Decode an 8-bit RGB PNG without filters (as png_bytes writes them), checking every CRC."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks, at = {}, 8
+    while at < len(data):
+        length, tag = struct.unpack(">I4s", data[at:at + 8])
+        body = data[at + 8:at + 8 + length]
+        assert struct.unpack(">I", data[at + 8 + length:at + 12 + length])[0] == zlib.crc32(tag + body)
+        chunks[tag] = chunks.get(tag, b"") + body
+        at += 12 + length
+    width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", chunks[b"IHDR"])
+    assert (depth, color, interlace) == (8, 2, 0) and b"IEND" in chunks
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, width * 3 + 1)
+    assert (raw[:, 0] == 0).all()
+    return raw[:, 1:].reshape(height, width, 3)
+
+
+def test_png_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    frame = Rasterizer(800, 480).draw(*encode(small_population()))
+    np.testing.assert_array_equal(read_png(png_bytes(frame, level=6)), frame)
+
+    writer = PNGWriter(str(tmp_path))
+    writer.write(7, frame)
+    writer.close()
+    path = os.path.join(tmp_path, "day-00007.png")
+    loaded = pygame.surfarray.array3d(pygame.image.load(path)).transpose(1, 0, 2)
+    np.testing.assert_array_equal(loaded, frame)
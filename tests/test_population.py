@@ -0,0 +1,33 @@
+"""Population: slots found by id, for residents born here and for immigrants."""
+import random
+
+from habitant import Habitant, Population
+from rng import CounterRNG
+
+
+def test_membership_and_order_survive_removals_and_compaction():
+    pop = Population()
+    pop._next_id = 5 << 40  # a region's ids
+    residents = pop.spawn(300, 25, CounterRNG(1))
+    immigrants = []
+    for rid in (7, 3 << 40, 9 << 40):
+        r = Habitant()
+        r.id = rid
+        pop.append(r)
+        immigrants.append(r)
+    pop._next_id = max(r.id for r in residents) + 1  # as regions.py does after an immigration
+    residents += immigrants + pop.spawn(50, 0, CounterRNG(1))
+    rng, alive = random.Random(2), list(residents)
+    for step in range(6):
+        for r in rng.sample(alive, len(alive) // 3):
+            pop.remove(r)
+            alive.remove(r)
+            assert r not in pop
+        pop.compact(force=step % 2 == 1)
+        alive += pop.spawn(20, 0, CounterRNG(step))
+        assert list(pop) == alive
+        assert all(r in pop for r in alive)
+        assert [pop.index_of(r) for r in alive] == sorted(pop.index_of(r) for r in alive)
+    stranger = Habitant()
+    stranger.id = alive[0].id
+    assert stranger not in pop
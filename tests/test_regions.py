@@ -0,0 +1,36 @@
+"""Multi-region world (regions.py)."""
+import numpy as np
+
+from regions import ID_STRIDE, World
+
+
+def test_two_region_network_world():
+    # region 1 numbers its residents from ID_STRIDE: the network must not size anything by id
+    config = {"contact_model": "network", "size": 200, "transmission_prob": 0.1}
+    with World([config] * 2, seed=3, migration_rate=0.01, processes=False) as world:
+        totals, _ = world.run(30)
+        assert sum(totals["emigrants"]) > 0
+        for k, worker in enumerate(world.workers):
+            population = worker.sim.population
+            network = population.network
+            ids = np.array([r.id for r in population])
+            assert (ids >= k * ID_STRIDE).any()
+            assert len(network.alive) < 10_000
+            # synced at today's transmission: today's infection deaths are still in it
+            assert np.isin(ids, network.ids[network.alive]).all()
+            src, dst, _ = network.edges()
+            assert network.alive[src].all() and network.alive[dst].all()
+
+
+def test_border_infections_share_the_day_window():
+    # infections from across a border are recorded in the day's own window: one end_day per day
+    config = {"size": 1500, "transmission_prob": 0.7}
+    with World([config] * 2, seed=1, processes=False) as world:
+        calls = []
+        for worker in world.workers:
+            events = worker.sim.events
+            end_day = events.end_day
+            events.end_day = lambda end_day=end_day, events=events: (calls.append(events.day), end_day())
+        totals, _ = world.run(15)
+        assert sum(totals["infected_across"]) > 0
+        assert sorted(calls) == sorted(list(range(1, 16)) * 2)
@@ -0,0 +1,44 @@
+"""Reporters: simulate_day prints nothing, and every reporter writes to its own stream."""
+import io
+
+import pytest
+
+from reporting import REPORTERS, make_reporter
+from simulation import Simulation
+from support import run_arrays, run_objects
+
+CONFIGS = [
+    {},
+    {"movement": "commute", "triage": "urgency", "hospital_beds": 5},
+    {"contact_model": "network"},
+]
+
+
+def _run(reporter, overrides, days=30):
+    sim = Simulation({"size": 300, **overrides}, seed=2, reporter=reporter)
+    reporter.start({"day": sim.day, "population": len(sim.population), "couples": len(sim.couples)})
+    for _ in range(days):
+        sim.step()
+    return sim
+
+
+@pytest.mark.parametrize("overrides", CONFIGS, ids=lambda o: ",".join(f"{k}={v}" for k, v in o.items()) or "default")
+def test_silent_run_writes_nothing(overrides, capfd):
+    reporter = make_reporter("silent")
+    reporter.end(_run(reporter, overrides).events)
+    run_objects(overrides, 2, 300, 30)
+    run_arrays(overrides, 2, 300, 30)
+    assert capfd.readouterr() == ("", "")
+
+
+@pytest.mark.parametrize("mode", [mode for mode in REPORTERS if mode != "silent"])
+def test_reporters_write_to_their_stream(mode, capfd):
+    if mode == "dashboard":
+        pytest.importorskip("rich")
+    stream = io.StringIO()
+    reporter = make_reporter(mode, stream=stream)
+    sim = _run(reporter, {}, days=10)
+    written = len(stream.getvalue())
+    reporter.end(sim.events)
+    assert capfd.readouterr() == ("", "")
+    assert len(stream.getvalue()) > written
@@ -0,0 +1,17 @@
+"""Sweeps: quiet by default, resumed from the cache without a process pool."""
+import io
+
+import sweep
+
+
+def test_cached_sweep_runs_nothing(tmp_path, capsys, monkeypatch):
+    design = sweep.grid_design({"size": [40, 60]})
+    first = sweep.run_sweep(design, [0], 5, cache_dir=str(tmp_path), processes=1)
+    assert capsys.readouterr().out == ""
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("every run is cached")
+    monkeypatch.setattr(sweep, "Pool", no_pool)
+    stream = io.StringIO()
+    assert sweep.run_sweep(design, [0], 5, cache_dir=str(tmp_path), stream=stream) == first
+    assert stream.getvalue() == "2 runs, 2 cached, 0 to do\n"
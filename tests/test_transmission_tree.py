@@ -0,0 +1,121 @@
+"""Transmission tree: exact R(t) of a hand-built chain, and the same infectors as the contact engines."""
+import copy
+
+import pytest
+
+import habitant
+import network
+import population_arrays
+import rng as streams
+from config import as_config
+from events import EventLog, TRANSMISSION
+from rng import CounterRNG
+from transmission_tree import TransmissionTree, UNKNOWN
+
+SEED, DAY = 3, 5
+
+
+def test_reproduction_of_a_hand_built_chain():
+    tree = TransmissionTree()
+    tree.seed([1, 2], day=0)
+    tree.end_day(0)
+    tree.record(1, [1, 1], [3, 4], [1.0, 2.0])
+    tree.end_day(1)
+    tree.record(2, [2, 3], [5, 6], [3.0, 4.0])
+    tree.end_day(2)
+    tree.record(3, [6, 99], [7, 8], [5.0, 6.0])  # 99: a ghost whose infection was not seen
+    tree.end_day(3)
+
+    assert tree.reproduction() == [(0, 2, 1.5, False), (1, 2, 0.5, False), (2, 2, 0.5, False),
+                                   (3, 2, 0.0, False)]
+    columns = tree.columns()
+    assert columns["infector"].tolist() == [1, 1, 2, 3, 6, 99]
+    assert columns["infectee"].tolist() == [3, 4, 5, 6, 7, 8]
+    assert columns["interval"].tolist() == [1, 1, 2, 1, 1, UNKNOWN]
+    assert tree.offspring_distribution().tolist() == []
+
+    last = 3 + tree.horizon
+    tree.end_day(last)
+    assert [final for *_, final in tree.reproduction()][:4] == [True] * 4
+    # closed: 4, 5, 7, 8 with none; 2, 3, 6, 99 with one; 1 with two
+    assert tree.offspring_distribution().tolist() == [4, 4, 1]
+    summary = tree.summary()
+    assert summary["transmissions"] == 6
+    assert summary["generation_interval_mean"] == pytest.approx(1.2)
+    assert summary["generation_interval_sd"] == pytest.approx(0.4)
+    assert summary["offspring_mean"] == pytest.approx(6 / 9)
+
+
+def infected_population():
+    rng = CounterRNG(SEED)
+    population = habitant.Population()
+    population.spawn(400, 25, rng)
+    habitant.form_couples(population, [], rng)
+    for k, r in enumerate(population):
+        if k % 6 == 0:
+            r.state_code = habitant.INFECT
+    return population, rng
+
+
+def distance_pairs(population, rng, config):
+    """(infectee, infector) ids of a brute-force distance model: first successful infector in population order."""
+    residents = list(population)
+    infected = [r for r in residents if r.state_code == habitant.INFECT]
+    pairs = []
+    for r in residents:
+        if r.state_code != habitant.HEALTHY:
+            continue
+        for a in infected:
+            close = (r.x - a.x) ** 2 + (r.y - a.y) ** 2 < config.contact_radius ** 2
+            if close and rng.uniform(streams.TRANSMISSION, DAY, [r.id], other=a.id)[0] < config.transmission_prob:
+                pairs.append((r.id, a.id))
+                break
+    return pairs
+
+
+def spread_both(population, rng, config):
+    """Run spread_infection on both backends; returns the two EventLogs (each with a tree)."""
+    pop = population_arrays.PopulationArrays.from_habitants(copy.deepcopy(population), seed=SEED)
+    logs = EventLog(tree=TransmissionTree(config=config)), EventLog(tree=TransmissionTree(config=config))
+    for log in logs:
+        log.day = DAY
+    habitant.spread_infection(population, rng, DAY, config=config, events=logs[0])
+    population_arrays.spread_infection(pop, DAY, config, events=logs[1])
+    return logs
+
+
+def recorded_pairs(events):
+    """(infectee, infector) ids of the tree rows, after checking the event log holds the same ones."""
+    tree = events.tree.columns()
+    pairs = list(zip(tree["infectee"].tolist(), tree["infector"].tolist()))
+    rows = events.columns()
+    caught = rows["kind"] == TRANSMISSION
+    assert list(zip(rows["resident"][caught].tolist(), rows["source"][caught].tolist())) == pairs
+    return pairs
+
+
+def test_tree_infectors_match_the_distance_model():
+    config = as_config({"transmission_prob": 0.3})
+    population, rng = infected_population()
+    expected = distance_pairs(population, rng, config)
+    assert len(expected) > 10
+    for events in spread_both(population, rng, config):
+        assert recorded_pairs(events) == expected
+
+
+def test_tree_infectors_match_the_network(monkeypatch):
+    config = as_config({"contact_model": "network", "transmission_prob": 0.3})
+    population, rng = infected_population()
+    transmitted = []
+    transmit = network.ContactNetwork.transmit
+
+    def spy(self, *args):
+        infectees, infectors = transmit(self, *args)
+        transmitted.append(list(zip(infectees.tolist(), infectors.tolist())))
+        return infectees, infectors
+    monkeypatch.setattr(network.ContactNetwork, "transmit", spy)
+    logs = spread_both(population, rng, config)
+    assert len(transmitted) == 2 and transmitted[0] == transmitted[1]
+    assert len(transmitted[0]) > 10
+    for events in logs:
+        assert recorded_pairs(events) == transmitted[0]
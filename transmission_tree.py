@@ -0,0 +1,261 @@
+"""
+Opt-in transmission-tree recorder: who infected whom, on which day and from
+how far, with running epidemic metrics.
+
+Attach it to the run's EventLog (EventLog(tree=TransmissionTree(...))):
+spread_infection then hands it every new case. Rows go to append-only
+integer/float column buffers, flushed to a sink in chunks like the event log.
+Per case, in O(1):
+- R(t): secondary cases of the residents infected on day t, over those cases
+  (final once t is older than the infectious horizon)
+- generation intervals: day of the case minus the day its infector was infected
+- secondary-case distribution: cases caused by each infector, counted once
+  the infector is past the horizon (nobody stays infected longer than the
+  largest TTL), so only the last few days of infectors are held in memory
+
+Infectors whose own infection was not seen (infected at birth, ghosts from a
+neighbouring region) count for the secondary-case distribution only.
+
+    python transmission_tree.py --size 2000 --days 100 --out tree.csv
+"""
+import argparse
+from array import array
+from collections import deque
+
+import numpy as np
+
+from config import as_config, parse_override
+from events import EventLog, open_sink
+from habitant import ttl_table
+
+# column -> (array typecode, NumPy dtype)
+TREE_COLUMNS = {
+    "day": ("i", np.int32),
+    "infector": ("q", np.int64),
+    "infectee": ("q", np.int64),
+    "distance": ("f", np.float32),     # px between the two residents
+    "interval": ("i", np.int32),       # generation interval in days (-1: infector's infection not seen)
+}
+UNKNOWN = -1
+
+
+class TransmissionTree:
+    """
+    Transmission rows buffered in columns, flushed to `sink` (events.open_sink(path,
+    TREE_COLUMNS)) every `chunk_size` rows; without a sink they are dropped and only
+    the running metrics are kept.
+
+    Arguments: sink, chunk_size, config (its largest TTL sets the infectious horizon)
+    """
+
+    def __init__(self, sink=None, chunk_size: int = 65_536, config=None):
+        self.sink = sink
+        self.chunk_size = chunk_size
+        self.horizon = max(ttl_table(as_config(config))) + 2
+        self.buffers = {name: array(code) for name, (code, _) in TREE_COLUMNS.items()}
+        self.open = {}            # id -> [infection day or UNKNOWN, first seen day, secondary cases]
+        self.cohorts = deque()    # (first seen day, ids), oldest first
+        self.cases = array("q")       # per day: residents infected that day
+        self.secondary = array("q")   # per day: cases caused by the residents infected that day
+        self.offspring = array("q")   # per k: closed infectors with k secondary cases
+        self.intervals = array("q")   # per interval in days: cases
+        self.transmissions = 0
+        self.day = 0                  # last ended day
+        self.n_intervals, self.mean_interval, self._m2 = 0, 0.0, 0.0
+
+    def __len__(self):
+        return len(self.buffers["day"])
+
+    # --- Recording ---
+    @staticmethod
+    def _bump(counts, i, n=1):
+        if i >= len(counts):
+            counts.extend([0] * (i + 1 - len(counts)))
+        counts[i] += n
+
+    def _open(self, resident, infected_on, day):
+        if resident in self.open:
+            self._close(resident)  # reinfected after a cure
+        self.open[resident] = [infected_on, day, 0]
+        if self.cohorts and self.cohorts[-1][0] == day:
+            self.cohorts[-1][1].append(resident)
+        else:
+            self.cohorts.append((day, [resident]))
+
+    def _close(self, resident):
+        self._bump(self.offspring, self.open.pop(resident)[2])
+
+    def seed(self, ids, day=0):
+        """Register residents already infected on `day` (e.g. the initial cases)."""
+        for resident in ids:
+            self._open(resident, day, day)
+        self._bump(self.cases, day, len(ids))
+
+    def record(self, day, infectors, infectees, distances):
+        """
+        Add the day's new cases.
+
+        Arguments: day, infectors, infectees (ids, aligned), distances (px)
+        """
+        n = len(infectees)
+        if n == 0:
+            return
+        intervals = array("i", [UNKNOWN]) * n
+        for i, (a, b) in enumerate(zip(np.asarray(infectors).tolist(), np.asarray(infectees).tolist())):
+            if a not in self.open:
+                self._open(a, UNKNOWN, day)
+            state = self.open[a]
+            state[2] += 1
+            start = state[0]
+            if start != UNKNOWN:
+                gap = day - start
+                intervals[i] = gap
+                self._bump(self.secondary, start)
+                self._bump(self.intervals, gap)
+                self.n_intervals += 1
+                delta = gap - self.mean_interval
+                self.mean_interval += delta / self.n_intervals
+                self._m2 += delta * (gap - self.mean_interval)
+            self._open(b, day, day)
+        self._bump(self.cases, day, n)
+        self.transmissions += n
+
+        b = self.buffers
+        b["day"].extend(array("i", [day]) * n)
+        b["infector"].frombytes(np.ascontiguousarray(infectors, dtype=np.int64).tobytes())
+        b["infectee"].frombytes(np.ascontiguousarray(infectees, dtype=np.int64).tobytes())
+        b["distance"].frombytes(np.ascontiguousarray(distances, dtype=np.float32).tobytes())
+        b["interval"].extend(intervals)
+
+    def end_day(self, day):
+        """Close the infectors past the horizon; flush if the buffers are full."""
+        self.day = day
+        while self.cohorts and self.cohorts[0][0] <= day - self.horizon:
+            seen, ids = self.cohorts.popleft()
+            for resident in ids:
+                state = self.open.get(resident)
+                if state is not None and state[1] == seen:
+                    self._close(resident)
+        if len(self) >= self.chunk_size:
+            self.flush()
+
+    # --- Export ---
+    def columns(self):
+        """Buffered rows as {column: NumPy array} (copies)."""
+        return {name: np.frombuffer(buf, dtype=TREE_COLUMNS[name][1]).copy() for name, buf in self.buffers.items()}
+
+    def flush(self):
+        """Hand the buffered rows to the sink and empty the buffers."""
+        if self.sink is not None and len(self):
+            self.sink.write(self.columns())
+        for name, (code, _) in TREE_COLUMNS.items():
+            self.buffers[name] = array(code)
+
+    def close(self):
+        self.flush()
+        if self.sink is not None:
+            self.sink.close()
+
+    # --- State (checkpoint.py) ---
+    def state(self):
+        """{name: array} of the running metrics and open infectors (buffered rows are not included)."""
+        return {
+            "open_ids": np.fromiter(self.open, np.int64, len(self.open)),
+            "open_state": np.array(list(self.open.values()), dtype=np.int64).reshape(-1, 3),
+            "cohort_days": np.array([day for day, _ in self.cohorts], dtype=np.int64),
+            "cohort_sizes": np.array([len(ids) for _, ids in self.cohorts], dtype=np.int64),
+            "cohort_ids": np.array([i for _, ids in self.cohorts for i in ids], dtype=np.int64),
+            "cases": np.frombuffer(self.cases, dtype=np.int64).copy(),
+            "secondary": np.frombuffer(self.secondary, dtype=np.int64).copy(),
+            "offspring": np.frombuffer(self.offspring, dtype=np.int64).copy(),
+            "intervals": np.frombuffer(self.intervals, dtype=np.int64).copy(),
+            "counters": np.array([self.transmissions, self.day, self.n_intervals], dtype=np.int64),
+            "moments": np.array([self.mean_interval, self._m2], dtype=np.float64),
+        }
+
+    @classmethod
+    def from_state(cls, arrays, sink=None, chunk_size: int = 65_536, config=None):
+        tree = cls(sink, chunk_size, config)
+        tree.open = {i: state for i, state in zip(arrays["open_ids"].tolist(), arrays["open_state"].tolist())}
+        ids = iter(arrays["cohort_ids"].tolist())
+        tree.cohorts = deque((day, [next(ids) for _ in range(size)])
+                             for day, size in zip(arrays["cohort_days"].tolist(), arrays["cohort_sizes"].tolist()))
+        for name in ("cases", "secondary", "offspring", "intervals"):
+            setattr(tree, name, array("q", arrays[name].tolist()))
+        tree.transmissions, tree.day, tree.n_intervals = arrays["counters"].tolist()
+        tree.mean_interval, tree._m2 = arrays["moments"].tolist()
+        return tree
+
+    # --- Metrics ---
+    def reproduction(self, day=None):
+        """
+        R(t) by infection day of the infectors.
+
+        Returns: list of (day, cases, R, final) up to `day` (default: the last ended day);
+        R is None on days without a case
+        """
+        last = self.day if day is None else day
+        rows = []
+        for t in range(last + 1):
+            cases = self.cases[t] if t < len(self.cases) else 0
+            secondary = self.secondary[t] if t < len(self.secondary) else 0
+            rows.append((t, cases, secondary / cases if cases else None, t <= last - self.horizon))
+        return rows
+
+    def offspring_distribution(self, include_open=False):
+        """Returns: counts[k] = infectors with k secondary cases (closed ones, plus the open ones if asked)."""
+        counts = array("q", self.offspring)
+        if include_open:
+            for state in self.open.values():
+                self._bump(counts, state[2])
+        return np.frombuffer(counts, dtype=np.int64).copy()
+
+    def summary(self, include_open=True):
+        """Run-level numbers: transmissions, generation interval, offspring mean / variance."""
+        counts = self.offspring_distribution(include_open)
+        k = np.arange(len(counts))
+        infectors = counts.sum()
+        mean = (k * counts).sum() / infectors if infectors else 0.0
+        variance = ((k - mean) ** 2 * counts).sum() / infectors if infectors else 0.0
+        return {
+            "transmissions": self.transmissions,
+            "generation_interval_mean": self.mean_interval,
+            "generation_interval_sd": (self._m2 / self.n_intervals) ** 0.5 if self.n_intervals else 0.0,
+            "offspring_mean": float(mean),
+            "offspring_variance": float(variance),
+            "no_secondary_share": float(counts[0] / infectors) if infectors else 0.0,
+        }
+
+
+# --- CLI ---
+def main(argv=None):
+    from simulation import Simulation
+
+    parser = argparse.ArgumentParser(description="Record the transmission tree of one run")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--out", help="write the tree (.csv, .arrow or .parquet)")
+    parser.add_argument("--every", type=int, default=10, help="print R(t) every N days")
+    args = parser.parse_args(argv)
+
+    overrides = dict(parse_override(t) for t in args.set)
+    overrides["size"] = args.size
+    config = as_config(overrides)
+    tree = TransmissionTree(open_sink(args.out, TREE_COLUMNS) if args.out else None, config=config)
+    sim = Simulation(config, seed=args.seed, events=EventLog(tree=tree))
+    for _ in range(args.days):
+        sim.step()
+    sim.events.close()
+
+    print("  day | cases |    R(t)")
+    for t, cases, r, final in tree.reproduction()[::args.every]:
+        shown = "       -" if r is None else f"{r:8.2f}"
+        print(f"{t:5} | {cases:5} | {shown}{'' if final else ' (open)'}")
+    for name, value in tree.summary().items():
+        print(f"{name:26}: {value:.3f}" if isinstance(value, float) else f"{name:26}: {value}")
+
+
+if __name__ == "__main__":
+    main()